@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from utils.startup_trace import EXIT_VARIABLE, TRACE_VARIABLE
+
+
+# The budget file used unless another is given
+BUDGET_PATH = "startup_budget.json"
+
+
+def main():
+    """
+    Times the app's cold start and fails if it's over budget.
+
+    Actions:
+        - Reads the options from the command line and the budget file
+        - Starts the app in a new process for each run, with the startup
+          tracer on, and closes it once the first frame is drawn
+        - Prints the median time to first frame, and the phases and
+          slowest imports of the median run
+        - Writes the median run's trace, if asked to
+        - Exits with status 1 if the median is over budget
+    """
+    parser = argparse.ArgumentParser(
+        description="Times how long the app takes to draw its first frame "
+                    "from a cold start, and fails if it's over budget.")
+    parser.add_argument("--budget", default=BUDGET_PATH,
+                        help="the budget file (default: "
+                             f"{BUDGET_PATH})")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="the most milliseconds the first frame may "
+                             "take, instead of the budget file's")
+    parser.add_argument("-n", "--runs", type=int, default=None,
+                        help="the number of cold starts to time, instead "
+                             "of the budget file's")
+    parser.add_argument("--top", type=int, default=10,
+                        help="the number of slowest imports to show")
+    parser.add_argument("-o", "--output", default=None,
+                        help="where to write the median run's trace")
+    options = parser.parse_args()
+
+    # The app loads its files relative to the project directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    with open(options.budget, "r") as budget_file:
+        budget = json.load(budget_file)
+
+    # 0 is a valid budget, so only a missing option falls back to the file
+    budget_ms = (options.budget_ms if options.budget_ms is not None
+                 else budget["first_frame_ms"])
+    runs = (options.runs if options.runs is not None
+            else budget.get("runs", 5))
+    if runs < 1:
+        parser.error("the number of runs must be at least 1")
+
+    traces = sorted((cold_start() for _ in range(runs)),
+                    key=lambda trace: trace["first_frame_ms"])
+    median = statistics.median(trace["first_frame_ms"] for trace in traces)
+    trace = traces[len(traces) // 2]
+
+    print(f"First frame after {median:.0f}ms (median of {runs} runs, "
+          f"{traces[0]['first_frame_ms']:.0f}-"
+          f"{traces[-1]['first_frame_ms']:.0f}ms), budget {budget_ms:.0f}ms")
+    print()
+
+    print("Phases:")
+    for phase in trace["phases"]:
+        name = "  " * phase["depth"] + phase["name"]
+        print(f"  {name:<40}{phase['start_ms']:>10.1f}"
+              f"{phase['duration_ms']:>10.1f}ms")
+    print()
+
+    print("Slowest imports:")
+    print(f"  {'module':<40}{'self':>10}{'total':>10}")
+    slowest = sorted(trace["imports"], key=lambda record: record["self_ms"],
+                     reverse=True)
+    for record in slowest[:options.top]:
+        print(f"  {record['module']:<40}{record['self_ms']:>10.1f}"
+              f"{record['total_ms']:>10.1f}ms")
+
+    if options.output is not None:
+        with open(options.output, "w") as output_file:
+            json.dump(trace, output_file, indent=1)
+
+    if median > budget_ms:
+        print()
+        print(f"Cold start is {median - budget_ms:.0f}ms over budget",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+def cold_start():
+    """
+    Starts the app in a new process and reads its startup trace.
+
+    Raises:
+        - RuntimeError:
+            If the app closed without writing a trace
+
+    Returns:
+        - dict:
+            The trace, as StartupTracer writes it
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "startup.json")
+
+        environment = dict(os.environ)
+        environment[TRACE_VARIABLE] = path
+        environment[EXIT_VARIABLE] = "1"
+        environment.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+        subprocess.run([sys.executable, "main.py"], env=environment,
+                       timeout=120, check=False)
+
+        if not os.path.exists(path):
+            raise RuntimeError("The app closed without writing a startup "
+                               "trace")
+
+        with open(path, "r") as trace_file:
+            return json.load(trace_file)
+
+
+if __name__ == "__main__":
+    main()
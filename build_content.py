@@ -0,0 +1,57 @@
+import argparse
+import sys
+from game.core.content_cache import ContentCache
+from game.core.content_pack import (PACK_PATH, SECTIONS, build,
+                                    missing_images)
+
+
+def main():
+    """
+    Validates the app's content and compiles it into a content pack.
+
+    Actions:
+        - Reads the options from the command line
+        - Compiles every section of data.json and game/data from the JSON
+          files, checking them against their schemas
+        - If they're all valid, writes the pack, unless only checking
+        - Warns about images the information pages show that don't exist
+        - Prints the size of each section, or the first error and exits
+          with status 1
+    """
+    parser = argparse.ArgumentParser(
+        description="Checks data.json and game/data and compiles them into "
+                    "the content pack the app loads at startup.")
+    parser.add_argument("-o", "--output", default=PACK_PATH,
+                        help="where to write the pack "
+                             "(default: content.pack)")
+    parser.add_argument("--check", action="store_true",
+                        help="only check the content, without writing a "
+                             "pack")
+    options = parser.parse_args()
+
+    cache = ContentCache()
+
+    try:
+        if options.check:
+            for name in SECTIONS:
+                cache.compile_section(name)
+        else:
+            sizes = build(cache, options.output)
+    except ValueError as error:
+        print(f"Invalid content: {error}", file=sys.stderr)
+        sys.exit(1)
+
+    for path in missing_images(cache.section("information-pages")):
+        print(f"Warning: {path} doesn't exist", file=sys.stderr)
+
+    if options.check:
+        print("The content is valid")
+        return
+
+    for (name, size) in sizes.items():
+        print(f"  {name:<20}{size:>8} bytes")
+    print(f"Wrote {options.output}")
+
+
+if __name__ == "__main__":
+    main()
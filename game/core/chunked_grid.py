@@ -0,0 +1,228 @@
+from game.core.compact_grid import EMPTY_KIND, RowView, kind_of
+from game.entities.empty import EMPTY
+
+
+class ChunkedGrid:
+    """
+    The game grid for very large maps, stored in square chunks.
+
+    A chunk is only allocated when something is placed in it, and chunks
+    that become empty can be evicted, so memory grows with the number of
+    entities rather than the size of the map. Tiles in missing chunks are
+    empty.
+
+    It has the same interface as CompactGrid, so GameState can use either.
+
+    Attributes:
+        - width (int):
+            The number of columns
+        - height (int):
+            The number of rows
+        - chunk_size (int):
+            The number of tiles along each side of a chunk
+        - chunks (dict[tuple[int, int]: _Chunk]):
+            The allocated chunks, keyed by chunk coordinates
+        - empty_chunks (set[tuple[int, int]]):
+            The coordinates of allocated chunks that are currently empty
+    """
+
+    def __init__(self, width, height, chunk_size=16):
+        """
+        Initialises the grid with every tile empty and no chunks allocated.
+
+        Args:
+            - width (int):
+                The number of columns
+            - height (int):
+                The number of rows
+            - chunk_size (int):
+                The number of tiles along each side of a chunk
+        """
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+
+        self.chunks = {}
+        self.empty_chunks = set()
+
+    def entity_at(self, position):
+        """
+        Returns the entity in a tile.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+        """
+        (x, y) = position
+        size = self.chunk_size
+        chunk = self.chunks.get((x // size, y // size))
+
+        if chunk is None:
+            return EMPTY
+
+        return chunk.entities.get((y % size) * size + x % size, EMPTY)
+
+    def kind_at(self, position):
+        """
+        Returns the kind code of a tile.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+        """
+        (x, y) = position
+        size = self.chunk_size
+        chunk = self.chunks.get((x // size, y // size))
+
+        if chunk is None:
+            return EMPTY_KIND
+
+        return chunk.kinds[(y % size) * size + x % size]
+
+    def is_empty(self, position):
+        """Returns whether a tile is empty."""
+        return self.kind_at(position) == EMPTY_KIND
+
+    def kinds_in(self, left, top, width, height):
+        """
+        Returns the kind codes of a rectangle of tiles.
+
+        Only the allocated chunks overlapping the rectangle are copied, a
+        row at a time.
+
+        Args:
+            - left (int):
+                The column of the rectangle's left edge
+            - top (int):
+                The row of the rectangle's top edge
+            - width (int):
+                The number of columns in the rectangle
+            - height (int):
+                The number of rows in the rectangle
+
+        Returns:
+            - bytearray:
+                The kind code of each tile, in row-major order
+        """
+        size = self.chunk_size
+        kinds = bytearray(width * height)
+        (right, bottom) = (left + width, top + height)
+
+        for chunk_y in range(top // size, (bottom - 1) // size + 1):
+            for chunk_x in range(left // size, (right - 1) // size + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is None:
+                    continue
+
+                start_x = max(left, chunk_x * size)
+                length = min(right, (chunk_x + 1) * size) - start_x
+
+                for y in range(max(top, chunk_y * size),
+                               min(bottom, (chunk_y + 1) * size)):
+                    source = (y % size) * size + start_x % size
+                    target = (y - top) * width + start_x - left
+                    kinds[target:target + length] = (
+                        chunk.kinds[source:source + length])
+
+        return kinds
+
+    def place(self, position, entity, kind=None):
+        """
+        Puts an entity in a tile.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+            - entity (Entity):
+                The entity to put in the tile
+            - kind (int):
+                The entity's kind code, if the caller already knows it
+
+        Actions:
+            - Allocates the tile's chunk if it's missing and needed
+            - Replaces the entity in the chunk
+            - Keeps track of whether the chunk is empty
+        """
+        (x, y) = position
+        size = self.chunk_size
+        key = (x // size, y // size)
+        chunk = self.chunks.get(key)
+
+        if kind is None:
+            kind = kind_of(entity)
+
+        if chunk is None:
+            if kind == EMPTY_KIND:
+                return
+
+            chunk = self.chunks[key] = _Chunk(size)
+
+        index = (y % size) * size + x % size
+
+        if chunk.kinds[index] != EMPTY_KIND:
+            del chunk.entities[index]
+
+        if kind != EMPTY_KIND:
+            chunk.entities[index] = entity
+
+        chunk.kinds[index] = kind
+
+        if chunk.entities:
+            self.empty_chunks.discard(key)
+        else:
+            self.empty_chunks.add(key)
+
+    def evict_chunks(self, centre, keep_distance=2):
+        """
+        Frees empty chunks that are far from a position.
+
+        Empty chunks near the position are kept, since entities are likely
+        to move back into them.
+
+        Args:
+            - centre (tuple[int, int]):
+                The position to keep chunks around, usually the player's
+            - keep_distance (int):
+                How many chunks away from the centre to keep empty chunks
+        """
+        (x, y) = centre
+        centre_x = x // self.chunk_size
+        centre_y = y // self.chunk_size
+
+        for key in list(self.empty_chunks):
+            (chunk_x, chunk_y) = key
+            if max(abs(chunk_x - centre_x),
+                   abs(chunk_y - centre_y)) > keep_distance:
+                del self.chunks[key]
+                self.empty_chunks.discard(key)
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.height:
+            raise IndexError("grid row out of range")
+
+        return RowView(self, y)
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield RowView(self, y)
+
+
+class _Chunk:
+    """
+    A square block of tiles in a ChunkedGrid.
+
+    Attributes:
+        - kinds (bytearray):
+            The kind code of each tile, in row-major order
+        - entities (dict[int: Entity]):
+            The entities in the chunk's non-empty tiles, by row-major index
+    """
+
+    __slots__ = ("kinds", "entities")
+
+    def __init__(self, size):
+        self.kinds = bytearray(size * size)
+        self.entities = {}
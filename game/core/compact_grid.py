@@ -0,0 +1,241 @@
+from array import array
+from game.entities.creature import Creature
+from game.entities.empty import EMPTY
+from game.entities.items import Item
+
+
+EMPTY_KIND = 0
+CREATURE_KIND = 1
+ITEM_KIND = 2
+
+# The names of the GameState position indexes, in kind code order
+KIND_NAMES = ("empties", "creatures", "items")
+
+
+class CompactGrid:
+    """
+    The game grid, stored in flat typed arrays.
+
+    Each tile is a one-byte kind code and an entity id. Empty tiles have the
+    id 0 and share the EMPTY entity, so emptying a tile allocates nothing.
+    The ids of other entities index into an entity table.
+
+    grid[y][x].entity still works for existing callers, through RowView and
+    TileView, but the game logic uses entity_at and place directly.
+
+    Attributes:
+        - width (int):
+            The number of columns
+        - height (int):
+            The number of rows
+        - kinds (array):
+            The kind code of each tile, in row-major order
+        - ids (array):
+            The entity id of each tile, in row-major order
+        - entities (list[Entity or None]):
+            The entity table, indexed by entity id
+        - free_ids (list[int]):
+            Ids in the entity table that can be reused
+    """
+
+    def __init__(self, width, height):
+        """
+        Initialises the grid with every tile empty.
+
+        Args:
+            - width (int):
+                The number of columns
+            - height (int):
+                The number of rows
+        """
+        self.width = width
+        self.height = height
+
+        self.kinds = array("B", bytes(width * height))
+        self.ids = array("I", bytes(4 * width * height))
+
+        self.entities = [EMPTY]
+        self.free_ids = []
+
+    def entity_at(self, position):
+        """
+        Returns the entity in a tile.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+        """
+        (x, y) = position
+        return self.entities[self.ids[y * self.width + x]]
+
+    def kind_at(self, position):
+        """
+        Returns the kind code of a tile.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+        """
+        (x, y) = position
+        return self.kinds[y * self.width + x]
+
+    def is_empty(self, position):
+        """Returns whether a tile is empty."""
+        return self.kind_at(position) == EMPTY_KIND
+
+    def kinds_in(self, left, top, width, height):
+        """
+        Returns the kind codes of a rectangle of tiles.
+
+        Args:
+            - left (int):
+                The column of the rectangle's left edge
+            - top (int):
+                The row of the rectangle's top edge
+            - width (int):
+                The number of columns in the rectangle
+            - height (int):
+                The number of rows in the rectangle
+
+        Returns:
+            - bytearray:
+                The kind code of each tile, in row-major order
+        """
+        kinds = bytearray()
+
+        for y in range(top, top + height):
+            start = y * self.width + left
+            kinds += self.kinds[start:start + width]
+
+        return kinds
+
+    def place(self, position, entity, kind=None):
+        """
+        Puts an entity in a tile.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+            - entity (Entity):
+                The entity to put in the tile
+            - kind (int):
+                The entity's kind code, if the caller already knows it
+
+        Actions:
+            - Frees the id of the entity that was in the tile
+            - Gives the new entity an id, unless it's empty
+            - Stores the kind code and id
+        """
+        (x, y) = position
+        index = y * self.width + x
+
+        old_id = self.ids[index]
+        if old_id:
+            self.entities[old_id] = None
+            self.free_ids.append(old_id)
+
+        if kind is None:
+            kind = kind_of(entity)
+
+        if kind == EMPTY_KIND:
+            new_id = 0
+        elif self.free_ids:
+            new_id = self.free_ids.pop()
+            self.entities[new_id] = entity
+        else:
+            new_id = len(self.entities)
+            self.entities.append(entity)
+
+        self.kinds[index] = kind
+        self.ids[index] = new_id
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.height:
+            raise IndexError("grid row out of range")
+
+        return RowView(self, y)
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield RowView(self, y)
+
+
+class RowView:
+    """
+    A row of a CompactGrid, so that grid[y][x] keeps working.
+
+    Attributes:
+        - grid (CompactGrid):
+            The grid the row belongs to
+        - y (int):
+            The row's index
+    """
+
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.y = y
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.grid.width:
+            raise IndexError("grid column out of range")
+
+        return TileView(self.grid, (x, self.y))
+
+    def __len__(self):
+        return self.grid.width
+
+    def __iter__(self):
+        for x in range(self.grid.width):
+            yield TileView(self.grid, (x, self.y))
+
+
+class TileView:
+    """
+    A tile of a CompactGrid, so that grid[y][x].entity keeps working.
+
+    Setting the entity through a view changes the grid but not the
+    GameState position indexes, so game logic should use
+    GameState.set_entity instead.
+
+    Attributes:
+        - grid (CompactGrid):
+            The grid the tile belongs to
+        - position (tuple[int, int]):
+            The tile's position
+    """
+
+    def __init__(self, grid, position):
+        self.grid = grid
+        self.position = position
+
+    @property
+    def entity(self):
+        """The entity in the tile."""
+        return self.grid.entity_at(self.position)
+
+    @entity.setter
+    def entity(self, entity):
+        self.grid.place(self.position, entity)
+
+
+def kind_of(entity):
+    """
+    Returns the kind code of an entity.
+
+    Args:
+        - entity (Entity):
+            The entity to look up
+
+    Returns:
+        - int:
+            CREATURE_KIND, ITEM_KIND or EMPTY_KIND
+    """
+    if isinstance(entity, Creature):
+        return CREATURE_KIND
+    elif isinstance(entity, Item):
+        return ITEM_KIND
+    else:
+        return EMPTY_KIND
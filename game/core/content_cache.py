@@ -0,0 +1,218 @@
+import json
+import os
+from game.core.content_pack import ContentPack, SECTIONS
+from game.core.spawn_table import SpawnTable
+
+
+# The directory the game's data files are in
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                              "data")
+
+
+class ContentCache:
+    """
+    Parses each data file once per process and shares the result.
+
+    A file is only read again when its modification time changes, so
+    restarting a game, or running many games side by side, only checks the
+    files' modification times. What's cached must not be changed by the
+    code using it, since every user shares the same copy.
+
+    Sections (see content_pack.SECTIONS) are read from a prebuilt content
+    pack when it has an up to date copy, which skips parsing and
+    validating the JSON, and compiled from the JSON files otherwise.
+    Either way, a section is read again once its JSON file changes.
+
+    Attributes:
+        - directory (str):
+            The directory the data files are in
+        - pack (ContentPack or None):
+            The pack to read sections from first, if any
+        - sections (dict[str: tuple]):
+            Maps each section read from the pack to its JSON file's
+            modification time when it was read, or None if there is no
+            file, and the section's content
+        - spawn_tables (dict[str: tuple]):
+            Maps each section of templates a spawn table was built for to
+            the section's content it was built from and the table
+        - entries (dict[tuple: tuple]):
+            Maps each file and the function that compiled it to the file's
+            modification time when it was read and the compiled content
+        - reads (int):
+            The number of times a file has been read, for checking that
+            the cache is being used
+    """
+
+    def __init__(self, directory=DATA_DIRECTORY, pack=None):
+        """
+        Initialises an empty cache.
+
+        Args:
+            - directory (str):
+                The directory the data files are in
+                (Default: game/data)
+            - pack (ContentPack or None):
+                The pack to read sections from first
+                (Default: always compile them from the JSON files)
+        """
+        self.directory = directory
+        self.pack = pack
+        self.sections = {}
+        self.spawn_tables = {}
+        self.entries = {}
+        self.reads = 0
+
+    def section(self, name):
+        """
+        Returns a section of the game's content, reading as little as it
+        can.
+
+        Args:
+            - name (str):
+                The section's name, one of content_pack.SECTIONS
+
+        Actions:
+            - Checks the modification time of the section's JSON file
+            - Returns the section if it was read from the pack since the
+              file last changed
+            - Reads it from the pack if the pack has an up to date copy
+            - Otherwise compiles it from its JSON file, which is cached
+              like any other file
+
+        Raises:
+            - ValueError:
+                If it's compiled from a JSON file that is invalid
+
+        Returns:
+            - The section's compiled content
+        """
+        if self.pack is None:
+            return self.compile_section(name)
+
+        source = os.path.join(self.directory, SECTIONS[name][0])
+        try:
+            modified = os.stat(source).st_mtime_ns
+        except OSError:
+            # A release can ship the pack without the JSON files
+            modified = None
+
+        entry = self.sections.pop(name, None)
+        if entry is not None and entry[0] == modified:
+            self.sections[name] = entry
+            return entry[1]
+
+        content = self.pack.section(name, source)
+        if content is None:
+            return self.compile_section(name)
+
+        self.sections[name] = (modified, content)
+        return content
+
+    def spawn_table(self, name):
+        """
+        Returns the spawn table for a section of templates, building it
+        only if the section changed.
+
+        Args:
+            - name (str):
+                The section's name, "enemies" or "items"
+
+        Actions:
+            - Gets the section, as section does
+            - Returns the table built from it if there is one, so the
+              bands of alias tables it has built are shared
+            - Otherwise builds and caches a table for it
+
+        Raises:
+            - ValueError:
+                If the section is invalid, or nothing can spawn at some
+                score
+
+        Returns:
+            - SpawnTable:
+                The table
+        """
+        templates = self.section(name)
+
+        # The section is kept in the entry, so it can't be replaced by a
+        # new one with the same id
+        entry = self.spawn_tables.get(name)
+        if entry is not None and entry[0] is templates:
+            return entry[1]
+
+        table = SpawnTable(tuple(templates.values()))
+        self.spawn_tables[name] = (templates, table)
+
+        return table
+
+    def compile_section(self, name):
+        """
+        Compiles a section from its JSON file, without using the pack.
+
+        Args:
+            - name (str):
+                The section's name, one of content_pack.SECTIONS
+
+        Raises:
+            - ValueError:
+                If the JSON file is invalid
+
+        Returns:
+            - The section's compiled content
+        """
+        (filename, compiler, key) = SECTIONS[name]
+        content = self.load(filename, compiler)
+
+        return content if key is None else content[key]
+
+    def load(self, filename, compiler=None):
+        """
+        Returns a data file's content, reading it only if it changed.
+
+        Args:
+            - filename (str):
+                The name of the JSON file in the directory, or its absolute
+                path
+            - compiler (function or None):
+                A function called as compiler(filename, data) to turn the
+                parsed JSON into what's cached. If None, the parsed JSON is
+                cached as it is
+
+        Actions:
+            - Checks the file's modification time
+            - If it was read and compiled the same way since it last
+              changed, returns the cached content
+            - Otherwise reads, parses and compiles it, and caches it
+
+        Returns:
+            - The file's compiled content
+        """
+        path = os.path.join(self.directory, filename)
+        modified = os.stat(path).st_mtime_ns
+        key = (filename, compiler)
+
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == modified:
+            return entry[1]
+
+        with open(path, "r") as json_file:
+            content = json.load(json_file)
+        self.reads += 1
+
+        if compiler is not None:
+            content = compiler(filename, content)
+
+        self.entries[key] = (modified, content)
+
+        return content
+
+    def clear(self):
+        """Forgets everything, so every file is read again when loaded."""
+        self.entries.clear()
+        self.sections.clear()
+        self.spawn_tables.clear()
+
+
+# The cache every screen and EntityFactory shares unless it's given its
+# own, which reads from content.pack if it has been built
+content_cache = ContentCache(pack=ContentPack())
@@ -0,0 +1,454 @@
+import json
+import os
+import struct
+import zlib
+from game.core.templates import (CreatureTemplate, ItemTemplate,
+                                 compile_creatures, compile_items)
+from game.core.spawn_table import SpawnTable
+
+
+# The directory main.py, data.json and images/ are in
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+# The pages of information and the quiz
+PAGES_PATH = os.path.join(PROJECT_DIRECTORY, "data.json")
+
+# Where build_content.py writes the pack by default
+PACK_PATH = os.path.join(PROJECT_DIRECTORY, "content.pack")
+
+# The first bytes of every pack
+MAGIC = b"HCPK"
+
+# The version of the format. A pack from another version is ignored
+PACK_VERSION = 3
+
+# The shape each page in data.json must have. A dict gives the type of
+# each key, and a list the type of every item in it
+PAGE_SCHEMAS = {
+    "information-pages": {
+        "title": str,
+        "img": str,
+        "sections": [{"heading-title": str, "text": str}]
+    },
+    "quiz": {
+        "question": str,
+        "answers": [str],
+        "correct_answer_index": int
+    }
+}
+
+_HEADER = struct.Struct("<4sHHI")
+_SECTION = struct.Struct("<24sIII")
+
+
+def compile_pages(filename, data):
+    """
+    Checks every page in data.json against its schema.
+
+    Args:
+        - filename (str):
+            The path of data.json, for error messages
+        - data (dict):
+            The parsed file
+
+    Raises:
+        - ValueError:
+            If a page type is missing, a page doesn't match its schema or a
+            quiz answer is out of range
+
+    Returns:
+        - dict[str: list[dict]]:
+            Maps each type of page to its pages
+    """
+    name = os.path.basename(filename)
+
+    if not isinstance(data, dict):
+        raise ValueError(f"{name} must be an object")
+
+    pages = {}
+    for (page_type, schema) in PAGE_SCHEMAS.items():
+        if page_type not in data:
+            raise ValueError(f"{name}: {page_type} is missing")
+
+        validate(f"{name}: {page_type}", data.get(page_type), [schema])
+        pages[page_type] = data[page_type]
+
+    for (index, page) in enumerate(pages["quiz"]):
+        if not 0 <= page["correct_answer_index"] < len(page["answers"]):
+            raise ValueError(f"{name}: quiz[{index}]: correct_answer_index "
+                             "must be the index of one of the answers")
+
+    return pages
+
+
+def missing_images(pages):
+    """
+    Finds the images the information pages show that don't exist.
+
+    A missing image only leaves a gap on its page, so it's reported
+    rather than stopping the pack being built.
+
+    Args:
+        - pages (list[dict]):
+            The compiled information pages
+
+    Returns:
+        - list[str]:
+            The paths of the missing images, relative to the project
+    """
+    return [f"images/{page['img']}" for page in pages
+            if not os.path.exists(os.path.join(PROJECT_DIRECTORY, "images",
+                                               page["img"]))]
+
+
+def validate(path, value, schema):
+    """
+    Checks a parsed JSON value against a schema.
+
+    Args:
+        - path (str):
+            Where the value is, for error messages
+        - value:
+            The value to check
+        - schema (type, list or dict):
+            A type the value must be, a list holding the schema of every
+            item in a list, or a dict holding the schema of each key an
+            object must have
+
+    Raises:
+        - ValueError:
+            If the value doesn't match, naming where it is
+    """
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            raise ValueError(f"{path} must be an object")
+
+        for (key, key_schema) in schema.items():
+            if key not in value:
+                raise ValueError(f"{path}: {key} is missing")
+
+            validate(f"{path}: {key}", value[key], key_schema)
+
+    elif isinstance(schema, list):
+        if not isinstance(value, list):
+            raise ValueError(f"{path} must be a list")
+
+        for (index, item) in enumerate(value):
+            validate(f"{path}[{index}]", item, schema[0])
+
+    elif isinstance(value, bool) or not isinstance(value, schema):
+        raise ValueError(f"{path} must be a {schema.__name__}, "
+                         f"not {value!r}")
+
+
+def compile_spawnable_creatures(filename, data):
+    """
+    Compiles enemies.json, checking something can spawn at every score.
+
+    Args:
+        - filename (str):
+            The name of the JSON file, for error messages
+        - data (dict):
+            The parsed file
+
+    Raises:
+        - ValueError:
+            If an entry is invalid or nothing can spawn at some score
+
+    Returns:
+        - dict[str: CreatureTemplate]:
+            The templates, as compile_creatures returns them
+    """
+    templates = compile_creatures(filename, data)
+    SpawnTable(tuple(templates.values()))
+    return templates
+
+
+def compile_spawnable_items(filename, data):
+    """
+    Compiles items.json, checking something can spawn at every score.
+
+    Args:
+        - filename (str):
+            The name of the JSON file, for error messages
+        - data (dict):
+            The parsed file
+
+    Raises:
+        - ValueError:
+            If an entry is invalid or nothing can spawn at some score
+
+    Returns:
+        - dict[str: ItemTemplate]:
+            The templates, as compile_items returns them
+    """
+    templates = compile_items(filename, data)
+    SpawnTable(tuple(templates.values()))
+    return templates
+
+
+# The template each entry of a section of templates is stored as. Other
+# sections are stored as they are
+TEMPLATE_CLASSES = {
+    "enemies": CreatureTemplate,
+    "player": CreatureTemplate,
+    "items": ItemTemplate
+}
+
+
+# Each section of a pack: the file it's compiled from (relative to the
+# game's data directory, unless it's absolute), the function that
+# compiles it, and the key of the compiled content the section holds, or
+# None for all of it
+SECTIONS = {
+    "information-pages": (PAGES_PATH, compile_pages, "information-pages"),
+    "quiz": (PAGES_PATH, compile_pages, "quiz"),
+    "enemies": ("enemies.json", compile_spawnable_creatures, None),
+    "player": ("player.json", compile_creatures, None),
+    "items": ("items.json", compile_spawnable_items, None)
+}
+
+
+def layout():
+    """
+    Returns a checksum of what compiled content looks like.
+
+    Compiled templates are stored as they are, so a pack made before a
+    template gained or lost a field can't be used. The checksum is stored
+    in each pack and a pack with a different one is ignored.
+
+    Returns:
+        - int:
+            The checksum
+    """
+    fields = (CreatureTemplate._fields, ItemTemplate._fields,
+              sorted(SECTIONS), sorted(PAGE_SCHEMAS),
+              sorted(TEMPLATE_CLASSES))
+    return zlib.crc32(repr(fields).encode())
+
+
+def encode(name, content):
+    """
+    Stores a compiled section as JSON.
+
+    Templates are stored as lists of their fields' values, in order.
+
+    Args:
+        - name (str):
+            The section's name, one of SECTIONS
+        - content:
+            The section's compiled content
+
+    Returns:
+        - bytes:
+            The section's payload
+    """
+    if name in TEMPLATE_CLASSES:
+        content = {template_name: list(template)
+                   for (template_name, template) in content.items()}
+
+    return json.dumps(content, separators=(",", ":")).encode()
+
+
+def decode(name, payload):
+    """
+    Reads a compiled section back from the JSON encode stored.
+
+    Args:
+        - name (str):
+            The section's name, one of SECTIONS
+        - payload (bytes):
+            The section's payload
+
+    Raises:
+        - ValueError:
+            If the payload isn't valid JSON, or a section of templates
+            isn't an object
+        - TypeError:
+            If a template doesn't have the fields it should
+
+    Returns:
+        - The section's compiled content, as the compiler returned it
+    """
+    content = json.loads(payload)
+
+    if name not in TEMPLATE_CLASSES:
+        return content
+
+    if not isinstance(content, dict):
+        raise ValueError(f"The {name} section must be an object")
+
+    template_class = TEMPLATE_CLASSES[name]
+    templates = {}
+
+    for (template_name, values) in content.items():
+        template = template_class(*values)
+        templates[template_name] = template._replace(
+            spawn_weights=tuple(map(tuple, template.spawn_weights)))
+
+    return templates
+
+
+def build(cache, path=PACK_PATH):
+    """
+    Validates every section's source and writes them into a pack.
+
+    The pack is a header, a table giving where each section starts, how
+    long it is and its CRC, and then the sections themselves, so a section
+    can be read and checked without reading the rest.
+
+    Args:
+        - cache (ContentCache):
+            The cache to compile the sections with, which reads them from
+            their JSON files
+        - path (str):
+            Where to write the pack
+
+    Raises:
+        - ValueError:
+            If any source is invalid. Nothing is written
+
+    Returns:
+        - dict[str: int]:
+            The size of each section in bytes
+    """
+    payloads = {name: encode(name, cache.compile_section(name))
+                for name in SECTIONS}
+
+    table = []
+    offset = _HEADER.size + _SECTION.size * len(payloads)
+    for (name, payload) in payloads.items():
+        table.append(_SECTION.pack(name.encode(), offset, len(payload),
+                                   zlib.crc32(payload)))
+        offset += len(payload)
+
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as pack_file:
+        pack_file.write(_HEADER.pack(MAGIC, PACK_VERSION, len(payloads),
+                                     layout()))
+        pack_file.write(b"".join(table))
+        pack_file.write(b"".join(payloads.values()))
+
+    os.replace(temporary_path, path)
+
+    return {name: len(payload) for (name, payload) in payloads.items()}
+
+
+class ContentPack:
+    """
+    Reads sections out of a pack written by build.
+
+    The header and the section table are read the first time a section is
+    asked for, and after that each section is read with one seek, only
+    when it's needed.
+
+    A section is only used if it's newer than the file it was compiled
+    from, so editing the JSON files while developing takes effect without
+    rebuilding the pack. If the pack doesn't exist, or is from another
+    version, nothing is read from it and the JSON files are used instead.
+    So is a section that's truncated or corrupt.
+
+    Attributes:
+        - path (str):
+            The pack's path
+        - sections (dict[str: tuple[int, int, int]] or None):
+            Maps each section's name to where it starts, its length and its
+            CRC, or None if the table hasn't been read yet. Empty if the
+            pack can't be used
+        - modified (int):
+            When the pack was written, in nanoseconds
+        - reads (int):
+            The number of sections read, for checking only the ones that
+            are needed are
+    """
+
+    def __init__(self, path=PACK_PATH):
+        """
+        Initialises the reader, without opening the pack yet.
+
+        Args:
+            - path (str):
+                The pack's path (Default: content.pack)
+        """
+        self.path = path
+        self.sections = None
+        self.modified = 0
+        self.reads = 0
+
+    def section(self, name, source=None):
+        """
+        Reads a section, if the pack has an up to date copy of it.
+
+        Args:
+            - name (str):
+                The section's name, one of SECTIONS
+            - source (str or None):
+                The path of the file the section is compiled from. If it's
+                newer than the pack, the section isn't read
+
+        Returns:
+            - The section's compiled content, or None if the pack doesn't
+              have an up to date, intact copy
+        """
+        if self.sections is None:
+            self.read_table()
+
+        location = self.sections.get(name)
+        if location is None:
+            return None
+
+        if (source is not None and os.path.exists(source)
+                and os.stat(source).st_mtime_ns > self.modified):
+            return None
+
+        (offset, length, checksum) = location
+        try:
+            with open(self.path, "rb") as pack_file:
+                pack_file.seek(offset)
+                payload = pack_file.read(length)
+        except OSError:
+            return None
+        self.reads += 1
+
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            return None
+
+        try:
+            return decode(name, payload)
+        except (ValueError, TypeError):
+            return None
+
+    def read_table(self):
+        """
+        Reads the header and the section table.
+
+        Actions:
+            - If the pack doesn't exist, or its header is from another
+              version or layout, leaves sections empty
+            - Otherwise reads where each section is
+        """
+        self.sections = {}
+
+        try:
+            with open(self.path, "rb") as pack_file:
+                self.modified = os.fstat(pack_file.fileno()).st_mtime_ns
+                header = pack_file.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+
+                (magic, version, count, checksum) = _HEADER.unpack(header)
+                if (magic, version, checksum) != (MAGIC, PACK_VERSION,
+                                                  layout()):
+                    return
+
+                table = pack_file.read(_SECTION.size * count)
+                if len(table) < _SECTION.size * count:
+                    return
+        except OSError:
+            return
+
+        # A corrupt name just leaves its section unused
+        for (name, offset, length, checksum) in _SECTION.iter_unpack(table):
+            name = name.rstrip(b"\0").decode(errors="replace")
+            self.sections[name] = (offset, length, checksum)
@@ -0,0 +1,92 @@
+class DecayWheel:
+    """
+    The stat decay from the items the player has eaten, as running totals.
+
+    Each item's decay lasts a number of turns. Rather than keeping a list of
+    the items and counting each one down every turn, the totals of every
+    item in effect are kept, along with a bucket for each turn an item
+    wears off in. Every turn only that turn's bucket is looked at, so
+    adding an item, reading the totals and counting down are all O(1)
+    however many items are stacked.
+
+    The decay amounts are ints, so the totals are always exactly the sums
+    of the items in effect.
+
+    Attributes:
+        - max_health (int):
+            The total decay to max health of the items in effect
+        - speed (int):
+            The total decay to speed of the items in effect
+        - attack_damage (int):
+            The total decay to attack damage of the items in effect
+        - turn (int):
+            The number of turns counted down so far
+        - expiries (dict[int: list[int]]):
+            Maps each turn that items wear off in to the total max health,
+            speed and attack damage decay, and the number of items, to
+            remove then
+    """
+
+    def __init__(self):
+        """Initialises the wheel with nothing in effect."""
+        self.max_health = 0
+        self.speed = 0
+        self.attack_damage = 0
+
+        self.turn = 0
+        self.expiries = {}
+
+    def __len__(self):
+        """Returns the number of items in effect."""
+        return sum(expiry[3] for expiry in self.expiries.values())
+
+    def add(self, max_health, speed, attack_damage, duration):
+        """
+        Starts an item's decay.
+
+        Args:
+            - max_health (int):
+                The amount to remove from max health each turn
+            - speed (int):
+                The amount to remove from speed each turn
+            - attack_damage (int):
+                The amount to remove from attack damage each turn
+            - duration (int):
+                The number of turns the decay lasts. It always lasts for
+                the turn the item is eaten in, even if this is 0
+
+        Actions:
+            - Adds the decay to the totals
+            - Adds it to the bucket of the turn it wears off in
+        """
+        self.max_health += max_health
+        self.speed += speed
+        self.attack_damage += attack_damage
+
+        end_turn = self.turn + max(duration, 1)
+
+        expiry = self.expiries.get(end_turn)
+        if expiry is None:
+            self.expiries[end_turn] = [max_health, speed, attack_damage, 1]
+        else:
+            expiry[0] += max_health
+            expiry[1] += speed
+            expiry[2] += attack_damage
+            expiry[3] += 1
+
+    def countdown(self):
+        """
+        Counts down a turn.
+
+        Actions:
+            - Moves on to the next turn
+            - Removes the decay of the items that wear off in it from the
+              totals
+        """
+        self.turn += 1
+
+        expiry = self.expiries.pop(self.turn, None)
+        if expiry is not None:
+            self.max_health -= expiry[0]
+            self.speed -= expiry[1]
+            self.attack_damage -= expiry[2]
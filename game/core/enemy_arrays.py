@@ -0,0 +1,366 @@
+import numpy as np
+from game.core.flow_field import DIRECTIONS, UNREACHED
+from game.entities.empty import EMPTY
+from game.entities.enemy import Enemy
+
+
+_DIRECTIONS = np.array(DIRECTIONS)
+
+# The index in DIRECTIONS of each step, by the signs of its dy and dx
+_STRAIGHT = np.array([[DIRECTIONS.index((dx, dy)) if dx or dy else -1
+                       for dx in (-1, 0, 1)]
+                      for dy in (-1, 0, 1)])
+
+
+class EnemyArrays:
+    """
+    Stores the enemies' numbers in parallel NumPy arrays.
+
+    Each enemy has a slot in the arrays. GameState keeps the slots in step
+    with the Enemy objects, which are still what the grid holds.
+
+    The arrays let take_turns resolve every enemy turn before the player's
+    next turn as one vectorised step, giving the same result as calling
+    Enemy.take_turn on each enemy in turn order. The steps are looked up in
+    the game state's flow field all at once.
+
+    Attributes:
+        - x (np.ndarray):
+            Each enemy's column
+        - y (np.ndarray):
+            Each enemy's row
+        - speed (np.ndarray):
+            Each enemy's speed
+        - turn_meter (np.ndarray):
+            Each enemy's turn meter as of its last turn
+        - curr_health (np.ndarray):
+            Each enemy's current health
+        - attack_damage (np.ndarray):
+            Each enemy's attack damage
+        - enemies (list[Enemy or None]):
+            The enemy in each slot
+        - slots (dict[int: int]):
+            Maps id(enemy) to the enemy's slot
+        - free_slots (list[int]):
+            Slots that can be reused
+    """
+
+    fields = ("x", "y", "speed", "turn_meter", "curr_health", "attack_damage")
+
+    def __init__(self, capacity=64):
+        """
+        Initialises the store with no enemies.
+
+        Args:
+            - capacity (int):
+                The number of slots to allocate to begin with
+        """
+        for field in self.fields:
+            setattr(self, field, np.zeros(capacity, dtype=np.int64))
+
+        self.enemies = [None] * capacity
+        self.slots = {}
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+    def add(self, enemy):
+        """
+        Gives an enemy a slot and copies its numbers into it.
+
+        Args:
+            - enemy (Enemy):
+                The enemy to add
+
+        Actions:
+            - Doubles the size of the arrays if there are no free slots
+            - Takes a free slot
+            - Copies the enemy's numbers into the slot
+        """
+        if not self.free_slots:
+            self._grow()
+
+        slot = self.free_slots.pop()
+        self.slots[id(enemy)] = slot
+        self.enemies[slot] = enemy
+        self.sync(enemy)
+
+    def remove(self, enemy):
+        """
+        Frees an enemy's slot.
+
+        Args:
+            - enemy (Enemy):
+                The enemy to remove
+        """
+        slot = self.slots.pop(id(enemy), None)
+
+        if slot is not None:
+            self.enemies[slot] = None
+            self.free_slots.append(slot)
+
+    def sync(self, enemy):
+        """
+        Copies an enemy's numbers into its slot after they changed.
+
+        Args:
+            - enemy (Enemy):
+                The enemy to copy
+        """
+        slot = self.slots[id(enemy)]
+
+        (self.x[slot], self.y[slot]) = enemy.position
+        self.speed[slot] = enemy.speed
+        self.turn_meter[slot] = enemy.turn_meter
+        self.curr_health[slot] = enemy.curr_health
+        self.attack_damage[slot] = enemy.attack_damage
+
+    def take_turns(self, game_state):
+        """
+        Takes the turns of the enemies that act before the player's next turn.
+
+        Actions:
+            - Starts enemy turns in the scheduler's order, stopping:
+                - When it's not an enemy's turn next
+                - Before an enemy that already acted could act again
+                - At the turn that would make an item or enemy spawn
+                - At the turn that would kill the player
+            - Works out what each enemy does in one vectorised step
+            - Applies the moves and attacks in turn order
+            - Finishes the turns, as GameState.finish_turn would have
+
+        Args:
+            - game_state (GameState):
+                The current game state
+
+        Returns:
+            - boolean:
+                True if any enemies took their turns
+                False if it's not an enemy's turn next
+        """
+        scheduler = game_state.scheduler
+        player = game_state.player
+        (player_x, player_y) = player.position
+
+        turn_limit = min(game_state.enemy_spawn_timer,
+                         game_state.item_spawn_timer)
+        player_health = player.curr_health
+        earliest_repeat = None
+        enemies = []
+
+        while len(enemies) < turn_limit:
+            upcoming = scheduler.peek()
+            if upcoming is None:
+                break
+
+            (ready, enemy) = upcoming
+            if not isinstance(enemy, Enemy):
+                break
+            if earliest_repeat is not None and ready >= earliest_repeat:
+                break
+
+            scheduler.next_actor()
+            enemies.append(enemy)
+
+            repeat = scheduler.earliest_next_turn(enemy)
+            if repeat is not None:
+                earliest_repeat = min(earliest_repeat or repeat, repeat)
+
+            (enemy_x, enemy_y) = enemy.position
+            if (abs(enemy_x - player_x) <= 1
+                    and abs(enemy_y - player_y) <= 1):
+                player_health -= enemy.attack_damage
+                if player_health <= 0:
+                    break
+
+        if not enemies:
+            return False
+
+        slots = np.fromiter((self.slots[id(enemy)] for enemy in enemies),
+                            dtype=np.int64, count=len(enemies))
+        (attacks, moves, destinations) = self._resolve(
+            game_state, slots, player_x, player_y)
+
+        for index in np.flatnonzero(moves):
+            enemy = enemies[index]
+            origin = enemy.position
+            destination = (int(destinations[0][index]),
+                           int(destinations[1][index]))
+
+            game_state.set_entity(destination, enemy)
+            enemy.position = destination
+            game_state.set_entity(origin, EMPTY)
+
+        for index in np.flatnonzero(attacks):
+            enemies[index].attack_creature(player)
+
+        self.x[slots[moves]] = destinations[0][moves]
+        self.y[slots[moves]] = destinations[1][moves]
+
+        # The turns are rescheduled together, so finish_turn only has the
+        # last turn's spawning and clean up left to do
+        scheduler.finish_turns(enemies)
+        game_state.enemy_spawn_timer -= len(enemies) - 1
+        game_state.item_spawn_timer -= len(enemies) - 1
+
+        game_state.current_actor = None
+        game_state.finish_turn()
+
+        self.turn_meter[slots] = [enemy.turn_meter for enemy in enemies]
+
+        return True
+
+    def _resolve(self, game_state, slots, player_x, player_y):
+        """
+        Works out what each enemy does on its turn.
+
+        Each enemy attacks the player if it's adjacent. Otherwise it steps
+        into the best free tile the flow field offers, as
+        Enemy.move_towards_player would. Whether a tile is free at the time
+        of an enemy's turn depends on the steps before it, so:
+            - Enemies whose tiles no other enemy in the batch could step
+              into or out of are resolved together against the grid
+            - The rest are resolved one by one in turn order, keeping track
+              of the tiles they fill and free
+
+        Args:
+            - game_state (GameState):
+                The current game state
+            - slots (np.ndarray):
+                The enemies' slots, in turn order
+            - player_x (int):
+                The player's column
+            - player_y (int):
+                The player's row
+
+        Returns:
+            - np.ndarray:
+                Whether each enemy attacks the player
+            - np.ndarray:
+                Whether each enemy's step succeeds
+            - tuple[np.ndarray, np.ndarray]:
+                The column and row each enemy steps into
+        """
+        width = game_state.width
+        field = game_state.flow_field
+        field.refresh()
+        turns = np.arange(len(slots))
+
+        x = self.x[slots]
+        y = self.y[slots]
+
+        attacks = (np.abs(x - player_x) <= 1) & (np.abs(y - player_y) <= 1)
+
+        neighbour_x = x[:, None] + _DIRECTIONS[:, 0]
+        neighbour_y = y[:, None] + _DIRECTIONS[:, 1]
+        distances = _distances_at(field, neighbour_x, neighbour_y)
+        closer = distances < _distances_at(field, x, y)[:, None]
+
+        # Enemies the field doesn't reach step straight towards the player
+        lost = ~closer.any(axis=1)
+        straight = _STRAIGHT[np.sign(player_y - y) + 1,
+                             np.sign(player_x - x) + 1]
+        closer[turns[lost], straight[lost]] = True
+        closer &= ~attacks[:, None]
+
+        # Sorts each enemy's steps by distance, then by straight line
+        # distance, keeping the order of DIRECTIONS for ties
+        order = np.lexsort(((player_x - neighbour_x) ** 2
+                            + (player_y - neighbour_y) ** 2, distances))
+        candidate_x = np.take_along_axis(neighbour_x, order, axis=1)
+        candidate_y = np.take_along_axis(neighbour_y, order, axis=1)
+        valid = np.take_along_axis(closer, order, axis=1)
+
+        origins = y * width + x
+        cells = candidate_y * width + candidate_x
+        free = np.zeros_like(valid)
+        free[valid] = _kinds_at(game_state.grid, cells[valid]) == 0
+
+        # An enemy is independent if no other enemy touches its tiles
+        touched = np.concatenate((origins, cells[valid]))
+        owners = np.concatenate((turns, np.nonzero(valid)[0]))
+        (_, inverse, counts) = np.unique(touched, return_inverse=True,
+                                         return_counts=True)
+        shared = np.zeros(len(slots), dtype=bool)
+        shared[owners[counts[inverse] > 1]] = True
+
+        choices = np.argmax(valid & free, axis=1)
+        moves = (valid & free).any(axis=1)
+
+        changed = {}
+        for turn in np.flatnonzero(shared & ~attacks).tolist():
+            moves[turn] = False
+
+            for choice in np.flatnonzero(valid[turn]).tolist():
+                cell = int(cells[turn, choice])
+                if changed.get(cell, free[turn, choice]):
+                    moves[turn] = True
+                    choices[turn] = choice
+                    changed[cell] = False
+                    changed[int(origins[turn])] = True
+                    break
+
+        return (attacks, moves, (candidate_x[turns, choices],
+                                 candidate_y[turns, choices]))
+
+    def _grow(self):
+        """Doubles the number of slots."""
+        capacity = len(self.enemies)
+
+        for field in self.fields:
+            setattr(self, field, np.concatenate(
+                (getattr(self, field),
+                 np.zeros(capacity, dtype=np.int64))))
+
+        self.enemies.extend([None] * capacity)
+        self.free_slots.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+
+def _distances_at(field, x, y):
+    """
+    Returns the flow field's distances at tiles.
+
+    Args:
+        - field (FlowField):
+            The flow field, already refreshed
+        - x (np.ndarray):
+            The tiles' columns
+        - y (np.ndarray):
+            The tiles' rows
+
+    Returns:
+        - np.ndarray:
+            The distance at each tile, or UNREACHED outside the window
+    """
+    x = x - field.left
+    y = y - field.top
+    inside = ((x >= 0) & (x < field.window_width)
+              & (y >= 0) & (y < field.window_height))
+
+    # The field's distances have a one tile border around the window
+    distances = np.full(x.shape, UNREACHED, dtype=np.int64)
+    distances[inside] = np.frombuffer(field.distances, dtype=np.uint32)[
+        (y[inside] + 1) * (field.window_width + 2) + x[inside] + 1]
+
+    return distances
+
+
+def _kinds_at(grid, cells):
+    """
+    Returns the kind codes of grid cells.
+
+    Args:
+        - grid (CompactGrid or ChunkedGrid):
+            The game grid
+        - cells (np.ndarray):
+            Row-major cell indexes
+
+    Returns:
+        - np.ndarray:
+            The kind code of each cell
+    """
+    if hasattr(grid, "kinds"):
+        return np.frombuffer(grid.kinds, dtype=np.uint8)[cells]
+
+    return np.fromiter(
+        (grid.kind_at((cell % grid.width, cell // grid.width))
+         for cell in cells.tolist()),
+        dtype=np.uint8, count=len(cells))
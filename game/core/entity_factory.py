@@ -1,90 +1,122 @@
-import json
+import random
 from game.entities.enemy import Enemy
 from game.entities.player import Player
 from game.entities.items import Item
-from random import choice
+from game.core.content_cache import content_cache
+from game.core.entity_pool import EntityPool
 
 
 class EntityFactory:
     """
     A class that handles the creation of entities.
 
+    The data files are compiled into immutable templates once per process
+    and shared by every factory, so creating an entity only copies fields
+    from its template.
+
     Attributes:
-        - data (dict[str: dict]):
-            Contains the data for each type of entity
+        - templates (dict[str: dict[str: tuple]]):
+            Maps each type of entity ("enemies", "player" and "items") to
+            the template for each entity's name
+        - enemy_spawns (SpawnTable):
+            Picks which enemy to spawn, by the weights in enemies.json
+        - item_spawns (SpawnTable):
+            Picks which item to spawn, by the weights in items.json
+        - enemy_pool (EntityPool):
+            Dead enemies waiting to be reused
+        - item_pool (EntityPool):
+            Used items waiting to be reused
+        - rng (random.Random):
+            The random number generator used to choose random entities
     """
 
-    def __init__(self):
+    def __init__(self, rng=None, cache=None, pool_size=256):
         """
         Initialises the EntityFactory
 
+        Args:
+            - rng (random.Random):
+                The random number generator to choose random entities with
+                (Default: the random module)
+            - cache (ContentCache):
+                Where to load the data from
+                (Default: the cache shared by the whole process)
+            - pool_size (int):
+                The most dead enemies, and the most used items, to keep for
+                reuse. 0 turns pooling off
+
         Actions:
-            - Loads the data for enemies, the player, and items
-            - Initialises self.data with that data
+            - Loads the templates for enemies, the player, and items from
+              the cache, which reads them from the content pack, or only
+              reads the data files the first time or after they change
+            - Gets the spawn tables, which are shared by every factory
+              using the same cache
+            - Creates empty pools for enemies and items
+
+        Raises:
+            - ValueError:
+                If an entry in the data is invalid
         """
-        enemies = parse_json("enemies.json")
-        player = parse_json("player.json")
-        items = parse_json("items.json")
-        self.data = {"enemies": enemies, "player": player, "items": items}
+        self.rng = rng if rng is not None else random
+
+        if cache is None:
+            cache = content_cache
+
+        self.templates = {
+            "enemies": cache.section("enemies"),
+            "player": cache.section("player"),
+            "items": cache.section("items")
+        }
+
+        self.enemy_spawns = cache.spawn_table("enemies")
+        self.item_spawns = cache.spawn_table("items")
 
-    def random_enemy(self, position):
+        self.enemy_pool = EntityPool(pool_size)
+        self.item_pool = EntityPool(pool_size)
+
+    def random_enemy(self, position, score=0):
         """
         Creates a random enemy at a specific position.
 
         Actions:
-            - Chooses a random enemy type
+            - Chooses a random enemy type, weighted by its spawn weight at
+              the score
             - Returns an instance of that enemy at the specified position
 
         Args:
             - position (tuple[int, int]):
                 The position to spawn the enemy at
+            - score (int):
+                The player's score
 
         Returns:
             - Enemy:
                 The enemy that was created
         """
-        (enemy_name, enemy_data) = choice(list(self.data["enemies"].items()))
-        return self.create_enemy(position, enemy_name)
+        template = self.enemy_spawns.choose(self.rng, score)
+        return self.create_enemy(position, template.name, template)
 
-    def random_item(self):
+    def random_item(self, score=0):
         """
         Creates a random item
 
         Actions:
-            - Chooses a random item type
+            - Chooses a random item type, weighted by its spawn weight at
+              the score
             - Returns an instance of that item
 
-        Returns:
-            - Item:
-                The item that was created
-        """
-        (item_name, item_data) = choice(list(self.data["items"].items()))
-        return self.create_item(item_name)
-
-    def parse_entity_data(self, entity_type, entity_name):
-        """
-        Gets an entities stats and its sprite.
-
         Args:
-            - entity_type (str):
-                The type of entity (e.g. player, enemies, items)
-            - entity_name (str):
-                The name of the specific entity (e.g. orc, chicken)
+            - score (int):
+                The player's score
 
         Returns:
-            - stats (dict):
-                The entities stats
-            - sprite (str):
-                The filename of the entity's sprite
+            - Item:
+                The item that was created
         """
-        entity_data = self.data[entity_type][entity_name]
+        template = self.item_spawns.choose(self.rng, score)
+        return self.create_item(template.name, template)
 
-        stats = entity_data.copy()
-        sprite = stats.pop("sprite")
-
-        return (stats, sprite)
-
-    def create_enemy(self, position, enemy_name):
+    def create_enemy(self, position, enemy_name, template=None):
         """
         Creates an instance of a specific enemy.
 
@@ -93,68 +125,91 @@ class EntityFactory:
                 The position to create the enemy at
             - enemy_name (str):
                 The type of enemy it is
+            - template (CreatureTemplate or None):
+                The enemy's template, if it has already been looked up
 
         Actions:
-            - Gets the enemy's stats and sprite
-            - Creates an enemy with that data
+            - Reuses a dead enemy from the pool if there is one, resetting
+              it from the template
+            - Otherwise creates a new enemy
 
         Returns:
             - Enemy:
                 The enemy that was created
         """
-        (stats, sprite) = self.parse_entity_data("enemies", enemy_name)
+        if template is None:
+            template = self.templates["enemies"][enemy_name]
+
+        enemy = self.enemy_pool.acquire()
 
-        return Enemy(position=position, stats=stats, sprite=sprite)
+        if enemy is None:
+            return Enemy(position, name=enemy_name, template=template)
 
-    def create_item(self, item_name):
+        enemy.reset(position, enemy_name, template)
+        return enemy
+
+    def create_item(self, item_name, template=None):
         """
         Creates an instance of a specific item.
 
         Args:
             - item_name (str):
                 The type of item it is
+            - template (ItemTemplate or None):
+                The item's template, if it has already been looked up
 
         Actions:
-            - Gets the item's stats and sprite
-            - Creates an item with that data
+            - Reuses a used item from the pool if there is one, resetting
+              it from the template
+            - Otherwise creates a new item
 
         Returns:
             - Item:
                 The item that was created
         """
-        (stats, sprite) = self.parse_entity_data("items", item_name)
+        if template is None:
+            template = self.templates["items"][item_name]
 
-        return Item(stats=stats, sprite=sprite)
+        item = self.item_pool.acquire()
 
-    def create_player(self, position):
-        """
-        Creates the player entity
+        if item is None:
+            return Item(template=template)
 
-        Actions:
-            - Gets the player's stats and sprite
-            - Creates the player with that data
+        item.reset(template)
+        return item
 
-        Returns:
-            - Player:
-                The player that was created
+    def recycle(self, entity):
         """
-        (stats, sprite) = self.parse_entity_data("player", "player")
+        Keeps an enemy or item that left the game for reuse.
 
-        return Player(position=position, stats=stats, sprite=sprite)
+        Nothing may use the entity afterwards. Anything else is ignored.
 
+        Args:
+            - entity (Entity):
+                The dead enemy or used item
+        """
+        if isinstance(entity, Enemy):
+            self.enemy_pool.release(entity)
+        elif isinstance(entity, Item):
+            self.item_pool.release(entity)
 
-def parse_json(filename):
-    """
-    Parses the data in a JSON file.
+    def pool_stats(self):
+        """
+        Returns the enemy and item pools' counters, for sizing the pools.
 
-    Args:
-        filename (str):
-            The name of the JSON file
+        Returns:
+            - dict[str: dict[str: int]]:
+                The counters of the "enemies" and "items" pools
+        """
+        return {"enemies": self.enemy_pool.stats(),
+                "items": self.item_pool.stats()}
 
-    Returns:
-        dict:
-            The data contained in the JSON file.
-    """
-    path = "game/data/" + filename
-    with open(path, "r") as json_file:
-        return json.load(json_file)
+    def create_player(self, position):
+        """
+        Creates the player entity
+
+        Returns:
+            - Player:
+                The player that was created
+        """
+        return Player(position, template=self.templates["player"]["player"])
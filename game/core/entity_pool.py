@@ -0,0 +1,82 @@
+class EntityPool:
+    """
+    Keeps entities that left the game so they can be reused.
+
+    Reusing an entity saves allocating a new one and its attribute storage
+    on every spawn, and the garbage collector never has to free the old
+    ones, which in long games can pause the game mid-frame.
+
+    The hit and miss counters show whether the pool is big enough: misses
+    after the first few spawns mean entities are being allocated that
+    could have been reused.
+
+    Attributes:
+        - size (int):
+            The most entities to keep. 0 turns pooling off
+        - free (list[Entity]):
+            The entities waiting to be reused
+        - hits (int):
+            The number of spawns that reused an entity
+        - misses (int):
+            The number of spawns that had to create a new entity
+        - discarded (int):
+            The number of entities released when the pool was full
+    """
+
+    def __init__(self, size=256):
+        """
+        Initialises an empty pool.
+
+        Args:
+            - size (int):
+                The most entities to keep. 0 turns pooling off
+        """
+        self.size = size
+        self.free = []
+
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def acquire(self):
+        """
+        Takes an entity out of the pool, to be reset by the caller.
+
+        Returns:
+            - Entity or None:
+                An entity to reuse, or None if the pool is empty
+        """
+        if self.free:
+            self.hits += 1
+            return self.free.pop()
+
+        self.misses += 1
+        return None
+
+    def release(self, entity):
+        """
+        Puts an entity that left the game into the pool.
+
+        Nothing may use the entity after it's released, since it can be
+        reset and spawned again at any time.
+
+        Args:
+            - entity (Entity):
+                The entity to keep for reuse
+        """
+        if len(self.free) < self.size:
+            self.free.append(entity)
+        else:
+            self.discarded += 1
+
+    def stats(self):
+        """
+        Returns the pool's counters.
+
+        Returns:
+            - dict[str: int]:
+                The number of hits, misses and discarded entities, and the
+                number of entities waiting to be reused
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "discarded": self.discarded, "free": len(self.free)}
@@ -0,0 +1,436 @@
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+from game.core.compact_grid import ITEM_KIND
+
+
+# The distance of a tile that the field hasn't reached
+UNREACHED = 0xFFFFFFFF
+
+# The eight directions a creature can step in, in tie-breaking order
+DIRECTIONS = ((-1, -1), (0, -1), (1, -1),
+              (-1, 0), (1, 0),
+              (-1, 1), (0, 1), (1, 1))
+
+# Maps each kind code to 1 if it blocks the way and 0 if it doesn't
+_BLOCKING = bytes(int(kind == ITEM_KIND) for kind in range(256))
+
+
+class FlowField:
+    """
+    The walking distance from every tile to a target, usually the player.
+
+    Distances count steps in any of the eight directions. Items block the
+    way, but creatures don't, since they will usually have moved by the
+    time anyone reaches them. Every enemy shares the same field, so
+    choosing a step is a lookup of its neighbours' distances.
+
+    The field is only rebuilt when the target moves, and lazily: distance
+    only searches as far as the tile it's asked about, and refresh
+    finishes the search. When a tile gains or loses an item, only the
+    distances that change are repaired.
+
+    On large maps the field only covers a square window around the target,
+    and tiles outside it are unreached.
+
+    Attributes:
+        - grid (CompactGrid or ChunkedGrid):
+            The grid to find paths through
+        - radius (int or None):
+            How far the window reaches from the target
+            None if it covers the whole grid
+        - target (tuple[int, int] or None):
+            The position the distances are measured to
+        - stale (bool):
+            Whether the field needs rebuilding before it's used
+        - left (int):
+            The column of the window's left edge
+        - top (int):
+            The row of the window's top edge
+        - window_width (int):
+            The number of columns in the window
+        - window_height (int):
+            The number of rows in the window
+        - distances (array):
+            The distance of each tile in the window, or UNREACHED, in
+            row-major order with a border of unreached tiles around the
+            window. Until refresh is called, tiles the search hasn't got to
+            yet are unreached too
+    """
+
+    def __init__(self, grid, radius=None):
+        """
+        Initialises the field without a target.
+
+        Args:
+            - grid (CompactGrid or ChunkedGrid):
+                The grid to find paths through
+            - radius (int or None):
+                How far the window reaches from the target
+                (Default: the whole grid)
+        """
+        self.grid = grid
+        self.radius = radius
+
+        self.target = None
+        self.stale = True
+
+        self.left = 0
+        self.top = 0
+        self.window_width = 0
+        self.window_height = 0
+        self.distances = array("I")
+
+        self._blocked = bytearray()
+        self._offsets = ()
+        self._queue = []
+        self._searched = 0
+
+    def retarget(self, target):
+        """
+        Measures distances to a new target, from the next time it's used.
+
+        Args:
+            - target (tuple[int, int]):
+                The new target's position
+        """
+        if target != self.target:
+            self.target = target
+            self.stale = True
+
+    def distance(self, position):
+        """
+        Returns the walking distance from a tile to the target.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+
+        Returns:
+            - int:
+                The number of steps, or UNREACHED
+        """
+        if self.stale:
+            self._start()
+
+        index = self._index(position)
+        if index is None:
+            return UNREACHED
+
+        if self.distances[index] == UNREACHED:
+            self._search(index)
+
+        return self.distances[index]
+
+    def steps(self, position):
+        """
+        Returns the tiles a creature could step into to get closer.
+
+        Args:
+            - position (tuple[int, int]):
+                The creature's position
+
+        Returns:
+            - list[tuple[int, int]]:
+                The neighbouring tiles that are closer to the target, best
+                first. Ties go to the tile nearest in a straight line, then
+                to the first in DIRECTIONS
+        """
+        own_distance = self.distance(position)
+        (x, y) = position
+        (target_x, target_y) = self.target
+
+        closer = []
+        for (dx, dy) in DIRECTIONS:
+            neighbour = (x + dx, y + dy)
+            distance = self.distance(neighbour)
+
+            if distance < own_distance:
+                straight = ((target_x - x - dx) ** 2
+                            + (target_y - y - dy) ** 2)
+                closer.append((distance, straight, neighbour))
+
+        closer.sort(key=lambda step: step[:2])
+
+        return [neighbour for (_, _, neighbour) in closer]
+
+    def refresh(self):
+        """
+        Brings the whole field up to date.
+
+        Actions:
+            - Starts a new search if the target moved since the last one
+            - Finishes the search, so every distance in the window is set
+        """
+        if self.stale:
+            self._start()
+
+        self._search()
+
+    def _start(self):
+        """
+        Starts measuring distances to the target, without searching yet.
+
+        The search spreads out from the target one step at a time, and
+        stops as soon as the tile being looked up is reached, so the
+        distances near the target, where the enemies usually are, are
+        found without searching the whole window. Every distance it sets
+        is final.
+
+        Actions:
+            - Moves the window to be centred on the target
+            - Marks every tile in the window and its border as unreached
+            - Copies which tiles in the window are blocked, with the border
+              blocked so the search never leaves the window
+            - Unless an item is on the target, queues the target
+        """
+        self.stale = False
+        grid = self.grid
+        (target_x, target_y) = self.target
+
+        if self.radius is None:
+            (self.left, self.top) = (0, 0)
+            (self.window_width, self.window_height) = (grid.width,
+                                                       grid.height)
+        else:
+            self.left = max(0, target_x - self.radius)
+            self.top = max(0, target_y - self.radius)
+            self.window_width = (min(grid.width, target_x + self.radius + 1)
+                                 - self.left)
+            self.window_height = (min(grid.height,
+                                      target_y + self.radius + 1)
+                                  - self.top)
+
+        (width, height) = (self.window_width, self.window_height)
+        padded_width = width + 2
+        size = padded_width * (height + 2)
+
+        self.distances = array("I", [UNREACHED]) * size
+
+        # Tiles are marked blocked as the search reaches them, so each one
+        # is only reached once
+        blocked = bytearray(b"\1") * size
+        kinds = grid.kinds_in(self.left, self.top, width, height)
+        kinds = kinds.translate(_BLOCKING)
+        for row in range(height):
+            start = (row + 1) * padded_width + 1
+            blocked[start:start + width] = kinds[row * width:
+                                                 (row + 1) * width]
+
+        self._blocked = blocked
+        self._offsets = tuple(dy * padded_width + dx
+                              for (dx, dy) in DIRECTIONS)
+        self._queue = []
+        self._searched = 0
+
+        # An item can land on the target once the player has died
+        index = self._index(self.target)
+        if not blocked[index]:
+            blocked[index] = 1
+            self.distances[index] = 0
+            self._queue.append(index)
+
+    def _search(self, until=None):
+        """
+        Carries on the search started by _start.
+
+        Args:
+            - until (int or None):
+                The index in distances of a tile to stop at once it's
+                reached (Default: search the whole window)
+        """
+        distances = self.distances
+        blocked = self._blocked
+        offsets = self._offsets
+        queue = self._queue
+        searched = self._searched
+
+        while searched < len(queue):
+            if until is not None and distances[until] != UNREACHED:
+                break
+
+            index = queue[searched]
+            searched += 1
+            distance = distances[index] + 1
+
+            for offset in offsets:
+                neighbour = index + offset
+                if not blocked[neighbour]:
+                    blocked[neighbour] = 1
+                    distances[neighbour] = distance
+                    queue.append(neighbour)
+
+        self._searched = searched
+
+    def tile_changed(self, position, old_kind, new_kind):
+        """
+        Repairs the distances after a tile changed.
+
+        Only items block the way, so nothing changes unless an item was
+        added or removed.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+            - old_kind (int):
+                The kind code the tile had
+            - new_kind (int):
+                The kind code the tile has now
+        """
+        if self.stale or (old_kind == ITEM_KIND) == (new_kind == ITEM_KIND):
+            return
+
+        # Repairs need every distance, so a search that hasn't finished is
+        # just started again
+        if self._searched < len(self._queue):
+            self.stale = True
+            return
+
+        index = self._index(position)
+        if index is None:
+            return
+
+        if new_kind == ITEM_KIND:
+            self._block(position)
+        else:
+            self._unblock(position)
+
+    def _unblock(self, position):
+        """
+        Repairs the distances after a tile stopped blocking the way.
+
+        Distances can only get shorter, so they are spread out from the
+        tile to any tiles it's now a shortcut for.
+        """
+        if position == self.target:
+            self.distances[self._index(position)] = 0
+            self._spread(deque([position]))
+            return
+
+        nearest = min((self.distance(neighbour)
+                       for neighbour in self._neighbours(position)),
+                      default=UNREACHED)
+
+        if nearest == UNREACHED:
+            return
+
+        self.distances[self._index(position)] = nearest + 1
+        self._spread(deque([position]))
+
+    def _block(self, position):
+        """
+        Repairs the distances after a tile started blocking the way.
+
+        Actions:
+            - Finds the tiles whose every shortest path went through it,
+              one distance at a time
+            - Marks them as unreached
+            - Measures them again from the tiles around them that kept
+              their distance
+        """
+        distances = self.distances
+        distance = distances[self._index(position)]
+        distances[self._index(position)] = UNREACHED
+
+        if distance == UNREACHED:
+            return
+
+        affected = {position}
+        queue = deque([(position, distance)])
+
+        while queue:
+            (tile, distance) = queue.popleft()
+
+            for neighbour in self._neighbours(tile):
+                if (neighbour in affected
+                        or self.distance(neighbour) != distance + 1):
+                    continue
+
+                supported = any(
+                    other not in affected
+                    and self.distance(other) == distance
+                    for other in self._neighbours(neighbour))
+
+                if not supported:
+                    affected.add(neighbour)
+                    queue.append((neighbour, distance + 1))
+
+        affected.discard(position)
+        for tile in affected:
+            distances[self._index(tile)] = UNREACHED
+
+        heap = []
+        for tile in affected:
+            nearest = min((self.distance(neighbour)
+                           for neighbour in self._neighbours(tile)),
+                          default=UNREACHED)
+            if nearest != UNREACHED:
+                distances[self._index(tile)] = nearest + 1
+                heappush(heap, (nearest + 1, tile))
+
+        while heap:
+            (distance, tile) = heappop(heap)
+            if distance != self.distance(tile):
+                continue
+
+            for neighbour in self._neighbours(tile):
+                if self.distance(neighbour) > distance + 1:
+                    distances[self._index(neighbour)] = distance + 1
+                    heappush(heap, (distance + 1, neighbour))
+
+    def _spread(self, queue):
+        """
+        Spreads shorter distances out from the tiles in a queue.
+
+        Args:
+            - queue (deque[tuple[int, int]]):
+                Tiles whose distances were just set
+        """
+        distances = self.distances
+        kind_at = self.grid.kind_at
+        (left, top) = (self.left, self.top)
+        (width, height) = (self.window_width, self.window_height)
+
+        while queue:
+            (x, y) = queue.popleft()
+            distance = distances[self._index((x, y))] + 1
+
+            for (dx, dy) in DIRECTIONS:
+                (window_x, window_y) = (x + dx - left, y + dy - top)
+                if not (0 <= window_x < width and 0 <= window_y < height):
+                    continue
+
+                # Checking the distance first skips most kind lookups
+                index = (window_y + 1) * (width + 2) + window_x + 1
+                if (distances[index] > distance
+                        and kind_at((x + dx, y + dy)) != ITEM_KIND):
+                    distances[index] = distance
+                    queue.append((x + dx, y + dy))
+
+    def _neighbours(self, position):
+        """
+        Yields the tiles in the window next to a tile that items don't block.
+        """
+        (x, y) = position
+        right = self.left + self.window_width
+        bottom = self.top + self.window_height
+
+        for (dx, dy) in DIRECTIONS:
+            (neighbour_x, neighbour_y) = (x + dx, y + dy)
+
+            if (self.left <= neighbour_x < right
+                    and self.top <= neighbour_y < bottom
+                    and self.grid.kind_at((neighbour_x, neighbour_y))
+                    != ITEM_KIND):
+                yield (neighbour_x, neighbour_y)
+
+    def _index(self, position):
+        """Returns a tile's index in distances, or None outside the window."""
+        (x, y) = position
+        x -= self.left
+        y -= self.top
+
+        if 0 <= x < self.window_width and 0 <= y < self.window_height:
+            return (y + 1) * (self.window_width + 2) + x + 1
+
+        return None
@@ -0,0 +1,212 @@
+import random
+from array import array
+
+
+# The slot of a cell that isn't in the set
+NOT_FREE = 0xFFFFFFFF
+
+
+class FreeCells:
+    """
+    A set of grid positions that can also pick a random position in O(1).
+
+    Positions are stored as row-major cell indexes in a typed array, and a
+    second array maps each cell index to its slot in the first. A position
+    is removed by moving the last cell into its slot, so adding, removing
+    and sampling never search the array.
+
+    Attributes:
+        - width (int):
+            The number of columns in the grid
+        - cells (array):
+            The cell indexes in the set, in no particular order
+        - slots (array):
+            The slot of each cell index in cells, or NOT_FREE
+        - rng (random.Random):
+            The random number generator used to pick positions
+    """
+
+    def __init__(self, width, height, full=False, rng=None):
+        """
+        Initialises the set.
+
+        Args:
+            - width (int):
+                The number of columns in the grid
+            - height (int):
+                The number of rows in the grid
+            - full (bool):
+                Whether to start with every position in the set
+            - rng (random.Random):
+                The random number generator to pick positions with
+                (Default: the random module)
+        """
+        self.width = width
+        self.rng = rng if rng is not None else random
+        area = width * height
+
+        if full:
+            self.cells = array("I", range(area))
+            self.slots = array("I", range(area))
+        else:
+            self.cells = array("I")
+            self.slots = array("I", [NOT_FREE]) * area
+
+    def add(self, position):
+        """
+        Adds a position, if it's not already in the set.
+
+        Args:
+            - position (tuple[int, int]):
+                The position to add
+        """
+        (x, y) = position
+        cell = y * self.width + x
+
+        if self.slots[cell] == NOT_FREE:
+            self.slots[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, position):
+        """
+        Removes a position, if it's in the set.
+
+        Args:
+            - position (tuple[int, int]):
+                The position to remove
+
+        Actions:
+            - Moves the last cell into the removed cell's slot
+            - Shortens the array by one
+        """
+        (x, y) = position
+        cell = y * self.width + x
+        slot = self.slots[cell]
+
+        if slot == NOT_FREE:
+            return
+
+        self.slots[cell] = NOT_FREE
+        last = self.cells.pop()
+
+        if slot < len(self.cells):
+            self.cells[slot] = last
+            self.slots[last] = slot
+
+    def sample(self):
+        """
+        Picks a random position.
+
+        Returns:
+            - tuple[int, int] or None:
+                A random position, or None if the set is empty
+        """
+        if not self.cells:
+            return None
+
+        cell = self.cells[self.rng.randrange(len(self.cells))]
+        (y, x) = divmod(cell, self.width)
+        return (x, y)
+
+    def __contains__(self, position):
+        (x, y) = position
+        return self.slots[y * self.width + x] != NOT_FREE
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        for cell in self.cells:
+            (y, x) = divmod(cell, self.width)
+            yield (x, y)
+
+
+class SparseFreeCells:
+    """
+    The free positions of a mostly empty grid, for very large maps.
+
+    Only the occupied cells are stored, so memory grows with the number of
+    entities rather than the size of the grid. A random free position is
+    found by picking random cells until one is free, which takes O(1)
+    tries on average while at least half the grid is free. Beyond that it
+    falls back to listing the free cells.
+
+    It has the same interface as FreeCells, starting with every position
+    free.
+
+    Attributes:
+        - width (int):
+            The number of columns in the grid
+        - area (int):
+            The number of cells in the grid
+        - occupied (set[int]):
+            The row-major indexes of the cells that aren't free
+        - rng (random.Random):
+            The random number generator used to pick positions
+    """
+
+    def __init__(self, width, height, rng=None):
+        """
+        Initialises the set with every position in it.
+
+        Args:
+            - width (int):
+                The number of columns in the grid
+            - height (int):
+                The number of rows in the grid
+            - rng (random.Random):
+                The random number generator to pick positions with
+                (Default: the random module)
+        """
+        self.width = width
+        self.area = width * height
+        self.rng = rng if rng is not None else random
+        self.occupied = set()
+
+    def add(self, position):
+        """Marks a position as free."""
+        (x, y) = position
+        self.occupied.discard(y * self.width + x)
+
+    def discard(self, position):
+        """Marks a position as not free."""
+        (x, y) = position
+        self.occupied.add(y * self.width + x)
+
+    def sample(self):
+        """
+        Picks a random free position.
+
+        Returns:
+            - tuple[int, int] or None:
+                A random position, or None if there are no free positions
+        """
+        if len(self.occupied) >= self.area:
+            return None
+
+        randrange = self.rng.randrange
+
+        if 2 * len(self.occupied) <= self.area:
+            cell = randrange(self.area)
+            while cell in self.occupied:
+                cell = randrange(self.area)
+        else:
+            cells = [cell for cell in range(self.area)
+                     if cell not in self.occupied]
+            cell = cells[randrange(len(cells))]
+
+        (y, x) = divmod(cell, self.width)
+        return (x, y)
+
+    def __contains__(self, position):
+        (x, y) = position
+        return y * self.width + x not in self.occupied
+
+    def __len__(self):
+        return self.area - len(self.occupied)
+
+    def __iter__(self):
+        for cell in range(self.area):
+            if cell not in self.occupied:
+                (y, x) = divmod(cell, self.width)
+                yield (x, y)
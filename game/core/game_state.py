@@ -1,42 +1,82 @@
-from game.core.tile import Tile
-from game.entities.empty import Empty
-from game.entities.player import Player
+from game.entities.empty import Empty, EMPTY
 from game.entities.enemy import Enemy
 from game.entities.items import Item
 from game.entities.creature import Creature
 from game.core.entity_factory import EntityFactory
+from game.core.observable import Observable, ObservableProperty
+from game.core.scheduler import TurnScheduler
+from game.core.free_cells import FreeCells, SparseFreeCells
+from game.core.compact_grid import CompactGrid, KIND_NAMES, kind_of
+from game.core.chunked_grid import ChunkedGrid
+from game.core.flow_field import FlowField
+from game.core.replay import ReplayLog
 from game.helpers import is_adjacent
-from kivy.properties import NumericProperty
-from kivy.properties import BooleanProperty
-from kivy.event import EventDispatcher
-from random import randint, choice
-from kivy.core.audio import SoundLoader
+import random
 
 
-class GameState(EventDispatcher):
+# Maps with more tiles than this use a ChunkedGrid by default
+CHUNKED_AREA = 64 * 64
+
+# How far the flow field reaches from the player on chunked maps
+FLOW_FIELD_RADIUS = 32
+
+
+class GameState(Observable):
     """
-    A subclass of EventDispatcher to handle most of the game's logic.
+    A subclass of Observable to handle most of the game's logic.
+
+    It does not depend on Kivy, so it can be run without a display or audio
+    device. The Kivy widgets in game/ui observe it and play sounds for it.
 
     Attributes:
-        curr_player_health (NumericProperty):
+        curr_player_health (ObservableProperty):
             Stores the player's current health
-        max_player_health (NumericProperty):
+        max_player_health (ObservableProperty):
             Stores the player's maximum health
-        player_speed (NumericProperty):
+        player_speed (ObservableProperty):
             Stores the player's speed
-        player_attack_damage (NumericProperty):
+        player_attack_damage (ObservableProperty):
             Stores the player's attack damage
-        game_over (BooleanProperty):
+        score (ObservableProperty):
+            Stores the player's score
+        game_over (bool):
             Stores whether or not the game is finished
 
         width (int):
             The number of columns on the screen
         height (int):
             The number of rows on the screen
-        grid (list[list[Tile]]):
+        grid (CompactGrid or ChunkedGrid):
             Stores the tiles on the screen, displayed in a grid
+        chunked (bool):
+            Whether the grid is a ChunkedGrid, for very large maps
+        positions (dict[str: set[tuple[int, int]]]):
+            Indexes the positions of the "creatures", "items" and "empties"
+            in the grid, so they can be found without searching the grid.
+            The empties are a FreeCells (or a SparseFreeCells for chunked
+            maps), so one can be picked in O(1)
+        changed_tiles (set[tuple[int, int]]):
+            The positions of the tiles that changed since the UI last asked,
+            so it only has to redraw those
+        flow_field (FlowField):
+            The walking distance from every tile to the player, which the
+            enemies use to find their way around items and each other
+        debug (bool):
+            Whether to check the indexes against the grid after every turn
+        enemy_arrays (EnemyArrays or None):
+            Keeps the enemies' numbers in NumPy arrays so their turns can be
+            taken in vectorised batches, or None to take them one by one
+        seed (int):
+            The seed of the game's random number generator
+        rng (random.Random):
+            The game's random number generator. Everything random in the
+            game comes from it, so a game can be reproduced from its seed
+        replay_log (ReplayLog):
+            The seed and the player's actions, so the game can be replayed
         current_actor (Entity):
             Stores the entity whose turn it is currently
+        scheduler (TurnScheduler):
+            Decides which creature's turn it is next
         entity_factory (EntityFactory):
             An EntityFactory used to create entities
         player (Entity):
@@ -45,23 +85,16 @@ class GameState(EventDispatcher):
             The number of turns until a new enemy will spawn
         item_spawn_timer (int):
             The number of turns until a new item will spawn
-
-        eating_sound (Sound):
-            The sound to play when the player eats
-        punch_sound (Sound):
-            The sound to play when the player punches
     """
 
-    curr_player_health = NumericProperty()
-    max_player_health = NumericProperty()
-    player_speed = NumericProperty()
-    player_attack_damage = NumericProperty()
-    score = NumericProperty(0)
-
-    eating_sound = SoundLoader.load("game/audio/eating.wav")
-    punch_sound = SoundLoader.load("game/audio/punch.wav")
+    curr_player_health = ObservableProperty(0)
+    max_player_health = ObservableProperty(0)
+    player_speed = ObservableProperty(0)
+    player_attack_damage = ObservableProperty(0)
+    score = ObservableProperty(0)
 
-    def __init__(self, width, height):
+    def __init__(self, width, height, debug=False, chunked=None,
+                 enemy_arrays=False, seed=None, rng=None, new_game=True):
         """
         Initialises the GameState.
 
@@ -70,57 +103,104 @@ class GameState(EventDispatcher):
                 The number of columns in the screen
             height (int):
                 The number of rows in the screen
+            debug (bool):
+                Whether to check the indexes against the grid every turn
+            chunked (bool or None):
+                Whether to store the grid in chunks that are only allocated
+                when they are occupied. If None, maps larger than
+                CHUNKED_AREA are chunked
+            enemy_arrays (bool):
+                Whether to take enemy turns in vectorised batches, which
+                needs NumPy. The game plays out exactly the same either way
+            seed (int or None):
+                The seed for the game's random number generator. If None,
+                one is picked at random
+            rng (random.Random or None):
+                The random number generator to use. If None, one is created
+                from the seed. Games using their own generator can't be
+                replayed from the seed
+            new_game (bool):
+                Whether to start the game. If False, the grid is left
+                empty and no turns are taken, for restoring a saved game
+                into
 
         Actions:
             - Initialises self.width and self.height
-            - Creates an empty grid
+            - Creates the random number generator and the replay log
             - Sets the current actor to None
-            - Creates an EntityFactory
+            - Creates a TurnScheduler
+            - Creates an EnemyArrays store, if enabled
+            - Creates an EntityFactory that uses the random number generator
             - Create the player at the position (0, 0)
             - Start enemy and item spawn timers
-            - Initialises the grid
+            - Initialises the grid, or only creates an empty one if it's not
+              a new game
         """
         super().__init__()
 
         self.width = width
         self.height = height
 
-        self.grid = []
+        self.grid = None
+        self.positions = None
+        self.changed_tiles = set()
+        self.flow_field = None
+        self.debug = debug
+
+        if chunked is None:
+            chunked = width * height > CHUNKED_AREA
+        self.chunked = chunked
+
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.replay_log = ReplayLog(width, height, seed, chunked)
 
         self.current_actor = None
 
-        self.entity_factory = EntityFactory()
+        self.scheduler = TurnScheduler(width, height)
+
+        self.enemy_arrays = None
+        if enemy_arrays:
+            # Imported here so NumPy is only needed when it's used
+            from game.core.enemy_arrays import EnemyArrays
+            self.enemy_arrays = EnemyArrays()
+
+        self.game_over = False
+
+        self.entity_factory = EntityFactory(self.rng)
 
         self.player = self.entity_factory.create_player((0, 0))
 
-        self.enemy_spawn_timer = randint(5, 20)
-        self.item_spawn_timer = randint(5, 20)
+        self.enemy_spawn_timer = self.rng.randint(5, 20)
+        self.item_spawn_timer = self.rng.randint(5, 20)
 
         self.curr_player_health = self.player.curr_health
         self.max_player_health = self.player.max_health
         self.player_speed = self.player.speed
         self.player_attack_damage = self.player.attack_damage
 
-        self.initialise_grid()
+        if new_game:
+            self.initialise_grid()
+        else:
+            self.create_grid()
 
     def initialise_grid(self):
         """
         Initialises the grid.
 
         Actions:
-            - Adds the correct number of buttons to the grid
-            - Adds the player to the grid
+            - Creates an empty grid
+            - Adds the player to the grid and makes them the field's target
             - Adds an item to the grid
             - Adds an enemy to the grid
             - Starts the game by advancing time
         """
-        for y in range(self.height):
-            self.grid.append([])
-            for x in range(self.width):
-                self.grid[y].append(Tile(Empty()))
+        self.create_grid()
 
-        (player_x, player_y) = self.player.position
-        self.grid[player_y][player_x].entity = self.player
+        self.spawn_entity(self.player, self.player.position)
+        self.flow_field.retarget(self.player.position)
 
         self.spawn_item()
 
@@ -128,6 +208,58 @@ class GameState(EventDispatcher):
 
         self.advance_time()
 
+    def create_grid(self):
+        """
+        Creates an empty grid and the structures that follow it.
+
+        Actions:
+            - Creates a grid of empty tiles, chunked for very large maps
+            - Creates the position indexes, with every tile empty
+            - Creates a flow field, limited to a window on chunked maps
+        """
+        if self.chunked:
+            self.grid = ChunkedGrid(self.width, self.height)
+            empties = SparseFreeCells(self.width, self.height, self.rng)
+        else:
+            self.grid = CompactGrid(self.width, self.height)
+            empties = FreeCells(self.width, self.height, full=True,
+                                rng=self.rng)
+
+        self.positions = {
+            "creatures": set(),
+            "items": set(),
+            "empties": empties
+        }
+
+        self.flow_field = FlowField(
+            self.grid, FLOW_FIELD_RADIUS if self.chunked else None)
+
+    @classmethod
+    def replay(cls, replay_log, **kwargs):
+        """
+        Plays a game again from its replay log.
+
+        Args:
+            - replay_log (ReplayLog):
+                The log of the game to replay
+            - **kwargs:
+                Other keyword arguments for GameState, like debug, which
+                don't change how the game plays out
+
+        Returns:
+            - GameState:
+                The game, in exactly the state it was in after the last
+                logged action
+        """
+        game_state = cls(replay_log.width, replay_log.height,
+                         chunked=replay_log.chunked, seed=replay_log.seed,
+                         **kwargs)
+
+        for position in replay_log.positions():
+            game_state.interact_with_tile(position)
+
+        return game_state
+
     def move_creature(self, creature, destination):
         """
         Moves a creature entity to another position.
@@ -144,23 +276,26 @@ class GameState(EventDispatcher):
             - Changes the entity of the destination tile to the creature
             - Updates the creature's position attribute
             - Makes the creature's original position empty
+            - Tells the scheduler and the enemy arrays the creature moved
 
         Returns:
             - boolean:
                 True if the creature successfully moved, False if not
         """
-        (origin_x, origin_y) = creature.position
-        (destination_x, destination_y) = destination
+        origin = creature.position
 
         if not self.in_bounds(destination):
             return False
 
-        if not isinstance(self.grid[destination_y][destination_x].entity, Empty):
+        if not self.grid.is_empty(destination):
             return False
 
-        self.grid[destination_y][destination_x].entity = creature
+        self.set_entity(destination, creature)
         creature.position = destination
-        self.grid[origin_y][origin_x].entity = Empty()
+        self.set_entity(origin, EMPTY)
+
+        self.scheduler.update(creature)
+        self.sync_enemy(creature)
 
         return True
 
@@ -179,43 +314,54 @@ class GameState(EventDispatcher):
                 If it's an Item, the player should use that item.
                 If it's a Creature, the player should attack the creature
             - If the player did something:
-                - Play the appropriate sound
+                - Log it in the replay log
                 - Handle the player's stat decay
                 - Handle the end of turn operations.
+            - Holds the player's and the game state's notifications until
+              the player's own turn is over, so each stat's observers are
+              told once with its final value rather than after every step
+              of eating and decaying. Enemy turns notify as they happen
+
+        Returns:
+            - str or None:
+                "move", "eat" or "attack" depending on what the player did
+                None if the player did nothing
         """
 
-        (tile_x, tile_y) = tile_location
-        tile = self.grid[tile_y][tile_x]
-        entity = tile.entity
+        entity = self.grid.entity_at(tile_location)
 
-        did_something = False
+        action = None
         if self.current_actor == self.player:
-            if isinstance(entity, Empty):
-                did_something = self.move_player(tile_location)
-            elif isinstance(entity, Item):
-                did_something = self.use_item(tile_location)
-                if did_something:
-                    self.eating_sound.play()
-            elif isinstance(entity, Creature):
-                did_something = self.attack_creature(
-                    self.player, tile_location)
-                if did_something:
-                    self.punch_sound.play()
-
-        if did_something:
-            self.handle_decay()
+            with self.player.batch(), self.batch():
+                if isinstance(entity, Empty):
+                    if self.move_player(tile_location):
+                        action = "move"
+                elif isinstance(entity, Item):
+                    if self.use_item(tile_location):
+                        action = "eat"
+                elif isinstance(entity, Creature):
+                    if self.attack_creature(self.player, tile_location):
+                        action = "attack"
+
+                if action is not None:
+                    self.replay_log.record(tile_location)
+                    self.handle_decay()
+
+        if action is not None:
             self.end_turn()
 
+        return action
+
     def enemy_turn(self):
         """
         Performs the enemy's turn.
 
         Actions:
             - Makes the enemy take a turn
-            - Handle the end of turn operations
+            - Handle the end of turn operations, without advancing time
         """
         self.current_actor.take_turn(self)
-        self.end_turn()
+        self.finish_turn()
 
     def handle_decay(self):
         """
@@ -229,22 +375,35 @@ class GameState(EventDispatcher):
         self.player.decay_countdown()
 
     def end_turn(self):
+        """
+        Handles end of turn operations and moves on to the next turn.
+
+        Actions:
+            - Finishes the turn
+            - Advance time
+        """
+        self.finish_turn()
+        self.advance_time()
+
+    def finish_turn(self):
         """
         Handles end of turn operations.
 
         Actions:
             - Decreases the turn meter of the entity that took a turn
+              and schedules its next turn
             - Resets the current actor
             - If the player died, handle their death
             - Remove any dead entities from the grid
             - Decrease the enemy and item spawn timers
             - Spawn an enemy / item and reset the timer if they ran out
-            - Advance time
+            - For chunked maps, evict empty chunks far from the player
+            - In debug mode, check the indexes match the grid
         """
         actor = self.current_actor
 
         if actor is not None:
-            actor.turn_meter -= 100
+            self.scheduler.finish_turn(actor)
 
         self.current_actor = None
 
@@ -256,23 +415,26 @@ class GameState(EventDispatcher):
         self.enemy_spawn_timer -= 1
         if self.enemy_spawn_timer == 0:
             self.spawn_enemy()
-            self.enemy_spawn_timer = randint(5, 20)
+            self.enemy_spawn_timer = self.rng.randint(5, 20)
 
         self.item_spawn_timer -= 1
         if self.item_spawn_timer == 0:
             self.spawn_item()
-            self.item_spawn_timer = randint(5, 20)
+            self.item_spawn_timer = self.rng.randint(5, 20)
 
-        self.advance_time()
+        if self.chunked:
+            self.grid.evict_chunks(self.player.position)
+
+        if self.debug:
+            self.check_indexes()
 
     def random_empty_space(self):
         """
         Returns the position of a random empty tile.
 
         Actions:
-            - Gets all empty space positions in a list
-            - If there are no empty spaces, return
-            - Return a random position
+            - If there are no empty spaces in the index, return
+            - Return a random position from the index
 
         Returns:
             - boolean:
@@ -281,17 +443,12 @@ class GameState(EventDispatcher):
             - tuple[int, int]:
                 The random empty position
         """
-        empty_spaces = [
-            (x, y)
-            for y in range(self.height)
-            for x in range(self.width)
-            if isinstance(self.grid[y][x].entity, Empty)
-        ]
+        empty_spaces = self.positions["empties"]
 
         if not empty_spaces:
             return False, None
 
-        return True, choice(empty_spaces)
+        return True, empty_spaces.sample()
 
     def spawn_entity(self, entity, position):
         """
@@ -302,10 +459,19 @@ class GameState(EventDispatcher):
                 The entity to spawn
             - position (tuple[int, int]):
                 - The position to spawn the entity at
+
+        Actions:
+            - Puts the entity in the grid
+            - If it's a creature, starts scheduling its turns
+            - If it's an enemy, adds it to the enemy arrays
         """
-        (x, y) = position
+        self.set_entity(position, entity)
 
-        self.grid[y][x].entity = entity
+        if isinstance(entity, Creature):
+            self.scheduler.add(entity)
+
+        if isinstance(entity, Enemy) and self.enemy_arrays is not None:
+            self.enemy_arrays.add(entity)
 
     def spawn_enemy(self):
         """
@@ -313,12 +479,13 @@ class GameState(EventDispatcher):
 
         Actions:
             - Selects a random empty position
-            - Creates an enemy at that position with the correct stats
+            - Creates an enemy at that position with the correct stats,
+              picked by the spawn weights at the current score
             - Spawns the enemy
         """
         (success, position) = self.random_empty_space()
         if success:
-            enemy = self.entity_factory.random_enemy(position)
+            enemy = self.entity_factory.random_enemy(position, self.score)
             enemy.adjust_stats(self.score)
 
             self.spawn_entity(enemy, position)
@@ -329,13 +496,14 @@ class GameState(EventDispatcher):
 
         Actions:
             - Gets the position of a random empty space
-            - Creates a random item
+            - Creates a random item, picked by the spawn weights at the
+              current score
             - Spawns the item at the position
         """
         (success, position) = self.random_empty_space()
 
         if success:
-            item = self.entity_factory.random_item()
+            item = self.entity_factory.random_item(self.score)
 
             self.spawn_entity(item, position)
 
@@ -344,7 +512,7 @@ class GameState(EventDispatcher):
         Handles the player's death.
 
         Actions:
-            - Sets the game_over BooleanProperty to True
+            - Sets game_over to True
         """
         self.game_over = True
 
@@ -353,48 +521,47 @@ class GameState(EventDispatcher):
         Removes dead creatures from the grid
 
         Actions:
-            - Goes through each space in the grid, checking if it is a Creature
-            - If it's a creature, check if it's alive
-            - If it's not alive, remove it from the grid
+            - Goes through the position of each creature in the index
+            - Check if the creature there is alive
+            - If it's not alive, remove it from the grid, the scheduler and
+              the enemy arrays
+            - Keeps dead enemies for the entity factory to reuse
         """
-        for y in range(self.height):
-            for x in range(self.width):
-                entity = self.grid[y][x].entity
-                if isinstance(entity, Creature):
-                    if not entity.is_alive:
-                        self.grid[y][x].entity = Empty()
+        for position in list(self.positions["creatures"]):
+            entity = self.grid.entity_at(position)
+            if not entity.is_alive:
+                self.set_entity(position, EMPTY)
+                self.scheduler.remove(entity)
+
+                if self.enemy_arrays is not None:
+                    self.enemy_arrays.remove(entity)
+
+                self.entity_factory.recycle(entity)
 
     def advance_time(self):
         """
-        Advances time.
+        Advances time until it is the player's turn.
 
         Actions:
-            - Keeps looping until something stops it
-            - If the player is dead, stop looping
-            - Reset the entities who need to take their turns
-            - Go through each creature in the grid
-            - Update their turn meter
-            - If the creature has enough turn meter charge:
-                - Set the current actor to that creature
-                - Make them take their turn
-                - Stop advancing time
-        """
-        while True:
-            if not self.player.is_alive:
-                break
-
-            for y in range(self.height):
-                for x in range(self.width):
-                    entity = self.grid[y][x].entity
-                    if isinstance(entity, Creature):
-                        entity.turn_meter += entity.speed
-                        if entity.turn_meter >= 100:
-                            self.current_actor = entity
-                            if isinstance(self.current_actor, Enemy):
-                                self.enemy_turn()
-                                return
-                            elif isinstance(self.current_actor, Player):
-                                return
+            - Keeps looping until the player dies or it is their turn
+            - If the enemy arrays are enabled, takes the next enemy turns
+              as a batch
+            - Otherwise asks the scheduler which creature's turn it is next
+            - Sets the current actor to that creature
+            - If it's an enemy, make it take its turn and keep looping
+            - If it's the player, stop advancing time
+        """
+        while self.player.is_alive:
+            if (self.enemy_arrays is not None
+                    and self.enemy_arrays.take_turns(self)):
+                continue
+
+            self.current_actor = self.scheduler.next_actor()
+
+            if isinstance(self.current_actor, Enemy):
+                self.enemy_turn()
+            else:
+                return
 
     def attack_creature(self, attacker, creature_location):
         """
@@ -410,21 +577,21 @@ class GameState(EventDispatcher):
             - Checks that the target is close enough and within the grid
             - Checks the target is not attacking itself
             - Deals damage to the creature
+            - Updates the creature in the enemy arrays
 
         - Returns:
             boolean:
                 True if the creature was successfully attacked
                 False if nto
         """
-        (creature_x, creature_y) = creature_location
         attacker_position = attacker.position
 
         if (is_adjacent(attacker_position, creature_location)
                 and self.in_bounds(creature_location)
                 and attacker_position != creature_location):
-            tile = self.grid[creature_y][creature_x]
-            creature = tile.entity
+            creature = self.grid.entity_at(creature_location)
             attacker.attack_creature(creature)
+            self.sync_enemy(creature)
 
             return True
         else:
@@ -442,22 +609,22 @@ class GameState(EventDispatcher):
             - Checks that the item is close enough and within the grid
             - Handles the player's stat changes from using the item
             - Removes the item from the grid
+            - Keeps the item for the entity factory to reuse
 
         Returns:
             - boolean:
                 True if the item was successfully used
                 False if not
         """
-        (item_x, item_y) = item_location
         player_position = self.player.position
 
         if (is_adjacent(player_position, item_location)
                 and self.in_bounds(item_location)):
-            tile = self.grid[item_y][item_x]
-            item = tile.entity
+            item = self.grid.entity_at(item_location)
             self.power_up(item)
 
-            tile.entity = Empty()
+            self.set_entity(item_location, EMPTY)
+            self.entity_factory.recycle(item)
             return True
         else:
             return False
@@ -483,10 +650,7 @@ class GameState(EventDispatcher):
 
         self.player.heal(item.curr_health_boost)
 
-        self.player.attack_damage_decay.append(item.attack_decay)
-        self.player.speed_decay.append(item.speed_decay)
-        self.player.max_health_decay.append(item.max_health_decay)
-        self.player.decay_duration_left.append(item.decay_duration)
+        self.player.add_decay(item)
 
         self.score += item.score_boost
 
@@ -502,6 +666,7 @@ class GameState(EventDispatcher):
             - Checks the space is close enough and inside the grid
             - Updates the player's position
             - Replaces the old position with an empty space
+            - Tells the scheduler and the flow field the player moved
 
         Returns:
             - boolean:
@@ -509,23 +674,34 @@ class GameState(EventDispatcher):
                 False if not
         """
         player = self.player
-        grid = self.grid
 
-        (origin_x, origin_y) = origin = player.position
-
-        (destination_x, destination_y) = destination
+        origin = player.position
 
         if (is_adjacent(origin, destination)
                 and self.in_bounds(destination)):
-            grid[destination_y][destination_x].entity = player
+            self.set_entity(destination, player)
             player.position = destination
 
-            grid[origin_y][origin_x].entity = Empty()
+            self.set_entity(origin, EMPTY)
+
+            self.scheduler.update(player)
+            self.flow_field.retarget(destination)
 
             return True
         else:
             return False
 
+    def sync_enemy(self, creature):
+        """
+        Copies an enemy's numbers into the enemy arrays, if they're enabled.
+
+        Args:
+            - creature (Creature):
+                The creature that changed. Only enemies are copied
+        """
+        if self.enemy_arrays is not None and isinstance(creature, Enemy):
+            self.enemy_arrays.sync(creature)
+
     def in_bounds(self, position):
         """
         Checks that a position is within the boundaries of the grid.
@@ -541,3 +717,99 @@ class GameState(EventDispatcher):
         """
         (x, y) = position
         return not (x < 0 or y < 0 or x >= self.width or y >= self.height)
+
+    def set_entity(self, position, entity):
+        """
+        Puts an entity in a tile, keeping the position indexes up to date.
+
+        Every change to the grid should go through this method.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+            - entity (Entity):
+                The entity to put in the tile
+
+        Actions:
+            - Removes the position from the index of the entity it replaces
+            - Changes the tile's entity
+            - Adds the position to the index of the new entity
+            - Lets the flow field repair itself if an item came or went
+            - Marks the tile as changed
+        """
+        old_kind = self.grid.kind_at(position)
+        kind = kind_of(entity)
+
+        self.positions[KIND_NAMES[old_kind]].discard(position)
+        self.grid.place(position, entity, kind)
+        self.positions[KIND_NAMES[kind]].add(position)
+
+        self.flow_field.tile_changed(position, old_kind, kind)
+        self.changed_tiles.add(position)
+
+    def pop_changed_tiles(self):
+        """
+        Returns the tiles that changed since the last call, and forgets them.
+
+        Returns:
+            - set[tuple[int, int]]:
+                The positions of the changed tiles
+        """
+        (changed_tiles, self.changed_tiles) = (self.changed_tiles, set())
+
+        return changed_tiles
+
+    def check_indexes(self):
+        """
+        Checks the position indexes, scheduler and flow field match the grid.
+
+        This searches the whole grid, so it is only done in debug mode.
+
+        Raises:
+            - AssertionError:
+                If an index, the scheduler, the flow field or a creature's
+                position is wrong
+        """
+        expected = {"creatures": set(), "items": set(), "empties": set()}
+        scheduled = set()
+
+        for y in range(self.height):
+            for x in range(self.width):
+                entity = self.grid.entity_at((x, y))
+                expected[KIND_NAMES[kind_of(entity)]].add((x, y))
+
+                if self.grid.kind_at((x, y)) != kind_of(entity):
+                    raise AssertionError(
+                        f"The kind code at {(x, y)} does not match its entity")
+
+                if isinstance(entity, Creature):
+                    scheduled.add(id(entity))
+                    if entity.position != (x, y):
+                        raise AssertionError(
+                            f"Creature at {(x, y)} thinks it is at "
+                            f"{entity.position}")
+
+        for (name, positions) in expected.items():
+            indexed = set(self.positions[name])
+            duplicated = len(self.positions[name]) != len(indexed)
+            if indexed != positions or duplicated:
+                raise AssertionError(
+                    f"The {name} index does not match the grid: "
+                    f"missing {positions - indexed}, "
+                    f"extra {indexed - positions}")
+
+        if set(self.scheduler.records) != scheduled:
+            raise AssertionError(
+                "The scheduler does not match the creatures in the grid")
+
+        if not self.flow_field.stale:
+            self.flow_field.refresh()
+
+            rebuilt = FlowField(self.grid, self.flow_field.radius)
+            rebuilt.retarget(self.flow_field.target)
+            rebuilt.refresh()
+
+            if rebuilt.distances != self.flow_field.distances:
+                raise AssertionError(
+                    "The flow field does not match the grid")
+
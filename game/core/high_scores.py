@@ -0,0 +1,148 @@
+import sqlite3
+import time
+
+
+class HighScores:
+    """
+    A record of every finished game's score, kept on disk.
+
+    The scores are stored in an SQLite database. It is in write-ahead log
+    mode, so each recorded game is appended to the log in one atomic
+    commit, and SQLite folds the log back into the indexed database
+    (a checkpoint) as it grows. If the app is killed mid-write, the game
+    being written is either all there or not there at all the next time
+    the database is opened.
+
+    Scores are indexed from highest to lowest, overall and per player, so
+    recording a game is O(log n) and the top scores and a personal best
+    are read straight off the front of an index, however many games have
+    been played.
+
+    Attributes:
+        - path (str):
+            The path of the database file, or ":memory:"
+        - connection (sqlite3.Connection):
+            The open database
+    """
+
+    def __init__(self, path):
+        """
+        Opens the database, creating it if it doesn't exist.
+
+        Args:
+            - path (str):
+                The path of the database file, or ":memory:" for a store
+                that isn't saved
+
+        Actions:
+            - Opens the database in write-ahead log mode
+            - Creates the games table and its score indexes, if they don't
+              exist yet
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode this keeps every commit atomic and durable when the
+        # app is killed, only risking the last commits if the device loses
+        # power, without waiting for the disk on every game
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS games ("
+                " id INTEGER PRIMARY KEY,"
+                " player TEXT NOT NULL,"
+                " score INTEGER NOT NULL,"
+                " turns INTEGER NOT NULL,"
+                " seed INTEGER,"
+                " played_at REAL NOT NULL)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS games_by_score"
+                " ON games (score DESC, id)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS games_by_player"
+                " ON games (player, score DESC, id)")
+
+    def record(self, score, player="player", turns=0, seed=None):
+        """
+        Records a finished game.
+
+        Args:
+            - score (int):
+                The game's score
+            - player (str):
+                Who played it
+            - turns (int):
+                The number of turns the player took
+            - seed (int or None):
+                The game's seed, so it can be replayed
+
+        Returns:
+            - int:
+                The game's id
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO games (player, score, turns, seed, played_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (player, score, turns, seed, time.time()))
+
+        return cursor.lastrowid
+
+    def top(self, count=10, player=None):
+        """
+        Returns the highest scores.
+
+        Ties go to the game played first.
+
+        Args:
+            - count (int):
+                The number of scores to return
+            - player (str or None):
+                Only return this player's scores. If None, return everyone's
+
+        Returns:
+            - list[tuple[str, int, float]]:
+                The player, score and time played of each game, highest
+                score first
+        """
+        if player is None:
+            rows = self.connection.execute(
+                "SELECT player, score, played_at FROM games"
+                " ORDER BY score DESC, id LIMIT ?", (count,))
+        else:
+            rows = self.connection.execute(
+                "SELECT player, score, played_at FROM games"
+                " WHERE player = ? ORDER BY score DESC, id LIMIT ?",
+                (player, count))
+
+        return rows.fetchall()
+
+    def personal_best(self, player="player"):
+        """
+        Returns a player's highest score.
+
+        Args:
+            - player (str):
+                The player
+
+        Returns:
+            - int or None:
+                Their best score, or None if they haven't finished a game
+        """
+        row = self.connection.execute(
+            "SELECT score FROM games WHERE player = ?"
+            " ORDER BY score DESC LIMIT 1", (player,)).fetchone()
+
+        return row[0] if row is not None else None
+
+    def count(self):
+        """Returns the number of games recorded."""
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def close(self):
+        """Folds the write-ahead log into the database and closes it."""
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.connection.close()
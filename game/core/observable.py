@@ -0,0 +1,164 @@
+from contextlib import contextmanager
+
+
+class ObservableProperty:
+    """
+    A descriptor for an attribute that notifies observers when it changes.
+
+    It mirrors the parts of Kivy's properties that the game relies on, so
+    the game logic can be observed without importing Kivy.
+
+    Attributes:
+        - default:
+            The value returned before the attribute is first set
+        - name (str):
+            The name of the attribute the descriptor is assigned to
+    """
+
+    def __init__(self, default=None):
+        """
+        Initialises the property.
+
+        Args:
+            - default:
+                The value returned before the attribute is first set
+        """
+        self.default = default
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        """Stores the name of the attribute the property is assigned to."""
+        self.name = name
+
+    def __get__(self, instance, owner):
+        """Returns the stored value, or the default if it has not been set."""
+        if instance is None:
+            return self
+
+        return instance.__dict__.get(self.name, self.default)
+
+    def __set__(self, instance, value):
+        """
+        Sets the value.
+
+        Actions:
+            - Stores the new value
+            - If the instance is holding its notifications, remembers the
+              value from before the first change so it can notify later
+            - Otherwise, if the value changed, notifies the instance's
+              observers
+        """
+        old_value = instance.__dict__.get(self.name, self.default)
+        instance.__dict__[self.name] = value
+
+        held = instance.__dict__.get("_held_values")
+
+        if held is not None:
+            held.setdefault(self.name, old_value)
+        elif old_value != value:
+            instance.dispatch(self.name, value)
+
+
+class Observable:
+    """
+    A minimal replacement for Kivy's EventDispatcher.
+
+    Callbacks are bound to ObservableProperty names with bind() and are
+    called as callback(instance, value), in the same way Kivy calls them.
+
+    Notifications can be held while several properties change together, so
+    observers are told once about each property that ended up different:
+
+        with player.batch():
+            player.max_health += 5
+            player.heal(5)
+    """
+
+    def bind(self, **callbacks):
+        """
+        Binds callbacks to properties.
+
+        Args:
+            - **callbacks:
+                Maps each property name to the function to call when it changes
+        """
+        observers = self.__dict__.setdefault("_observers", {})
+
+        for (name, callback) in callbacks.items():
+            observers.setdefault(name, []).append(callback)
+
+    def unbind(self, **callbacks):
+        """
+        Unbinds callbacks previously bound with bind().
+
+        Args:
+            - **callbacks:
+                Maps each property name to the function to stop calling
+        """
+        observers = self.__dict__.get("_observers", {})
+
+        for (name, callback) in callbacks.items():
+            if callback in observers.get(name, []):
+                observers[name].remove(callback)
+
+    def dispatch(self, name, value):
+        """
+        Calls every callback bound to a property.
+
+        Args:
+            - name (str):
+                The name of the property that changed
+            - value:
+                The property's new value
+        """
+        observers = self.__dict__.get("_observers")
+
+        if observers:
+            for callback in observers.get(name, ()):
+                callback(self, value)
+
+    def hold(self):
+        """
+        Starts holding notifications until the matching release().
+
+        Holds can be nested. Only the outermost release() notifies.
+        """
+        self.__dict__["_hold_depth"] = self.__dict__.get("_hold_depth", 0) + 1
+        self.__dict__.setdefault("_held_values", {})
+
+    def release(self):
+        """
+        Stops holding notifications.
+
+        Actions:
+            - Ends the innermost hold
+            - If it was the outermost one, goes through each property that
+              was set while holding, in the order they were first set, and
+              notifies its observers once if its value differs from before
+              the hold
+        """
+        depth = self.__dict__["_hold_depth"] - 1
+        self.__dict__["_hold_depth"] = depth
+
+        if depth == 0:
+            held = self.__dict__.pop("_held_values")
+
+            for (name, old_value) in held.items():
+                value = getattr(self, name)
+                if value != old_value:
+                    self.dispatch(name, value)
+
+    @contextmanager
+    def batch(self):
+        """
+        Holds notifications for the duration of a with block.
+
+        Yields:
+            - Observable:
+                This object
+        """
+        self.hold()
+        try:
+            yield self
+        finally:
+            self.release()
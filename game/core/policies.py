@@ -0,0 +1,167 @@
+from game.entities.creature import Creature
+from game.entities.enemy import Enemy
+from game.entities.items import Item
+
+
+def neighbours(game_state):
+    """
+    Returns the tiles around the player that are inside the grid.
+
+    Args:
+        - game_state (GameState):
+            The current game state
+
+    Returns:
+        - list[tuple[int, int]]:
+            The positions of the tiles
+    """
+    (player_x, player_y) = game_state.player.position
+
+    return [(player_x + dx, player_y + dy)
+            for dy in (-1, 0, 1)
+            for dx in (-1, 0, 1)
+            if (dx or dy) and game_state.in_bounds((player_x + dx,
+                                                    player_y + dy))]
+
+
+def random_policy(game_state, rng):
+    """
+    Interacts with a random tile next to the player.
+
+    Args:
+        - game_state (GameState):
+            The current game state
+        - rng (random.Random):
+            The random number generator to choose with
+
+    Returns:
+        - tuple[int, int]:
+            The position of the tile to interact with
+    """
+    return rng.choice(neighbours(game_state))
+
+
+def greedy_policy(game_state, rng):
+    """
+    Fights anything next to the player, then eats, then looks for food.
+
+    Args:
+        - game_state (GameState):
+            The current game state
+        - rng (random.Random):
+            The random number generator to break ties with
+
+    Actions:
+        - Attacks an adjacent creature if there is one
+        - Otherwise eats an adjacent item if there is one
+        - Otherwise moves towards the nearest item
+        - Otherwise moves randomly
+
+    Returns:
+        - tuple[int, int]:
+            The position of the tile to interact with
+    """
+    tiles = neighbours(game_state)
+    entities = [game_state.grid.entity_at(tile) for tile in tiles]
+
+    for kind in (Creature, Item):
+        options = [tile for (tile, entity) in zip(tiles, entities)
+                   if isinstance(entity, kind)]
+        if options:
+            return rng.choice(options)
+
+    return step_towards(game_state, tiles, game_state.positions["items"],
+                        rng)
+
+
+def forager_policy(game_state, rng):
+    """
+    Eats whatever it can reach while staying away from enemies.
+
+    Args:
+        - game_state (GameState):
+            The current game state
+        - rng (random.Random):
+            The random number generator to break ties with
+
+    Actions:
+        - Eats an adjacent item if there is one
+        - Otherwise moves to the free tile furthest from the nearest enemy
+        - If there is no free tile, attacks an adjacent creature
+
+    Returns:
+        - tuple[int, int]:
+            The position of the tile to interact with
+    """
+    tiles = neighbours(game_state)
+    entities = [game_state.grid.entity_at(tile) for tile in tiles]
+
+    items = [tile for (tile, entity) in zip(tiles, entities)
+             if isinstance(entity, Item)]
+    if items:
+        return rng.choice(items)
+
+    free = [tile for tile in tiles if game_state.grid.is_empty(tile)]
+    if not free:
+        return rng.choice(tiles)
+
+    enemies = [position for position in game_state.positions["creatures"]
+               if isinstance(game_state.grid.entity_at(position), Enemy)]
+    if not enemies:
+        return step_towards(game_state, free,
+                            game_state.positions["items"], rng)
+
+    safety = {tile: min(distance(tile, enemy) for enemy in enemies)
+              for tile in free}
+    safest = max(safety.values())
+
+    return rng.choice([tile for tile in free if safety[tile] == safest])
+
+
+def step_towards(game_state, tiles, targets, rng):
+    """
+    Chooses the tile that gets closest to any of the targets.
+
+    Args:
+        - game_state (GameState):
+            The current game state
+        - tiles (list[tuple[int, int]]):
+            The tiles the player could interact with
+        - targets (iterable[tuple[int, int]]):
+            The positions to head towards
+        - rng (random.Random):
+            The random number generator to break ties with
+
+    Returns:
+        - tuple[int, int]:
+            The position of the tile to interact with, or a random tile if
+            there are no targets
+    """
+    targets = list(targets)
+    if not targets:
+        return rng.choice(tiles)
+
+    closeness = {tile: min(distance(tile, target) for target in targets)
+                 for tile in tiles}
+    closest = min(closeness.values())
+
+    return rng.choice([tile for tile in tiles if closeness[tile] == closest])
+
+
+def distance(a, b):
+    """
+    Returns the number of steps between two positions.
+
+    Diagonal steps count as one step.
+    """
+    (ax, ay) = a
+    (bx, by) = b
+    return max(abs(bx - ax), abs(by - ay))
+
+
+# The built in policies, by the name used to choose them
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "forager": forager_policy
+}
@@ -0,0 +1,135 @@
+import json
+from array import array
+
+
+class ReplayLog:
+    """
+    Everything needed to play a game again exactly as it happened.
+
+    A game's randomness all comes from its seed, so the seed, the grid's
+    settings and the tiles the player interacted with are enough to rebuild
+    it. Only interactions that did something are logged, since the others
+    don't change the game.
+
+    Attributes:
+        - width (int):
+            The number of columns in the grid
+        - height (int):
+            The number of rows in the grid
+        - seed (int):
+            The seed of the game's random number generator
+        - chunked (bool):
+            Whether the grid was chunked, which changes how random empty
+            tiles are picked
+        - actions (array):
+            The row-major index of each tile the player interacted with
+    """
+
+    def __init__(self, width, height, seed, chunked=False, actions=()):
+        """
+        Initialises the log.
+
+        Args:
+            - width (int):
+                The number of columns in the grid
+            - height (int):
+                The number of rows in the grid
+            - seed (int):
+                The seed of the game's random number generator
+            - chunked (bool):
+                Whether the grid was chunked
+            - actions (iterable[int]):
+                The row-major indexes of the tiles interacted with so far
+        """
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.chunked = chunked
+        self.actions = array("I", actions)
+
+    def record(self, position):
+        """
+        Logs that the player interacted with a tile.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile
+        """
+        (x, y) = position
+        self.actions.append(y * self.width + x)
+
+    def positions(self):
+        """
+        Yields the positions of the tiles interacted with, in order.
+
+        Returns:
+            - generator[tuple[int, int]]:
+                The positions
+        """
+        for cell in self.actions:
+            (y, x) = divmod(cell, self.width)
+            yield (x, y)
+
+    def dumps(self):
+        """
+        Returns the log as a JSON string.
+
+        Returns:
+            - str:
+                The log
+        """
+        return json.dumps({
+            "width": self.width,
+            "height": self.height,
+            "seed": self.seed,
+            "chunked": self.chunked,
+            "actions": self.actions.tolist()
+        }, separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, text):
+        """
+        Reads a log from a JSON string made by dumps.
+
+        Args:
+            - text (str):
+                The log
+
+        Returns:
+            - ReplayLog:
+                The log
+        """
+        data = json.loads(text)
+
+        return cls(data["width"], data["height"], data["seed"],
+                   data["chunked"], data["actions"])
+
+    def save(self, path):
+        """
+        Writes the log to a file.
+
+        Args:
+            - path (str):
+                The path of the file
+        """
+        with open(path, "w") as log_file:
+            log_file.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a log from a file made by save.
+
+        Args:
+            - path (str):
+                The path of the file
+
+        Returns:
+            - ReplayLog:
+                The log
+        """
+        with open(path, "r") as log_file:
+            return cls.loads(log_file.read())
+
+    def __len__(self):
+        return len(self.actions)
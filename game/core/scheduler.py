@@ -0,0 +1,461 @@
+from bisect import bisect_left, insort
+from heapq import heappush, heappop, heapreplace
+
+
+class TurnScheduler:
+    """
+    Decides which creature takes the next turn.
+
+    It gives the same turn order as sweeping the grid in row-major order,
+    adding each creature's speed to its turn meter and stopping at the first
+    creature whose meter reaches 100. Sweeps always restart from the top left
+    after a creature acts, so creatures after the actor in row-major order
+    miss that sweep.
+
+    Instead of sweeping, each creature is kept in a heap keyed by the sweep in
+    which its meter will next reach 100, then by its row-major position. The
+    sweeps a creature misses are counted lazily with _EventCounter, so a
+    heap entry may be too early but never too late. Entries are checked when
+    they reach the top of the heap and pushed back if they were too early.
+
+    Attributes:
+        - width (int):
+            The number of columns in the grid, used for row-major ordering
+        - sweep (int):
+            The number of sweeps that have been started so far
+        - records (dict[int: _Record]):
+            The scheduling record of each creature, keyed by id(creature)
+        - heap (list[list]):
+            Entries of [ready_sweep, row_major_key, sequence_number, record]
+        - events (_EventCounter):
+            Counts the row-major keys of the creatures that have acted
+        - sequence (int):
+            A counter used to keep heap entries unique
+    """
+
+    def __init__(self, width, height):
+        """
+        Initialises the scheduler.
+
+        Args:
+            - width (int):
+                The number of columns in the grid
+            - height (int):
+                The number of rows in the grid
+        """
+        self.width = width
+        self.sweep = 0
+        self.records = {}
+        self.heap = []
+        self.events = _EventCounter(width * height)
+        self.sequence = 0
+
+    def add(self, creature):
+        """
+        Starts scheduling a creature.
+
+        Args:
+            - creature (Creature):
+                The creature to schedule, starting from its current turn meter
+        """
+        record = _Record(creature)
+        self.records[id(creature)] = record
+        self._schedule(record, creature.turn_meter)
+
+    def remove(self, creature):
+        """
+        Stops scheduling a creature.
+
+        Its entry is left in the heap and skipped when it reaches the top.
+
+        Args:
+            - creature (Creature):
+                The creature to stop scheduling
+        """
+        record = self.records.pop(id(creature), None)
+
+        if record is not None:
+            record.entry = None
+
+    def update(self, creature):
+        """
+        Reschedules a waiting creature after its position or speed changed.
+
+        Creatures in the middle of their turn are rescheduled by finish_turn,
+        so they are left alone.
+
+        Args:
+            - creature (Creature):
+                The creature to reschedule
+        """
+        record = self.records.get(id(creature))
+
+        if record is not None and not record.acting:
+            self._schedule(record, self._current_meter(record))
+
+    def turn_meter(self, creature):
+        """
+        Returns a creature's current turn meter.
+
+        Args:
+            - creature (Creature):
+                A scheduled creature
+
+        Returns:
+            - int:
+                The value its turn meter would have after a full grid sweep
+        """
+        record = self.records[id(creature)]
+
+        if record.acting:
+            return record.meter
+
+        return self._current_meter(record)
+
+    def record_state(self, creature):
+        """
+        Returns the numbers needed to restore a creature's schedule.
+
+        Args:
+            - creature (Creature):
+                A scheduled creature
+
+        Returns:
+            - tuple:
+                Its meter, speed, sweep, key and missed_before, and its
+                ready_base, ready sweep and sequence number, which are None
+                if it isn't waiting for a turn
+        """
+        record = self.records[id(creature)]
+        entry = record.entry
+
+        if entry is None:
+            waiting = (None, None, None)
+        else:
+            waiting = (record.ready_base, entry[0], entry[2])
+
+        return (record.meter, record.speed, record.sweep, record.key,
+                record.missed_before) + waiting
+
+    def restore_record(self, creature, state):
+        """
+        Schedules a creature exactly as record_state described it.
+
+        The scheduler's sweep, sequence and events should be restored too,
+        since the record's numbers are relative to them.
+
+        Args:
+            - creature (Creature):
+                The creature to schedule
+            - state (tuple):
+                The numbers record_state returned
+        """
+        record = _Record(creature)
+        (record.meter, record.speed, record.sweep, record.key,
+         record.missed_before, ready_base, ready, sequence) = state
+
+        # Only the creature whose turn it is, or one that will never act, has
+        # no heap entry
+        record.acting = ready is None and record.speed > 0
+
+        if ready is not None:
+            record.ready_base = ready_base
+            record.entry = [ready, record.key, sequence, record]
+            heappush(self.heap, record.entry)
+
+        self.records[id(creature)] = record
+
+    def peek(self):
+        """
+        Finds the creature whose turn it is, without starting its turn.
+
+        Returns:
+            - tuple[int, Creature] or None:
+                The sweep it will act in and the creature
+                None if no creature will ever get a turn
+        """
+        entry = self._top()
+
+        if entry is None:
+            return None
+
+        return (entry[0], entry[3].creature)
+
+    def next_actor(self):
+        """
+        Finds the creature whose turn it is and starts its turn.
+
+        Actions:
+            - Finds the earliest up to date entry in the heap
+            - Moves time forward to the sweep it acts in
+            - Records that it acted, so creatures after it miss the sweep
+            - Updates its turn meter
+
+        Returns:
+            - Creature or None:
+                The creature whose turn it is
+                None if no creature will ever get a turn
+        """
+        entry = self._top()
+
+        if entry is None:
+            return None
+
+        heappop(self.heap)
+        (ready, _, _, record) = entry
+        record.entry = None
+        record.acting = True
+
+        record.meter += record.speed * (ready - record.sweep -
+                                        self._missed_sweeps(record))
+        record.sweep = ready
+        self.sweep = ready
+        self.events.add(record.key)
+
+        creature = record.creature
+        creature.turn_meter = record.meter
+        return creature
+
+    def earliest_next_turn(self, creature):
+        """
+        Returns the earliest sweep a creature could act in after its turn.
+
+        Args:
+            - creature (Creature):
+                A creature in the middle of its turn
+
+        Returns:
+            - int or None:
+                The sweep, or None if it will never act again
+        """
+        record = self.records[id(creature)]
+
+        sweeps_needed = _sweeps_needed(record.meter - 100, record.speed)
+
+        if sweeps_needed is None:
+            return None
+
+        return record.sweep + sweeps_needed
+
+    def finish_turn(self, creature):
+        """
+        Reschedules a creature after it has taken its turn.
+
+        Args:
+            - creature (Creature):
+                The creature that took its turn
+
+        Actions:
+            - Removes 100 from its turn meter
+            - Schedules its next turn from its new position and speed
+        """
+        record = self.records.get(id(creature))
+
+        if record is not None:
+            self._schedule(record, record.meter - 100)
+
+    def finish_turns(self, creatures):
+        """
+        Reschedules creatures whose turns were started one after another.
+
+        This gives the same result as calling finish_turn on each creature
+        straight after its own turn, even though the later creatures'
+        turns have already been started.
+
+        Args:
+            - creatures (list[Creature]):
+                The creatures, in the order their turns were started
+
+        Actions:
+            - Goes through the creatures from last to first:
+                - Counts the later turns taken by creatures before its new
+                  position in row-major order, which are sweeps it missed
+                - Schedules it from the sweep its turn was in
+        """
+        records = [self.records[id(creature)] for creature in creatures]
+        later_keys = []
+
+        for record in reversed(records):
+            (x, y) = record.creature.position
+            later_events = bisect_left(later_keys, y * self.width + x)
+
+            insort(later_keys, record.key)
+            self._schedule(record, record.meter - 100,
+                           record.sweep, later_events)
+
+    def _top(self):
+        """
+        Returns the earliest up to date heap entry.
+
+        Actions:
+            - Looks at the earliest entry in the heap
+            - Skips it if it is out of date
+            - If it missed sweeps since it was pushed, pushes it back later
+            - Otherwise returns it, leaving it in the heap
+        """
+        heap = self.heap
+
+        while heap:
+            entry = heap[0]
+            record = entry[3]
+
+            if record.entry is not entry:
+                heappop(heap)
+                continue
+
+            ready = record.ready_base + self._missed_sweeps(record)
+            if ready != entry[0]:
+                record.entry = [ready, entry[1], entry[2], record]
+                heapreplace(heap, record.entry)
+                continue
+
+            return entry
+
+        return None
+
+    def _schedule(self, record, meter, sweep=None, later_events=0):
+        """
+        Pushes a creature's record onto the heap.
+
+        Args:
+            - record (_Record):
+                The creature's record
+            - meter (int):
+                The creature's turn meter as of the sweep
+            - sweep (int):
+                The sweep to schedule from (Default: the current sweep)
+            - later_events (int):
+                How many of the recorded turns were taken after that sweep
+                by creatures before it in row-major order
+        """
+        if sweep is None:
+            sweep = self.sweep
+
+        creature = record.creature
+        (x, y) = creature.position
+
+        record.acting = False
+        record.meter = meter
+        record.speed = creature.speed
+        record.sweep = sweep
+        record.key = y * self.width + x
+        record.missed_before = (self.events.count_below(record.key)
+                                - later_events)
+        creature.turn_meter = meter
+
+        sweeps_needed = _sweeps_needed(meter, record.speed)
+        if sweeps_needed is None:
+            record.entry = None
+            return
+
+        record.ready_base = sweep + sweeps_needed
+
+        self.sequence += 1
+        record.entry = [record.ready_base, record.key, self.sequence, record]
+        heappush(self.heap, record.entry)
+
+    def _missed_sweeps(self, record):
+        """Returns the number of sweeps a creature missed since scheduling."""
+        return self.events.count_below(record.key) - record.missed_before
+
+    def _current_meter(self, record):
+        """Returns a waiting creature's turn meter as of the current sweep."""
+        sweeps = self.sweep - record.sweep - self._missed_sweeps(record)
+        return record.meter + record.speed * sweeps
+
+
+def _sweeps_needed(meter, speed):
+    """
+    Returns how many sweeps a creature needs before its meter reaches 100.
+
+    Without a positive speed, a creature's meter never rises, so it can
+    only act in the next sweep, if its meter is already high enough.
+
+    Args:
+        - meter (int):
+            Its turn meter
+        - speed (int):
+            Its speed
+
+    Returns:
+        - int or None:
+            The number of sweeps, at least 1, or None if it will never act
+    """
+    if speed > 0:
+        return max(1, -(-(100 - meter) // speed))
+
+    if meter + speed >= 100:
+        return 1
+
+    return None
+
+
+class _Record:
+    """
+    The scheduling state of a single creature.
+
+    Attributes:
+        - creature (Creature):
+            The creature being scheduled
+        - meter (int):
+            Its turn meter as of the sweep it was last scheduled in
+        - speed (int):
+            Its speed when it was last scheduled
+        - sweep (int):
+            The sweep it was last scheduled in
+        - key (int):
+            Its row-major position when it was last scheduled
+        - missed_before (int):
+            How many creatures before it had acted when it was last scheduled
+        - ready_base (int):
+            The sweep it would act in if it missed no sweeps
+        - entry (list or None):
+            Its live heap entry, or None if it is not waiting for a turn
+        - acting (bool):
+            Whether it is in the middle of its turn
+    """
+
+    __slots__ = ("creature", "meter", "speed", "sweep", "key",
+                 "missed_before", "ready_base", "entry", "acting")
+
+    def __init__(self, creature):
+        self.creature = creature
+        self.entry = None
+        self.acting = False
+
+
+class _EventCounter:
+    """
+    A sparse Fenwick tree counting how many times each row-major key acted.
+
+    Attributes:
+        - size (int):
+            The number of keys
+        - tree (dict[int: int]):
+            The non-zero nodes of the tree
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = {}
+
+    def add(self, key):
+        """Records that the creature at key acted."""
+        tree = self.tree
+        index = key + 1
+
+        while index <= self.size:
+            tree[index] = tree.get(index, 0) + 1
+            index += index & -index
+
+    def count_below(self, key):
+        """Returns how many times creatures at keys below key acted."""
+        tree = self.tree
+        index = key
+        total = 0
+
+        while index > 0:
+            total += tree.get(index, 0)
+            index -= index & -index
+
+        return total
@@ -0,0 +1,282 @@
+import os
+import random
+from collections import Counter
+from importlib import import_module
+from multiprocessing import Pool
+from game.core.game_state import GameState
+from game.core.policies import POLICIES
+from game.entities.enemy import Enemy
+
+
+class Stalemate(Exception):
+    """Raised when enemies keep taking turns without the player getting one."""
+
+
+class SimulatedGame(GameState):
+    """
+    A GameState that gives up if the player never gets another turn.
+
+    Enemies that are much faster than the player and can't reach them can
+    take turns forever, so a simulated game stops after too many enemy
+    turns in a row.
+
+    Attributes:
+        - max_enemy_turns (int):
+            How many enemy turns in a row to allow
+        - enemy_turns (int):
+            How many enemy turns there have been since the player's turn
+    """
+
+    def __init__(self, width, height, seed=None, max_enemy_turns=10000):
+        """
+        Initialises the game.
+
+        Args:
+            - width (int):
+                The number of columns in the grid
+            - height (int):
+                The number of rows in the grid
+            - seed (int or None):
+                The seed for the game's random number generator
+            - max_enemy_turns (int):
+                How many enemy turns in a row to allow
+        """
+        self.max_enemy_turns = max_enemy_turns
+        self.enemy_turns = 0
+
+        super().__init__(width, height, seed=seed)
+
+    def enemy_turn(self):
+        """
+        Performs the enemy's turn, unless there have been too many.
+
+        Raises:
+            - Stalemate:
+                If there have been max_enemy_turns enemy turns in a row
+        """
+        self.enemy_turns += 1
+        if self.enemy_turns > self.max_enemy_turns:
+            raise Stalemate()
+
+        super().enemy_turn()
+
+    def interact_with_tile(self, tile_location):
+        """Handles the player interacting with a tile, as in GameState."""
+        self.enemy_turns = 0
+
+        return super().interact_with_tile(tile_location)
+
+
+class SimulationResults:
+    """
+    The combined results of a batch of simulated games.
+
+    Every attribute is a Counter, so results from different processes can
+    be added together.
+
+    Attributes:
+        - scores (Counter[int: int]):
+            How many games ended with each score
+        - turns (Counter[int: int]):
+            How many games lasted each number of player turns
+        - outcomes (Counter[str: int]):
+            How many games ended in each way: "died", "turn limit" or
+            "stalemate"
+        - damage (Counter[str: int]):
+            The total damage each type of enemy dealt to the player
+        - kills (Counter[str: int]):
+            How many times each type of enemy killed the player
+    """
+
+    def __init__(self):
+        """Initialises the results with no games."""
+        self.scores = Counter()
+        self.turns = Counter()
+        self.outcomes = Counter()
+        self.damage = Counter()
+        self.kills = Counter()
+
+    def add(self, other):
+        """
+        Adds another batch's results to these.
+
+        Args:
+            - other (SimulationResults):
+                The results to add
+        """
+        self.scores.update(other.scores)
+        self.turns.update(other.turns)
+        self.outcomes.update(other.outcomes)
+        self.damage.update(other.damage)
+        self.kills.update(other.kills)
+
+    @property
+    def games(self):
+        """The number of games played."""
+        return sum(self.outcomes.values())
+
+
+def play_game(seed, policy, width=5, height=5, max_turns=1000):
+    """
+    Plays a complete game with a scripted policy.
+
+    Args:
+        - seed (int):
+            Seeds the game and the policy, so the game can be replayed
+        - policy (function):
+            Chooses the tile the player interacts with each turn, given the
+            game state and a random.Random
+        - width (int):
+            The number of columns in the grid
+        - height (int):
+            The number of rows in the grid
+        - max_turns (int):
+            How many player turns to play before stopping
+
+    Actions:
+        - Records the damage the enemies deal to the player
+        - Lets the policy play until the player dies or runs out of turns
+
+    Returns:
+        - SimulationResults:
+            The results of the single game
+    """
+    results = SimulationResults()
+    rng = random.Random(seed)
+
+    game_state = None
+    last_health = 0
+    turns = 0
+
+    def on_damage(player, health):
+        nonlocal last_health
+        attacker = game_state.current_actor
+
+        if health < last_health and isinstance(attacker, Enemy):
+            results.damage[attacker.name] += last_health - health
+            if health <= 0:
+                results.kills[attacker.name] += 1
+
+        last_health = health
+
+    try:
+        game_state = SimulatedGame(width, height, seed)
+        player = game_state.player
+        last_health = player.curr_health
+        player.bind(curr_health=on_damage)
+
+        while player.is_alive and turns < max_turns:
+            game_state.interact_with_tile(policy(game_state, rng))
+            turns += 1
+    except Stalemate:
+        outcome = "stalemate"
+    else:
+        outcome = "died" if not game_state.player.is_alive else "turn limit"
+
+    results.outcomes[outcome] += 1
+    results.turns[turns] += 1
+    results.scores[game_state.score if game_state else 0] += 1
+
+    return results
+
+
+def play_games(task):
+    """
+    Plays a batch of games in a worker process.
+
+    Args:
+        - task (tuple):
+            The first seed, the number of games, the policy's name, the
+            grid's width and height, and the turn limit
+
+    Returns:
+        - SimulationResults:
+            The combined results of the batch
+    """
+    (first_seed, games, policy_name, width, height, max_turns) = task
+    policy = find_policy(policy_name)
+    results = SimulationResults()
+
+    for seed in range(first_seed, first_seed + games):
+        results.add(play_game(seed, policy, width, height, max_turns))
+
+    return results
+
+
+def simulate(games, policy_name="greedy", width=5, height=5,
+             max_turns=1000, seed=0, processes=None, batch_size=None):
+    """
+    Plays many games across a pool of processes.
+
+    Games are split into batches, and each process only sends back the
+    combined results of its batch, so adding processes adds throughput.
+
+    Args:
+        - games (int):
+            The number of games to play
+        - policy_name (str):
+            A name from POLICIES, or "module:function" for a custom policy
+        - width (int):
+            The number of columns in the grid
+        - height (int):
+            The number of rows in the grid
+        - max_turns (int):
+            How many player turns to play each game for at most
+        - seed (int):
+            The seed of the first game. Game n is seeded with seed + n
+        - processes (int or None):
+            The number of worker processes (Default: one per core)
+        - batch_size (int or None):
+            The number of games in each batch
+            (Default: enough for about 16 batches per process)
+
+    Returns:
+        - SimulationResults:
+            The combined results of every game
+    """
+    # Checks the policy exists before starting any processes
+    find_policy(policy_name)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if batch_size is None:
+        batch_size = max(1, min(1000, games // (processes * 16)))
+
+    with Pool(processes) as pool:
+        tasks = [(seed + start, min(batch_size, games - start), policy_name,
+                  width, height, max_turns)
+                 for start in range(0, games, batch_size)]
+
+        results = SimulationResults()
+        for batch in pool.imap_unordered(play_games, tasks):
+            results.add(batch)
+
+    return results
+
+
+def find_policy(name):
+    """
+    Finds a policy by name.
+
+    Args:
+        - name (str):
+            A name from POLICIES, or "module:function" for a custom policy
+
+    Raises:
+        - ValueError:
+            If there is no such policy
+
+    Returns:
+        - function:
+            The policy
+    """
+    if name in POLICIES:
+        return POLICIES[name]
+
+    (module_name, _, function_name) = name.partition(":")
+    if not function_name:
+        raise ValueError(f"Unknown policy {name!r}, expected one of "
+                         f"{', '.join(POLICIES)} or module:function")
+
+    return getattr(import_module(module_name), function_name)
@@ -0,0 +1,454 @@
+import os
+import struct
+import sys
+import zlib
+from array import array
+from game.core.game_state import GameState
+from game.core.decay import DecayWheel
+from game.core.compact_grid import CREATURE_KIND
+
+
+# The first bytes of every snapshot
+MAGIC = b"HSNP"
+
+# The version of the format. It must go up whenever the format, or the
+# state a game needs to carry on exactly, changes
+SNAPSHOT_VERSION = 2
+
+# The name index the player is written with
+PLAYER_NAME = 0xFFFF
+
+# The widest and tallest map a snapshot can hold, and the largest area of
+# one that isn't chunked, so a corrupt size can't make a restore allocate
+# more than the game ever does
+MAX_SIDE = 1 << 16
+MAX_UNCHUNKED_AREA = 256 * 256
+
+_HEADER = struct.Struct("<4sHIIBQI")
+_TIMERS = struct.Struct("<qqq")
+_GAUSS = struct.Struct("<Bd")
+_CREATURE = struct.Struct("<IHdddd?d")
+_KIND = struct.Struct("<B")
+_ITEM = struct.Struct("<IH")
+_DECAY = struct.Struct("<qqqqI")
+_EXPIRY = struct.Struct("<qqqqI")
+_SCHEDULER = struct.Struct("<qq")
+_RECORD = struct.Struct("<ddqIq?qqq")
+_COUNT = struct.Struct("<I")
+
+_CHUNKED = 1
+_SEEDED = 2
+
+
+def dumps(game_state):
+    """
+    Packs a game into a compact binary snapshot.
+
+    Everything that decides how the game carries on is kept: the grid, the
+    player's stats and decay, the enemies' stats, the spawn timers, the
+    scheduler, the order of the free cells and the random number
+    generator's state. A restored game plays out exactly as the original
+    would have. The flow field and the position indexes are rebuilt from
+    the grid instead. The header ends with a CRC of everything else, so a
+    snapshot that was corrupted on disk is rejected rather than restored.
+
+    Args:
+        - game_state (GameState):
+            The game, which must be on the player's turn
+
+    Raises:
+        - ValueError:
+            If it's over or in the middle of an enemy's turn
+
+    Returns:
+        - bytes:
+            The snapshot
+    """
+    player = game_state.player
+
+    if game_state.game_over or game_state.current_actor is not player:
+        raise ValueError("A game can only be saved on the player's turn")
+
+    flags = ((_CHUNKED if game_state.chunked else 0)
+             | (_SEEDED if game_state.seed is not None else 0))
+
+    parts = [_TIMERS.pack(game_state.score, game_state.enemy_spawn_timer,
+                          game_state.item_spawn_timer)]
+
+    (_, rng_words, gauss) = game_state.rng.getstate()
+    parts.append(_GAUSS.pack(gauss is not None, gauss or 0))
+    _pack_array(parts, array("I", rng_words))
+
+    width = game_state.width
+    entities = [(_cell(width, position), game_state.grid.kind_at(position),
+                 game_state.grid.entity_at(position))
+                for name in ("creatures", "items")
+                for position in game_state.positions[name]]
+    entities.sort(key=lambda entity: entity[0])
+
+    names = sorted({entity.name for (_, _, entity) in entities
+                    if entity is not player})
+    name_indexes = {name: index for (index, name) in enumerate(names)}
+
+    encoded = "\0".join(names).encode()
+    parts.append(_COUNT.pack(len(encoded)))
+    parts.append(encoded)
+
+    creatures = [player]
+    parts.append(_creature(_cell(width, player.position), PLAYER_NAME,
+                           player))
+
+    decay_wheel = player.decay_wheel
+    parts.append(_DECAY.pack(decay_wheel.turn, decay_wheel.max_health,
+                             decay_wheel.speed, decay_wheel.attack_damage,
+                             len(decay_wheel.expiries)))
+    for (end_turn, expiry) in decay_wheel.expiries.items():
+        parts.append(_EXPIRY.pack(end_turn, *expiry))
+
+    parts.append(_COUNT.pack(len(entities) - 1))
+    for (cell, kind, entity) in entities:
+        if entity is player:
+            continue
+
+        parts.append(_KIND.pack(kind))
+
+        if kind == CREATURE_KIND:
+            creatures.append(entity)
+            parts.append(_creature(cell, name_indexes[entity.name], entity))
+        else:
+            parts.append(_ITEM.pack(cell, name_indexes[entity.name]))
+
+    scheduler = game_state.scheduler
+    parts.append(_SCHEDULER.pack(scheduler.sweep, scheduler.sequence))
+    events = scheduler.events.tree
+    _pack_array(parts, array("I", events.keys()))
+    _pack_array(parts, array("Q", events.values()))
+
+    for creature in creatures:
+        (meter, speed, sweep, key, missed_before,
+         ready_base, ready, sequence) = scheduler.record_state(creature)
+        parts.append(_RECORD.pack(meter, speed, sweep, key, missed_before,
+                                  ready is not None, ready_base or 0,
+                                  ready or 0, sequence or 0))
+
+    empties = game_state.positions["empties"]
+    _pack_array(parts, getattr(empties, "cells", array("I")))
+
+    _pack_array(parts, game_state.replay_log.actions)
+
+    # The CRC covers the whole snapshot except itself, the last header field
+    body = b"".join(parts)
+    header = _HEADER.pack(MAGIC, SNAPSHOT_VERSION, game_state.width,
+                          game_state.height, flags, game_state.seed or 0, 0)
+    checksum = zlib.crc32(body, zlib.crc32(header[:-_COUNT.size]))
+
+    return header[:-_COUNT.size] + _COUNT.pack(checksum) + body
+
+
+def loads(data, game_class=GameState, **kwargs):
+    """
+    Restores a game from a snapshot made by dumps.
+
+    Args:
+        - data (bytes):
+            The snapshot
+        - game_class (type):
+            The class of game to restore it as
+        - **kwargs:
+            Other keyword arguments for the game, like debug or
+            enemy_arrays, which don't change how the game plays out
+
+    Raises:
+        - ValueError:
+            If the data isn't a snapshot, is from another version, is
+            corrupt or truncated, or names entities the game's data no
+            longer has
+
+    Returns:
+        - GameState:
+            The game, exactly as it was when the snapshot was made
+    """
+    reader = _Reader(data)
+
+    (magic, version, width, height, flags, seed,
+     checksum) = reader.unpack(_HEADER)
+    if magic != MAGIC:
+        raise ValueError("The data is not a game snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Snapshots from version {version} can't be "
+                         f"restored by version {SNAPSHOT_VERSION}")
+    body_checksum = zlib.crc32(reader.data[:reader.offset - _COUNT.size])
+    if zlib.crc32(reader.data[reader.offset:], body_checksum) != checksum:
+        raise ValueError("The snapshot is corrupt")
+    if not (0 < width <= MAX_SIDE and 0 < height <= MAX_SIDE):
+        raise ValueError(f"The snapshot's map is {width}x{height}, which "
+                         "is too big")
+    if not flags & _CHUNKED and width * height > MAX_UNCHUNKED_AREA:
+        raise ValueError(f"The snapshot's map is {width}x{height}, which "
+                         "is too big without chunks")
+
+    # The game starts with an empty grid and no turns taken, and is then
+    # filled in from the snapshot
+    game_state = game_class(width, height, chunked=bool(flags & _CHUNKED),
+                            seed=seed if flags & _SEEDED else None,
+                            new_game=False, **kwargs)
+
+    (game_state.score, game_state.enemy_spawn_timer,
+     game_state.item_spawn_timer) = reader.unpack(_TIMERS)
+
+    (has_gauss, gauss) = reader.unpack(_GAUSS)
+    rng_words = tuple(reader.array("I"))
+    (rng_version, _, _) = game_state.rng.getstate()
+    game_state.rng.setstate((rng_version, rng_words,
+                             gauss if has_gauss else None))
+
+    encoded = reader.read(reader.unpack(_COUNT)[0])
+    names = encoded.decode().split("\0") if encoded else []
+
+    player = game_state.player
+    (cell, _, *stats) = reader.unpack(_CREATURE)
+    _restore_creature(player, stats)
+    player.position = _position(width, height, cell)
+    occupied = {cell}
+
+    player.decay_wheel = DecayWheel()
+    (player.decay_wheel.turn, player.decay_wheel.max_health,
+     player.decay_wheel.speed, player.decay_wheel.attack_damage,
+     expiries) = reader.unpack(_DECAY)
+    for _ in range(expiries):
+        (end_turn, *expiry) = reader.unpack(_EXPIRY)
+        player.decay_wheel.expiries[end_turn] = expiry
+
+    factory = game_state.entity_factory
+    enemy_names = factory.templates["enemies"]
+    item_names = factory.templates["items"]
+    creatures = [player]
+
+    # Entities are only put in the grid here. Their schedules are restored
+    # below, rather than started from scratch
+    game_state.set_entity(player.position, player)
+
+    for _ in range(reader.unpack(_COUNT)[0]):
+        (kind,) = reader.unpack(_KIND)
+
+        if kind == CREATURE_KIND:
+            (cell, name, *stats) = reader.unpack(_CREATURE)
+            position = _position(width, height, cell)
+            entity = factory.create_enemy(
+                position, _name(names, name, enemy_names))
+            _restore_creature(entity, stats)
+            creatures.append(entity)
+        else:
+            (cell, name) = reader.unpack(_ITEM)
+            position = _position(width, height, cell)
+            entity = factory.create_item(_name(names, name, item_names))
+
+        if cell in occupied:
+            raise ValueError("The snapshot has two entities on one tile")
+        occupied.add(cell)
+
+        game_state.set_entity(position, entity)
+
+    scheduler = game_state.scheduler
+    (scheduler.sweep, scheduler.sequence) = reader.unpack(_SCHEDULER)
+    scheduler.events.tree = dict(zip(reader.array("I"), reader.array("Q")))
+
+    for creature in creatures:
+        (meter, speed, sweep, key, missed_before, waiting, ready_base,
+         ready, sequence) = reader.unpack(_RECORD)
+
+        if not waiting:
+            (ready_base, ready, sequence) = (None, None, None)
+
+        scheduler.restore_record(creature, (
+            _number(meter), _number(speed), sweep, key, missed_before,
+            ready_base, ready, sequence))
+
+    cells = reader.array("I")
+    empties = game_state.positions["empties"]
+    if hasattr(empties, "cells"):
+        if sorted(cells) != sorted(empties.cells):
+            raise ValueError("The snapshot's free cells don't match its "
+                             "grid")
+
+        empties.cells = cells
+        for (slot, cell) in enumerate(cells):
+            empties.slots[cell] = slot
+
+    game_state.replay_log.actions = reader.array("I")
+
+    game_state.current_actor = player
+    game_state.flow_field.retarget(player.position)
+
+    if game_state.enemy_arrays is not None:
+        for creature in creatures[1:]:
+            game_state.enemy_arrays.add(creature)
+
+    if game_state.debug:
+        game_state.check_indexes()
+
+    return game_state
+
+
+def save(game_state, path):
+    """
+    Writes a game's snapshot to a file, replacing it atomically.
+
+    The snapshot is written to a temporary file that is flushed to disk
+    and then renamed over the old one, so if the app is killed while
+    saving, the old snapshot is still there.
+
+    Args:
+        - game_state (GameState):
+            The game to save
+        - path (str):
+            The file to save it to
+    """
+    write(dumps(game_state), path)
+
+
+def write(data, path):
+    """
+    Writes a snapshot that was already made to a file, atomically.
+
+    Making the snapshot has to happen on the thread running the game, but
+    writing it can happen on any thread.
+
+    Args:
+        - data (bytes):
+            The snapshot
+        - path (str):
+            The file to save it to
+    """
+    temporary_path = path + ".tmp"
+
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(data)
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+
+    os.replace(temporary_path, path)
+
+
+def load(path, **kwargs):
+    """
+    Restores a game from a snapshot file.
+
+    Args:
+        - path (str):
+            The file the snapshot was saved to
+        - **kwargs:
+            Keyword arguments for loads
+
+    Returns:
+        - GameState:
+            The restored game
+    """
+    with open(path, "rb") as snapshot_file:
+        return loads(snapshot_file.read(), **kwargs)
+
+
+def _cell(width, position):
+    """Returns a position's row-major cell number."""
+    (x, y) = position
+    return y * width + x
+
+
+def _position(width, height, cell):
+    """Returns the position of a row-major cell number, checking it."""
+    if cell >= width * height:
+        raise ValueError("The snapshot has an entity off the map")
+
+    (y, x) = divmod(cell, width)
+    return (x, y)
+
+
+def _creature(cell, name, creature):
+    """Packs a creature's position, name index and stats."""
+    return _CREATURE.pack(cell, name, creature.max_health,
+                          creature.curr_health, creature.attack_damage,
+                          creature.speed, creature.is_alive,
+                          creature.turn_meter)
+
+
+def _restore_creature(creature, stats):
+    """Sets a creature's stats from those _creature packed."""
+    (max_health, curr_health, attack_damage, speed, is_alive,
+     turn_meter) = stats
+
+    creature.max_health = _number(max_health)
+    creature.curr_health = _number(curr_health)
+    creature.attack_damage = _number(attack_damage)
+    creature.speed = _number(speed)
+    creature.is_alive = is_alive
+    creature.turn_meter = _number(turn_meter)
+
+
+def _name(names, index, templates):
+    """Looks up a name index, checking the game has a template for it."""
+    if index >= len(names):
+        raise ValueError("The snapshot is corrupt")
+
+    if names[index] not in templates:
+        raise ValueError(f"The snapshot has a {names[index]}, which the "
+                         "game's data no longer has")
+
+    return names[index]
+
+
+def _number(value):
+    """Turns a stored float back into an int if it was one."""
+    return int(value) if value.is_integer() else value
+
+
+def _pack_array(parts, values):
+    """Adds an array's length and little-endian contents to parts."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    parts.append(_COUNT.pack(len(values)))
+    parts.append(values.tobytes())
+
+
+class _Reader:
+    """
+    Reads the parts of a snapshot in order.
+
+    Attributes:
+        - data (memoryview):
+            The snapshot
+        - offset (int):
+            How far through it has been read
+    """
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def read(self, size):
+        """Returns the next size bytes."""
+        end = self.offset + size
+
+        if end > len(self.data):
+            raise ValueError("The snapshot is truncated")
+
+        chunk = self.data[self.offset:end]
+        self.offset = end
+        return bytes(chunk)
+
+    def unpack(self, layout):
+        """Returns the values of the next struct with the given layout."""
+        return layout.unpack(self.read(layout.size))
+
+    def array(self, typecode):
+        """Returns the next array packed by _pack_array."""
+        (count,) = self.unpack(_COUNT)
+
+        values = array(typecode)
+        values.frombytes(self.read(count * values.itemsize))
+
+        if sys.byteorder == "big":
+            values.byteswap()
+
+        return values
@@ -0,0 +1,201 @@
+from bisect import bisect_right
+
+
+class AliasTable:
+    """
+    Picks indexes at random in proportion to their weights, in O(1).
+
+    It is built with Vose's alias method: the weights are split into
+    equal-sized columns, each holding at most two indexes, so a draw is a
+    uniformly random column and a biased coin flip between its two
+    indexes.
+
+    Attributes:
+        - probabilities (list[float]):
+            The chance of each column picking its own index
+        - aliases (list[int]):
+            The other index in each column
+    """
+
+    def __init__(self, weights):
+        """
+        Builds the table.
+
+        Args:
+            - weights (list[float]):
+                The weight of each index. At least one must be positive
+        """
+        count = len(weights)
+        total = sum(weights)
+
+        self.probabilities = [weight * count / total for weight in weights]
+        self.aliases = list(range(count))
+
+        small = [index for (index, probability)
+                 in enumerate(self.probabilities) if probability < 1]
+        large = [index for (index, probability)
+                 in enumerate(self.probabilities) if probability >= 1]
+
+        while small and large:
+            (short, tall) = (small.pop(), large[-1])
+
+            self.aliases[short] = tall
+            self.probabilities[tall] -= 1 - self.probabilities[short]
+
+            if self.probabilities[tall] < 1:
+                small.append(large.pop())
+
+        # Anything left over is only short or tall from rounding errors
+        for index in small + large:
+            self.probabilities[index] = 1
+
+    def sample(self, rng):
+        """
+        Picks an index.
+
+        Args:
+            - rng (random.Random):
+                The random number generator to pick with
+
+        Returns:
+            - int:
+                The index picked
+        """
+        column = rng.randrange(len(self.aliases))
+
+        if rng.random() < self.probabilities[column]:
+            return column
+
+        return self.aliases[column]
+
+
+class SpawnTable:
+    """
+    Picks which entity to spawn, weighted by spawn_weights and the score.
+
+    Each template's spawn_weights give its weight from a score onwards.
+    The scores where any weight changes split the game into score bands,
+    and each band's alias table is built the first time a spawn happens in
+    it, then reused.
+
+    When every entity in a band has the same weight, the pick is uniform,
+    and the same call to rng.choice as before weights existed is used, so
+    seeded games without weights play out as they always did.
+
+    Attributes:
+        - templates (tuple):
+            The templates to pick from
+        - thresholds (list[int]):
+            The score each band starts at, in order. The first is always 0
+        - bands (list[list[float]]):
+            The weight of each template in each band
+        - tables (dict[int: AliasTable or None]):
+            The alias table of each band built so far, or None for bands
+            where every weight is the same
+    """
+
+    def __init__(self, templates):
+        """
+        Works out each template's weight in each score band.
+
+        Args:
+            - templates (tuple):
+                The templates to pick from, which all have spawn_weights
+
+        Raises:
+            - ValueError:
+                If there's a score where nothing can spawn
+        """
+        self.templates = templates
+
+        thresholds = {0}
+        for template in templates:
+            thresholds.update(score for (score, _) in template.spawn_weights)
+        self.thresholds = sorted(thresholds)
+
+        self.bands = [[weight_at(template.spawn_weights, threshold)
+                       for template in templates]
+                      for threshold in self.thresholds]
+        self.tables = {}
+
+        for (threshold, weights) in zip(self.thresholds, self.bands):
+            if sum(weights) <= 0:
+                names = ", ".join(template.name for template in templates)
+                raise ValueError(f"None of {names} can spawn at a score of "
+                                 f"{threshold}")
+
+    def choose(self, rng, score=0):
+        """
+        Picks a template at random, by weight.
+
+        Args:
+            - rng (random.Random):
+                The random number generator to pick with
+            - score (int):
+                The player's score, which picks the band of weights
+
+        Returns:
+            - The template picked
+        """
+        # Scores below 0 are in the first band
+        band = 0
+        if len(self.thresholds) > 1:
+            band = max(bisect_right(self.thresholds, score) - 1, 0)
+
+        if band in self.tables:
+            table = self.tables[band]
+        else:
+            table = self.build_table(band)
+
+        if table is None:
+            return rng.choice(self.templates)
+
+        return self.templates[table.sample(rng)]
+
+    def build_table(self, band):
+        """
+        Builds the alias table for a score band, and remembers it.
+
+        Args:
+            - band (int):
+                The index of the band
+
+        Returns:
+            - AliasTable or None:
+                The table, or None if every weight in the band is the same
+        """
+        weights = self.bands[band]
+
+        if len(set(weights)) == 1:
+            table = None
+        else:
+            table = AliasTable(weights)
+
+        self.tables[band] = table
+
+        return table
+
+
+def weight_at(spawn_weights, score):
+    """
+    Finds an entity's spawn weight at a score.
+
+    Args:
+        - spawn_weights (tuple[tuple[int, float]]):
+            Pairs of a score and the weight from then on, in score order
+        - score (int):
+            The score
+
+    Returns:
+        - float:
+            The weight of the last pair starting at or before the score,
+            or 0 if they all start after it
+    """
+    weight = 0
+
+    for (start, start_weight) in spawn_weights:
+        if start > score:
+            break
+        weight = start_weight
+
+    return weight
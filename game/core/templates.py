@@ -0,0 +1,361 @@
+from numbers import Real
+from typing import NamedTuple
+
+
+class CreatureTemplate(NamedTuple):
+    """
+    The validated data for one type of creature, compiled once at load.
+
+    Templates are immutable, so every creature of the type can share one.
+
+    Attributes:
+        - name (str):
+            The type of creature it is (e.g. orc, player)
+        - sprite (str):
+            The filename of the creature's sprite
+        - base_health (int):
+            The creature's max health with no modifiers
+        - base_attack (int):
+            The creature's attack damage with no modifiers
+        - base_speed (int):
+            The creature's speed with no modifiers
+        - health_scale (float):
+            The amount of max health gained for each point of score
+        - attack_scale (float):
+            The amount of attack damage gained for each point of score
+        - speed_scale (float):
+            The amount of speed gained for each point of score
+        - spawn_weights (tuple[tuple[int, float]]):
+            Pairs of a score and how likely the creature is to be picked
+            to spawn from then on, in score order
+    """
+
+    name: str
+    sprite: str
+    base_health: int
+    base_attack: int
+    base_speed: int
+    health_scale: float
+    attack_scale: float
+    speed_scale: float
+    spawn_weights: tuple
+
+    @classmethod
+    def from_data(cls, name, data):
+        """
+        Compiles a creature's entry from enemies.json or player.json.
+
+        Stats that are missing get the same defaults Creature has always
+        used, and a missing spawn weight is 1.
+
+        Args:
+            - name (str):
+                The entry's name
+            - data (dict):
+                The entry, with "health", "attack" and "speed" stats that
+                each have a "base" and a "scale", a "sprite", and an
+                optional "spawn_weight" (see spawn_weights)
+
+        Raises:
+            - ValueError:
+                If the entry's sprite or stats have the wrong type
+
+        Returns:
+            - CreatureTemplate:
+                The compiled template
+        """
+        stats = {}
+        for (stat, base) in (("health", 10), ("attack", 1), ("speed", 10)):
+            stat_data = data.get(stat, {})
+            stats[stat] = (number(name, stat_data, "base", base),
+                           number(name, stat_data, "scale", 0))
+
+        sprite = data.get("sprite", "")
+        if not isinstance(sprite, str):
+            raise ValueError(f"{name}: sprite must be a filename")
+
+        return cls(name=name, sprite=sprite,
+                   base_health=stats["health"][0],
+                   base_attack=stats["attack"][0],
+                   base_speed=stats["speed"][0],
+                   health_scale=stats["health"][1],
+                   attack_scale=stats["attack"][1],
+                   speed_scale=stats["speed"][1],
+                   spawn_weights=spawn_weights(name, data))
+
+
+class ItemTemplate(NamedTuple):
+    """
+    The validated data for one type of item, compiled once at load.
+
+    Attributes:
+        - name (str):
+            The type of item it is (e.g. pizza)
+        - sprite (str):
+            The filename of the sprite image
+        - max_health_boost (int):
+            The amount it adds to the player's max health
+        - max_health_decay (int):
+            The amount it removes from the player's max health each turn
+        - speed_boost (int):
+            The amount it adds to the player's speed
+        - speed_decay (int):
+            The amount it removes from the player's speed each turn
+        - attack_boost (int):
+            The amount it adds to the player's attack damage
+        - attack_decay (int):
+            The amount it removes from the player's attack damage each turn
+        - score_boost (int):
+            The amount it adds to the player's score
+        - curr_health_boost (int):
+            The amount it adds to the player's current health
+        - decay_duration (int):
+            The number of turns it takes for the decay to wear off
+        - spawn_weights (tuple[tuple[int, float]]):
+            Pairs of a score and how likely the item is to be picked to
+            spawn from then on, in score order
+    """
+
+    name: str
+    sprite: str
+    max_health_boost: int
+    max_health_decay: int
+    speed_boost: int
+    speed_decay: int
+    attack_boost: int
+    attack_decay: int
+    score_boost: int
+    curr_health_boost: int
+    decay_duration: int
+    spawn_weights: tuple
+
+    @classmethod
+    def from_data(cls, name, data):
+        """
+        Compiles an item's entry from items.json.
+
+        Args:
+            - name (str):
+                The entry's name
+            - data (dict):
+                The entry, with "max_health", "speed" and "attack" stats
+                that each have a "boost" and a "decay", and a
+                "score_boost", "curr_health_boost", "decay_duration" and
+                "sprite", and an optional "spawn_weight" (see
+                spawn_weights)
+
+        Raises:
+            - ValueError:
+                If anything is missing or has the wrong type
+
+        Returns:
+            - ItemTemplate:
+                The compiled template
+        """
+        stats = {}
+        for stat in ("max_health", "speed", "attack"):
+            stat_data = data.get(stat)
+            if not isinstance(stat_data, dict):
+                raise ValueError(f"{name}: {stat} must have a boost and "
+                                 "a decay")
+
+            stats[stat] = (integer(name, stat_data, "boost"),
+                           integer(name, stat_data, "decay"))
+
+        sprite = data.get("sprite")
+        if not isinstance(sprite, str):
+            raise ValueError(f"{name}: sprite must be a filename")
+
+        return cls(name=name, sprite=sprite,
+                   max_health_boost=stats["max_health"][0],
+                   max_health_decay=stats["max_health"][1],
+                   speed_boost=stats["speed"][0],
+                   speed_decay=stats["speed"][1],
+                   attack_boost=stats["attack"][0],
+                   attack_decay=stats["attack"][1],
+                   score_boost=integer(name, data, "score_boost"),
+                   curr_health_boost=integer(name, data,
+                                             "curr_health_boost"),
+                   decay_duration=integer(name, data, "decay_duration"),
+                   spawn_weights=spawn_weights(name, data))
+
+
+def compile_creatures(filename, data):
+    """
+    Compiles each entry in a creature data file into a template.
+
+    Args:
+        filename (str):
+            The name of the JSON file, for error messages
+        data (dict):
+            The parsed file
+
+    Returns:
+        dict[str: CreatureTemplate]:
+            Maps each entry's name to its template, in the file's order
+    """
+    return compile_templates(filename, data, CreatureTemplate)
+
+
+def compile_items(filename, data):
+    """
+    Compiles each entry in an item data file into a template.
+
+    Args:
+        filename (str):
+            The name of the JSON file, for error messages
+        data (dict):
+            The parsed file
+
+    Returns:
+        dict[str: ItemTemplate]:
+            Maps each entry's name to its template, in the file's order
+    """
+    return compile_templates(filename, data, ItemTemplate)
+
+
+def compile_templates(filename, data, template_class):
+    """
+    Compiles each entry in a parsed data file into a template.
+
+    Args:
+        filename (str):
+            The name of the JSON file, for error messages
+        data (dict):
+            The parsed file
+        template_class (type):
+            CreatureTemplate or ItemTemplate
+
+    Raises:
+        ValueError:
+            If an entry is invalid, naming the file and the entry
+
+    Returns:
+        dict[str: tuple]:
+            Maps each entry's name to its template, in the file's order
+    """
+    templates = {}
+
+    for (name, entry) in data.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"{filename}: {name} must be an object")
+
+        try:
+            templates[name] = template_class.from_data(name, entry)
+        except ValueError as error:
+            raise ValueError(f"{filename}: {error}") from None
+
+    return templates
+
+
+def spawn_weights(name, data):
+    """
+    Reads how likely an entry is to be picked to spawn.
+
+    "spawn_weight" is either a number, the weight for the whole game, or a
+    list of [score, weight] pairs giving the weight from each score on,
+    e.g. [[0, 5], [20, 1]]. Before the first pair's score the weight is 0.
+    Without it, the weight is 1.
+
+    Args:
+        - name (str):
+            The entry's name, for the error message
+        - data (dict):
+            The entry
+
+    Raises:
+        - ValueError:
+            If the weights aren't in that form, are negative or the scores
+            aren't in increasing order
+
+    Returns:
+        - tuple[tuple[int, float]]:
+            The [score, weight] pairs, as tuples
+    """
+    weights = data.get("spawn_weight", 1)
+
+    if not isinstance(weights, list):
+        weights = [[0, weights]]
+
+    pairs = []
+    for pair in weights:
+        if not (isinstance(pair, list) and len(pair) == 2):
+            raise ValueError(f"{name}: spawn_weight must be a number or a "
+                             "list of [score, weight] pairs")
+
+        score = integer(name, {"score": pair[0]}, "score")
+        weight = number(name, {"spawn_weight": pair[1]}, "spawn_weight", 1)
+
+        if weight < 0:
+            raise ValueError(f"{name}: spawn_weight can't be negative")
+        if pairs and score <= pairs[-1][0]:
+            raise ValueError(f"{name}: spawn_weight scores must increase")
+
+        pairs.append((score, weight))
+
+    return tuple(pairs)
+
+
+def number(name, data, key, default):
+    """
+    Reads a number from an entry's data.
+
+    Args:
+        - name (str):
+            The entry's name, for the error message
+        - data (dict):
+            The data to read from
+        - key (str):
+            The key of the number
+        - default (int):
+            The value to use if the key is missing
+
+    Raises:
+        - ValueError:
+            If the value isn't a number
+
+    Returns:
+        - int or float:
+            The number
+    """
+    value = data.get(key, default)
+
+    if isinstance(value, bool) or not isinstance(value, Real):
+        raise ValueError(f"{name}: {key} must be a number, not {value!r}")
+
+    return value
+
+
+def integer(name, data, key):
+    """
+    Reads a required whole number from an entry's data.
+
+    Item stats must be whole numbers, so the player's stats and decay
+    totals stay exact.
+
+    Args:
+        - name (str):
+            The entry's name, for the error message
+        - data (dict):
+            The data to read from
+        - key (str):
+            The key of the number
+
+    Raises:
+        - ValueError:
+            If the key is missing or its value isn't a whole number
+
+    Returns:
+        - int:
+            The number
+    """
+    if key not in data:
+        raise ValueError(f"{name}: {key} is missing")
+
+    value = data[key]
+
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name}: {key} must be a whole number, "
+                         f"not {value!r}")
+
+    return value
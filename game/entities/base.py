@@ -1,11 +1,10 @@
-from kivy.event import EventDispatcher
-
-
-class Entity(EventDispatcher):
+class Entity:
     """
     An object (e.g. an enemy or an item) in the game
+
+    Entities are plain objects with __slots__, so they're small and quick to
+    read and write. Nothing can observe them unless a subclass mixes in
+    Observable, as Player does for the UI.
     """
 
-    def __init__(self):
-        super().__init__()
-        pass
+    __slots__ = ()
@@ -1,6 +1,6 @@
 from game.entities.base import Entity
 from game.helpers import is_adjacent
-from kivy.properties import NumericProperty, BooleanProperty
+from game.core.templates import CreatureTemplate
 
 
 class Creature(Entity):
@@ -37,17 +37,20 @@ class Creature(Entity):
             Measures how close the creature is to having their turn
     """
 
-    max_health = NumericProperty()
-    curr_health = NumericProperty()
-    attack_damage = NumericProperty()
-    speed = NumericProperty()
-    is_alive = BooleanProperty(True)
+    __slots__ = ("sprite", "position",
+                 "base_health", "base_attack", "base_speed",
+                 "health_scale", "attack_scale", "speed_scale",
+                 "max_health", "curr_health", "attack_damage", "speed",
+                 "is_alive", "turn_meter")
 
-    def __init__(self, **kwargs):
+    def __init__(self, template=None, **kwargs):
         """
         Initialises the creature.
 
         Args:
+            - template (CreatureTemplate or None):
+                The creature's compiled data. If None, it is compiled from
+                the keyword arguments
             - **kwargs:
                 - stats (dict):
                     The creature's stats
@@ -57,23 +60,41 @@ class Creature(Entity):
         Actions:
             - Sets all of the creature's properties
         """
-        super().__init__()
-        stats = kwargs.get("stats", {})
+        if template is None:
+            data = dict(kwargs.get("stats", {}),
+                        sprite=kwargs.get("sprite", ""))
+            template = CreatureTemplate.from_data("", data)
 
-        self.sprite = kwargs.get("sprite", "")
+        self.apply_template(template)
 
-        self.base_health = stats.get("health", {}).get("base", 10)
-        self.base_attack = stats.get("attack", {}).get("base", 1)
-        self.base_speed = stats.get("speed", {}).get("base", 10)
+    def apply_template(self, template):
+        """
+        Sets the creature up from its compiled data, as if it were new.
+
+        Args:
+            - template (CreatureTemplate):
+                The creature's compiled data
+
+        Actions:
+            - Sets all of the creature's properties
+            - Brings it back to life with full health and an empty turn
+              meter
+        """
+        self.sprite = template.sprite
+
+        self.base_health = template.base_health
+        self.base_attack = template.base_attack
+        self.base_speed = template.base_speed
 
-        self.health_scale = stats.get("health", {}).get("scale", 0)
-        self.attack_scale = stats.get("attack", {}).get("scale", 0)
-        self.speed_scale = stats.get("speed", {}).get("scale", 0)
+        self.health_scale = template.health_scale
+        self.attack_scale = template.attack_scale
+        self.speed_scale = template.speed_scale
 
         self.max_health = self.base_health
         self.curr_health = self.max_health
         self.attack_damage = self.base_attack
         self.speed = self.base_speed
+        self.is_alive = True
 
         self.turn_meter = 0
 
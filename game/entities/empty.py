@@ -5,18 +5,23 @@ class Empty(Entity):
     """
     An entity representing an empty space on the grid.
 
+    Empty spaces have no state of their own, so the grid shares the single
+    EMPTY instance between every empty tile. Its attributes cannot be
+    changed.
+
     Attributes:
-        - sprite_name (str):
+        - sprite (str):
             The filename of the sprite image
 
     """
 
-    def __init__(self):
-        """
-        Initialises the entity.
+    __slots__ = ()
+
+    sprite = "empty"
+
+    def __setattr__(self, name, value):
+        """Stops the shared instance from being changed."""
+        raise AttributeError("Empty entities cannot be changed")
+
 
-        Actions:
-            - Sets the sprite name
-        """
-        super().__init__()
-        self.sprite = "empty"
+EMPTY = Empty()
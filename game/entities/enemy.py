@@ -9,51 +9,83 @@ class Enemy(Creature):
     Attributes:
         - position (tuple[int, int]):
             The creature's current position.
+        - name (str):
+            The type of enemy it is (e.g. orc, goblin)
     """
 
-    def __init__(self, position, **kwargs):
+    __slots__ = ("name",)
+
+    def __init__(self, position, name="", **kwargs):
         """
         Initialises the enemy.
 
         Args:
             - position (tuple[int, int]):
                 The enemy's position
+            - name (str):
+                The type of enemy it is
             - **kwargs:
                 Keyword arguments for the parent Creature class
         """
         super().__init__(**kwargs)
         self.position = position
+        self.name = name
+
+    def reset(self, position, name, template):
+        """
+        Resets a pooled enemy so it can be spawned as a new one.
+
+        Args:
+            - position (tuple[int, int]):
+                The enemy's position
+            - name (str):
+                The type of enemy it is
+            - template (CreatureTemplate):
+                The enemy's compiled data
+
+        Actions:
+            - Sets it up from the template, as if it were new
+        """
+        self.apply_template(template)
+
+        self.position = position
+        self.name = name
 
     def move_towards_player(self, game_state):
         """
-        Calculates where to move towards the player.
+        Moves one step along the shortest path to the player.
 
         Args:
             - game_state (GameState):
                 The current game state
 
         Actions:
-            - Calculates the position to move to towards the player
-            - Moves to that position
+            - Asks the game state's flow field for the steps that get
+              closer to the player, best first
+            - If there are none, because the player can't be reached,
+              uses the step straight towards the player instead
+            - Moves to the first of them that is free
+
+        Returns:
+            - boolean:
+                True if the enemy moved, False if every step was blocked
         """
-        (player_x, player_y) = game_state.player.position
-        (self_x, self_y) = self.position
+        steps = game_state.flow_field.steps(self.position)
 
-        # Calculates the distance to the player in the x and y directions
-        dx_to_player = player_x - self_x
-        dy_to_player = player_y - self_y
+        if not steps:
+            (player_x, player_y) = game_state.player.position
+            (self_x, self_y) = self.position
 
-        # Calculates one space in the right x and y directions
-        # If they have the same x or y coordinate, it will be 0
-        dx_to_destination = sign(dx_to_player)
-        dy_to_destination = sign(dy_to_player)
+            # Calculates one space in the right x and y directions
+            # If they have the same x or y coordinate, it will be 0
+            steps = [(self_x + sign(player_x - self_x),
+                      self_y + sign(player_y - self_y))]
 
-        # Calculates the final destination towards the player
-        destination_x = self_x + dx_to_destination
-        destination_y = self_y + dy_to_destination
-        destination = (destination_x, destination_y)
+        for destination in steps:
+            if game_state.move_creature(self, destination):
+                return True
 
-        return game_state.move_creature(self, destination)
+        return False
 
     def take_turn(self, game_state):
         """
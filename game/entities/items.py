@@ -1,4 +1,5 @@
 from game.entities.base import Entity
+from game.core.templates import ItemTemplate
 
 
 class Item(Entity):
@@ -6,6 +7,8 @@ class Item(Entity):
     An entity representing a consumable item.
 
     Attributes:
+        - name (str):
+            The type of item it is (e.g. pizza)
         - sprite (str):
             The filename of the sprite image
 
@@ -34,35 +37,70 @@ class Item(Entity):
             The number of turns it takes for the decay to wear off
     """
 
-    def __init__(self, **kwargs):
+    __slots__ = ("name", "sprite",
+                 "max_health_boost", "max_health_decay",
+                 "speed_boost", "speed_decay",
+                 "attack_boost", "attack_decay",
+                 "score_boost", "curr_health_boost", "decay_duration")
+
+    def __init__(self, template=None, **kwargs):
         """
         Initialises the item.
 
         Args:
+            - template (ItemTemplate or None):
+                The item's compiled data. If None, it is compiled from the
+                keyword arguments
             - **kwargs:
                 - stats:
                     The item's stats
                 - sprite:
                     The item's sprite name
         """
-        super().__init__()
-        stats = kwargs["stats"]
-        self.sprite = kwargs["sprite"]
+        if template is None:
+            data = dict(kwargs["stats"], sprite=kwargs["sprite"])
+            template = ItemTemplate.from_data("", data)
+
+        self.apply_template(template)
+
+    def apply_template(self, template):
+        """
+        Sets the item up from its compiled data.
 
-        self.max_health_boost = stats["max_health"]["boost"]
-        self.max_health_decay = stats["max_health"]["decay"]
+        Args:
+            - template (ItemTemplate):
+                The item's compiled data
+        """
+        self.name = template.name
+        self.sprite = template.sprite
 
-        self.speed_boost = stats["speed"]["boost"]
-        self.speed_decay = stats["speed"]["decay"]
+        self.max_health_boost = template.max_health_boost
+        self.max_health_decay = template.max_health_decay
 
-        self.attack_boost = stats["attack"]["boost"]
-        self.attack_decay = stats["attack"]["decay"]
+        self.speed_boost = template.speed_boost
+        self.speed_decay = template.speed_decay
 
-        self.score_boost = stats["score_boost"]
+        self.attack_boost = template.attack_boost
+        self.attack_decay = template.attack_decay
 
-        self.curr_health_boost = stats["curr_health_boost"]
+        self.score_boost = template.score_boost
 
-        self.decay_duration = stats["decay_duration"]
+        self.curr_health_boost = template.curr_health_boost
+
+        self.decay_duration = template.decay_duration
+
+    def reset(self, template):
+        """
+        Resets a pooled item so it can be spawned as a new one.
+
+        Args:
+            - template (ItemTemplate):
+                The item's compiled data
+
+        Actions:
+            - Sets it up from the template
+        """
+        self.apply_template(template)
 
 
 class Food(Item):
@@ -70,5 +108,7 @@ class Food(Item):
     A subclass of Item representing an item of food.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
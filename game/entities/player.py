@@ -1,29 +1,32 @@
 from game.entities.creature import Creature
+from game.core.decay import DecayWheel
+from game.core.observable import Observable, ObservableProperty
 
 
-class Player(Creature):
+class Player(Creature, Observable):
     """
     A subclass of Creature representing the player.
 
+    The player is the only entity the UI watches, so it's the only one
+    whose stats are ObservableProperties. Other creatures keep theirs in
+    plain slots.
+
     Attributes:
         - position (tuple[int, int]):
             The player's position
         - on_stats_changed (function):
             The function to be called when the player's stats change
-
-
-        The following are parallel lists:
-
-        - max_health_decay (list[int]):
-            The amount of decay to max health from each consumed item in effect
-        - speed_decay (list[int]):
-            The amount of decay to speed from each consumed item in effect
-        - attack_damage_decay (list[int]):
-            The amount of decay to attack dmg from each consumed item in effect
-        - decay_duration_left(list[int]):
-            How long is left on each consumed item's decay
+        - decay_wheel (DecayWheel):
+            The total stat decay from the items in effect, and when each
+            one wears off
     """
 
+    max_health = ObservableProperty(0)
+    curr_health = ObservableProperty(0)
+    attack_damage = ObservableProperty(0)
+    speed = ObservableProperty(0)
+    is_alive = ObservableProperty(True)
+
     def __init__(self, position, **kwargs):
         """
         Initialises the player.
@@ -36,38 +39,42 @@ class Player(Creature):
 
         Actions:
             - Sets the player's position
-            - Initialises all attributes with empty values
+            - Creates an empty decay wheel
         """
         super().__init__(**kwargs)
 
         self.position = position
 
-        self.max_health_decay = []
+        self.decay_wheel = DecayWheel()
 
-        self.speed_decay = []
-
-        self.attack_damage_decay = []
+    def add_decay(self, item):
+        """
+        Starts an item's stat decay.
 
-        self.decay_duration_left = []
+        Args:
+            - item (Item):
+                The item the player used
+        """
+        self.decay_wheel.add(item.max_health_decay, item.speed_decay,
+                             item.attack_decay, item.decay_duration)
 
     def decay(self):
         """
         Decays the player's stats.
 
         Actions:
-            - Calculates the sum of the decay amounts in each list
+            - Gets each stat's total decay from the items in effect
             - Removes each stat's decay amount
             - Sets the stat to the higher of calculated amount and a min value
             - Handles the stats being changed
 
         """
-        max_health_decay = sum(self.max_health_decay)
-        speed_decay = sum(self.speed_decay)
-        attack_damage_decay = sum(self.attack_damage_decay)
+        decay_wheel = self.decay_wheel
 
-        self.max_health = max(self.max_health - max_health_decay, 5)
-        self.speed = max(self.speed - speed_decay, 5)
-        self.attack_damage = max(self.attack_damage - attack_damage_decay, 2)
+        self.max_health = max(self.max_health - decay_wheel.max_health, 5)
+        self.speed = max(self.speed - decay_wheel.speed, 5)
+        self.attack_damage = max(self.attack_damage
+                                 - decay_wheel.attack_damage, 2)
 
         if self.curr_health > self.max_health:
             self.curr_health = self.max_health
@@ -77,16 +84,7 @@ class Player(Creature):
         Counts down the decays from each consumed item.
 
         Actions:
-            - Goes through each decay item
-            - Removes one from the remaining duration
-            - If the duration reaches 0:
-                - Remove the entries from each of the decay lists
+            - Moves the decay wheel on a turn, removing the decay of the
+              items that wore off
         """
-        for decay_index in range(len(self.decay_duration_left) - 1, -1, -1):
-            self.decay_duration_left[decay_index] -= 1
-
-            if self.decay_duration_left[decay_index] <= 0:
-                self.decay_duration_left.pop(decay_index)
-                self.speed_decay.pop(decay_index)
-                self.max_health_decay.pop(decay_index)
-                self.attack_damage_decay.pop(decay_index)
+        self.decay_wheel.countdown()
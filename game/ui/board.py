@@ -0,0 +1,235 @@
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Rectangle
+from game.ui.viewport import Viewport
+
+
+class GameBoard(Viewport, Widget):
+    """
+    A single widget that draws the game grid with canvas instructions.
+
+    It can be used instead of GameGrid. Rather than a Button per tile, each
+    tile in the viewport is one textured Rectangle, created once and then
+    only given a new texture when its tile changes. There are no child
+    widgets to lay out, so the cost of a layout pass is moving the
+    rectangles, and touches are mapped to tiles directly.
+
+    Attributes:
+        - tiles (list[Rectangle]):
+            The rectangle for each tile in the viewport, in row-major order
+        - tile_sprites (list[str]):
+            The sprite each rectangle is showing
+        - tile_positions (list[tuple[int, int]]):
+            The grid position each rectangle is showing
+        - background (Rectangle):
+            The rectangle behind the tiles
+        - tile_size (float):
+            The width and height of each tile, in pixels
+        - board_left (float):
+            The x coordinate of the left edge of the tiles
+        - board_top (float):
+            The y coordinate of the top edge of the tiles
+        - spacing (int):
+            The gap between tiles, in pixels
+
+        The rest are described in Viewport.
+    """
+
+    spacing = 2
+
+    def __init__(self, width, height, view_width=None, view_height=None,
+                 game_state=None, **kwargs):
+        """
+        Initialises the board.
+
+        Args:
+            - width (int):
+                The number of columns in the grid
+            - height (int):
+                The number of rows in the grid
+            - view_width (int):
+                The number of columns to draw (Default: all of them)
+            - view_height (int):
+                The number of rows to draw (Default: all of them)
+            - game_state (GameState or None):
+                A game to resume (Default: start a new one)
+            - **kwargs:
+                Keyword arguments for the parent Widget class
+
+        Actions:
+            - Starts the game and works out the size of the viewport
+            - Creates a rectangle for each tile in the viewport
+            - Lays the rectangles out whenever the widget moves or resizes
+            - Draws the grid
+        """
+        self.start_viewport(width, height, view_width, view_height,
+                            game_state)
+
+        super().__init__(**kwargs)
+
+        self.tiles = []
+        self.tile_sprites = []
+        self.tile_positions = []
+        self.background = None
+
+        self.tile_size = 0
+        self.board_left = 0
+        self.board_top = 0
+
+        self.create_tiles()
+
+        self.bind(pos=self.layout_tiles, size=self.layout_tiles)
+        self.layout_tiles()
+
+        self.draw()
+
+    def create_tiles(self):
+        """
+        Creates the canvas instructions for the board.
+
+        Actions:
+            - Adds a dark background rectangle
+            - Adds a rectangle for each tile in the viewport, all showing
+              empty tiles to begin with
+        """
+        empty_texture = self.sprites.texture("empty")
+
+        with self.canvas.before:
+            Color(0.1, 0.1, 0.1, 1)
+            self.background = Rectangle()
+
+        with self.canvas:
+            Color(1, 1, 1, 1)
+
+            for _ in range(self.view_width * self.view_height):
+                self.tiles.append(Rectangle(texture=empty_texture))
+                self.tile_sprites.append("empty")
+                self.tile_positions.append(None)
+
+    def layout_tiles(self, *args):
+        """
+        Positions the rectangles to fill the widget.
+
+        Actions:
+            - Fits the largest square tiles that fit in the widget
+            - Centres the tiles in the widget
+            - Moves each rectangle into place, leaving a gap between tiles
+        """
+        self.background.pos = self.pos
+        self.background.size = self.size
+
+        self.tile_size = min(self.width / self.view_width,
+                             self.height / self.view_height)
+
+        self.board_left = (self.x + (self.width
+                                     - self.tile_size * self.view_width) / 2)
+        self.board_top = (self.top - (self.height
+                                      - self.tile_size * self.view_height) / 2)
+
+        gap = min(self.spacing, self.tile_size / 4)
+        size = (self.tile_size - gap, self.tile_size - gap)
+
+        for (index, tile) in enumerate(self.tiles):
+            (row, column) = divmod(index, self.view_width)
+
+            tile.pos = (self.board_left + column * self.tile_size + gap / 2,
+                        self.board_top - (row + 1) * self.tile_size
+                        + gap / 2)
+            tile.size = size
+
+    def draw_tile(self, index, position):
+        """
+        Updates a rectangle to show a tile.
+
+        Args:
+            - index (int):
+                The tile's row-major index in the viewport
+            - position (tuple[int, int]):
+                The tile's position in the grid
+
+        Actions:
+            - Points the rectangle at the tile
+            - If the tile's sprite changed, gives the rectangle its texture
+        """
+        self.tile_positions[index] = position
+        sprite = self.game_state.grid.entity_at(position).sprite
+
+        if sprite != self.tile_sprites[index]:
+            self.tile_sprites[index] = sprite
+            self.tiles[index].texture = self.sprites.texture(sprite)
+
+    def tile_at(self, point):
+        """
+        Finds the tile under a point.
+
+        Args:
+            - point (tuple[float, float]):
+                The point, in the same coordinates as the widget's position
+
+        Returns:
+            - tuple[int, int] or None:
+                The grid position of the tile, or None if the point isn't on
+                a tile
+        """
+        if self.tile_size <= 0:
+            return None
+
+        (x, y) = point
+        column = int((x - self.board_left) // self.tile_size)
+        row = int((self.board_top - y) // self.tile_size)
+
+        if not (0 <= column < self.view_width
+                and 0 <= row < self.view_height):
+            return None
+
+        return self.tile_positions[row * self.view_width + column]
+
+    def instruction_count(self):
+        """
+        Returns the number of canvas instructions the board draws with.
+
+        It stays the same however often the board is redrawn.
+        """
+        return len(self.canvas.before.children) + len(self.canvas.children)
+
+    def on_touch_down(self, touch):
+        """
+        Starts a tap if it's on the board.
+
+        Args:
+            - touch (MotionEvent):
+                The touch
+
+        Returns:
+            - boolean:
+                True if the board handles the touch
+        """
+        if self.collide_point(*touch.pos):
+            touch.grab(self)
+            return True
+
+        return super().on_touch_down(touch)
+
+    def on_touch_up(self, touch):
+        """
+        Interacts with the tile a tap ended on.
+
+        Like a Button, a tap only counts if it started on the board too.
+
+        Args:
+            - touch (MotionEvent):
+                The touch
+
+        Returns:
+            - boolean:
+                True if the board handled the touch
+        """
+        if touch.grab_current is not self:
+            return super().on_touch_up(touch)
+
+        touch.ungrab(self)
+
+        position = self.tile_at(touch.pos)
+        if position is not None:
+            self.play_turn(position)
+
+        return True
@@ -1,18 +1,29 @@
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
-from game.core.game_state import GameState
+from game.ui.viewport import Viewport
 
 
-class GameGrid(GridLayout):
+class GameGrid(Viewport, GridLayout):
     """
     A subclass of GridLayout in charge of drawing the game grid
 
+    Only a viewport window centred on the player is drawn, so large maps
+    don't need a button for every tile.
+
+    The buttons are created once. After each tap only the buttons of the
+    tiles that changed are updated, unless the viewport moved.
+
     Attributes:
-        - game_state (GameState):
-            The current game state
+        - buttons (list[Button]):
+            The button for each tile in the viewport, in row-major order
+        - default_backgrounds (tuple[str, str]):
+            The normal and pressed backgrounds of a button for an empty tile
+
+        The rest are described in Viewport.
     """
 
-    def __init__(self, width, height):
+    def __init__(self, width, height, view_width=None, view_height=None,
+                 game_state=None):
         """
         Initialises the grid.
 
@@ -21,46 +32,84 @@ class GameGrid(GridLayout):
                 The number of columns in the grid
             - height (int):
                 The number of rows in the grid
+            - view_width (int):
+                The number of columns to draw (Default: all of them)
+            - view_height (int):
+                The number of rows to draw (Default: all of them)
+            - game_state (GameState or None):
+                A game to resume (Default: start a new one)
 
         Actions:
+            - Starts the game and works out the size of the viewport
             - Initialises the GridLayout with the right number of columns
-            - Creates the game state
+            - Creates a button for each tile in the viewport
             - Draws the grid
         """
-        super().__init__(cols=width)
+        self.start_viewport(width, height, view_width, view_height,
+                            game_state)
+
+        super().__init__(cols=self.view_width)
+
+        self.buttons = []
+        self.default_backgrounds = None
+        self.create_buttons()
 
-        self.game_state = GameState(width, height)
         self.draw()
 
-    def draw(self):
+    def create_buttons(self):
         """
-        Draws the grid on the screen.
+        Creates the buttons for the tiles in the viewport.
 
         Actions:
-            - Clears all widgets from the screen.
-            - Goes through each tile in the grid:
-                - Creates a button bound to self.interact_with_tile function
-                - If the tile is empty, keep the default button background
-                - If the tile is not empty, set its background to sprite image
-                - Add the button the GridLayout
+            - Creates a button bound to self.interact_with_tile for each tile
+            - Remembers the default backgrounds, for empty tiles
+            - Adds the buttons to the GridLayout
+        """
+        for _ in range(self.view_width * self.view_height):
+            button = Button()
+            button.grid_position = None
+            button.sprite = "empty"
+            button.bind(on_release=self.interact_with_tile)
+
+            self.buttons.append(button)
+            self.add_widget(button)
+
+        self.default_backgrounds = (button.background_normal,
+                                    button.background_down)
+
+    def draw_tile(self, index, position):
         """
-        self.clear_widgets()
+        Updates a button to show a tile.
 
-        grid = self.game_state.grid
+        Args:
+            - index (int):
+                The tile's row-major index in the viewport
+            - position (tuple[int, int]):
+                The tile's position in the grid
 
-        for (y, row) in enumerate(grid):
-            for (x, tile) in enumerate(row):
-                entity = tile.entity
+        Actions:
+            - Points the button at the tile
+            - If the tile's sprite changed:
+                - If the tile is empty, use the default button background
+                - If the tile is not empty, set its background to the
+                  sprite's region of the atlas
+        """
+        button = self.buttons[index]
+        button.grid_position = position
+        sprite = self.game_state.grid.entity_at(position).sprite
 
-                button = Button()
-                button.grid_position = (x, y)
-                button.bind(on_release=self.interact_with_tile)
+        if sprite == button.sprite:
+            return
 
-                if entity.sprite != "empty":
-                    button.background_normal = "game/img/" + entity.sprite
-                    button.background_down = "game/img/" + entity.sprite
+        button.sprite = sprite
 
-                self.add_widget(button)
+        if sprite == "empty":
+            (button.background_normal,
+             button.background_down) = self.default_backgrounds
+        else:
+            url = self.sprites.url(sprite)
+            button.background_normal = url
+            button.background_down = url
 
     def interact_with_tile(self, button):
         """
@@ -69,13 +118,5 @@ class GameGrid(GridLayout):
         Args:
             - button (Button):
                 The button representing the tile interacted with
-
-        Actions:
-            - Calls the game state logic to interact with the tile
-            - Removes dead entities
-            - Redraws the screen
         """
-        self.game_state.interact_with_tile(button.grid_position)
-        self.game_state.remove_dead()
-
-        self.draw()
+        self.play_turn(button.grid_position)
@@ -1,9 +1,14 @@
+import os
+import threading
+from kivy.app import App
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from game.ui.grid import GameGrid
 from kivy.core.audio import SoundLoader
+from game.core.high_scores import HighScores
+from game.core import snapshot
 
 
 class GameScreen(Screen):
@@ -11,7 +16,16 @@ class GameScreen(Screen):
     A subclass of Screen for the app's game
 
     Attributes:
-        - gridlayout (GridLayout):
+        - map_size (tuple[int, int]):
+            The number of columns and rows in the game's map
+        - viewport_size (tuple[int, int]):
+            The number of columns and rows of the map shown at once
+        - board_class (type):
+            How to draw the map: GameGrid, with a Button per tile, or
+            GameBoard, which draws it on a single widget's canvas and keeps
+            a steady frame rate with thousands of tiles
+
+        - gridlayout (GameGrid or GameBoard):
             The game grid UI
 
         - health_label (Label):
@@ -25,10 +39,27 @@ class GameScreen(Screen):
 
         - game_over_sound (Sound):
             The sound to play when the game ends
+        - high_scores (HighScores or None):
+            The saved scores, opened in the app's data directory when the
+            first game ends
+        - top_score_count (int):
+            The number of high scores to show when the game ends
+        - save_thread (threading.Thread or None):
+            The thread writing the last snapshot of the game to disk
+        - data_directory (str):
+            The app's data directory, found while the app is running, since
+            the game is saved again as the app stops
     """
 
+    map_size = (5, 5)
+    viewport_size = (5, 5)
+    board_class = GameGrid
+
     game_over_sound = SoundLoader.load("game/audio/game_over.wav")
 
+    high_scores = None
+    top_score_count = 5
+
     def __init__(self, **kwargs):
         """
         Initialises the game screen.
@@ -39,7 +70,8 @@ class GameScreen(Screen):
 
         Actions:
             - Initialises the gridlayout and labels with empty values
-            - Starts the game
+            - Resumes the game saved when the app was last paused, or
+              starts a new one
         """
         super().__init__(**kwargs)
 
@@ -50,7 +82,12 @@ class GameScreen(Screen):
         self.attack_damage_label = None
         self.score_label = None
 
-        self.start_game()
+        self.save_thread = None
+
+        app = App.get_running_app()
+        self.data_directory = app.user_data_dir if app is not None else "."
+
+        self.start_game(game_state=self.restore_game())
 
     def update_labels(self, *args):
         """
@@ -59,16 +96,29 @@ class GameScreen(Screen):
         Actions:
             - Goes through each label, updating their text
         """
+        self.update_health_label()
+        self.update_score_label()
+        self.update_attack_damage_label()
+        self.update_speed_label()
+
+    def update_health_label(self, *args):
+        """Updates the text on the health label."""
         curr_health = self.gridlayout.game_state.player.curr_health
         max_health = self.gridlayout.game_state.player.max_health
         self.health_label.text = f"Health: {curr_health} / {max_health}"
 
+    def update_score_label(self, *args):
+        """Updates the text on the score label."""
         score = self.gridlayout.game_state.score
         self.score_label.text = f"Score: {score}"
 
+    def update_attack_damage_label(self, *args):
+        """Updates the text on the attack damage label."""
         attack_damage = self.gridlayout.game_state.player.attack_damage
         self.attack_damage_label.text = f"Attack damage: {attack_damage}"
 
+    def update_speed_label(self, *args):
+        """Updates the text on the speed label."""
         speed = self.gridlayout.game_state.player.speed
         self.speed_label.text = f"Speed: {speed}"
 
@@ -78,17 +128,24 @@ class GameScreen(Screen):
 
         Actions:
             - Plays the game over sound effect
+            - Deletes the saved game, so it isn't resumed
             - Clears all widgets from the screen
             - Creates a box layout
             - Adds a button to return to the home screen
             - Adds a label saying "Game Over!"
             - Adds a label showing the player's score
+            - Saves the score and adds a label showing the player's best
+              score and the high scores
             - Adds a button to restart the game
             - Adds the box layout to the screen
         """
         if not self.gridlayout.game_state.player.is_alive:
             self.game_over_sound.play()
 
+            self.delete_saved_game()
+
+            high_scores_text = self.save_score()
+
             self.clear_widgets()
 
             boxlayout = BoxLayout(orientation="vertical",
@@ -107,6 +164,9 @@ class GameScreen(Screen):
                                 str(self.gridlayout.game_state.score))
             boxlayout.add_widget(score_label)
 
+            high_scores_label = Label(text=high_scores_text)
+            boxlayout.add_widget(high_scores_label)
+
             play_again_button = Button(text="Play again", size_hint_y=0.3)
             play_again_button.bind(on_release=self.start_game)
 
@@ -114,17 +174,140 @@ class GameScreen(Screen):
 
             self.add_widget(boxlayout)
 
-    def start_game(self, *args):
+    def save_score(self):
+        """
+        Saves the score of the game that just ended.
+
+        Actions:
+            - Opens the high scores if no game has ended yet
+            - Looks up the player's best score before this game
+            - Records the game's score, turns and seed
+
+        Returns:
+            - str:
+                The text for the game over screen: whether this was a new
+                best score, and the high scores
+        """
+        game_state = self.gridlayout.game_state
+
+        if GameScreen.high_scores is None:
+            GameScreen.high_scores = HighScores(
+                self._data_path("high_scores.db"))
+
+        best = self.high_scores.personal_best()
+        self.high_scores.record(game_state.score,
+                                turns=len(game_state.replay_log),
+                                seed=game_state.seed)
+
+        if best is None or game_state.score > best:
+            lines = ["New best score!"]
+        else:
+            lines = [f"Your best score is: {best}"]
+
+        lines.append("")
+        lines.append("High scores:")
+        for (rank, (_, score, _)) in enumerate(
+                self.high_scores.top(self.top_score_count), start=1):
+            lines.append(f"{rank}. {score}")
+
+        return "\n".join(lines)
+
+    def save_game(self):
+        """
+        Saves a snapshot of the game, so it can be resumed if the app is
+        closed.
+
+        The snapshot is made straight away, since the game can only be
+        read on the main thread, but it's written to disk on another
+        thread so the app isn't held up waiting for the disk.
+
+        Actions:
+            - Does nothing if the game is over
+            - Waits for the last snapshot to finish being written
+            - Makes a snapshot of the game
+            - Starts a thread writing it to the app's data directory
+        """
+        game_state = self.gridlayout.game_state
+
+        if game_state.game_over:
+            return
+
+        self.wait_for_save()
+
+        data = snapshot.dumps(game_state)
+        self.save_thread = threading.Thread(
+            target=snapshot.write,
+            args=(data, self._data_path("game.snapshot")))
+        self.save_thread.start()
+
+    def wait_for_save(self):
+        """Waits for the last snapshot to finish being written, if any."""
+        if self.save_thread is not None:
+            self.save_thread.join()
+            self.save_thread = None
+
+    def close_high_scores(self):
+        """
+        Closes the high scores, if a game has ended since the app started.
+
+        Closing checkpoints the write-ahead log, so its files don't build
+        up in the data directory. They're opened again when the next game
+        ends.
+        """
+        if GameScreen.high_scores is not None:
+            GameScreen.high_scores.close()
+            GameScreen.high_scores = None
+
+    def restore_game(self):
+        """
+        Restores the game saved when the app was last closed.
+
+        Snapshots that aren't valid, like those from an older version of
+        the app or corrupted on disk, are deleted and a new game is started
+        instead, so a bad save can't stop the game opening. If the file
+        can't be read, a new game is started and the save is overwritten
+        the next time the game is saved.
+
+        Returns:
+            - GameState or None:
+                The saved game, or None if there isn't one
+        """
+        path = self._data_path("game.snapshot")
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            return snapshot.load(path)
+        except ValueError:
+            self.delete_saved_game()
+            return None
+        except OSError:
+            return None
+
+    def delete_saved_game(self):
+        """Deletes the saved game, once it has finished being written."""
+        self.wait_for_save()
+
+        path = self._data_path("game.snapshot")
+        if os.path.exists(path):
+            os.remove(path)
+
+    def start_game(self, *args, game_state=None):
         """
         Starts the game.
 
+        Args:
+            - game_state (GameState or None):
+                A saved game to resume (Default: start a new one)
+
         Actions:
             - Clears the screen
             - Creates a box layout
             - Adds a home button
-            - Creates a GameGrid
+            - Creates the board with the map and viewport sizes
             - Creates labels for the player's stats
-            - Binds the stats changing to updating the labels
+            - Binds each stat changing to updating its label
             - Binds the player dying to displaying game over screen
         """
         self.clear_widgets()
@@ -138,7 +321,12 @@ class GameScreen(Screen):
 
         boxlayout.add_widget(home_button)
 
-        self.gridlayout = GameGrid(5, 5)
+        (map_width, map_height) = self.map_size
+        (view_width, view_height) = self.viewport_size
+        self.gridlayout = self.board_class(map_width, map_height,
+                                           view_width=view_width,
+                                           view_height=view_height,
+                                           game_state=game_state)
 
         stat_label_size_hint_y = 0.02
 
@@ -149,14 +337,14 @@ class GameScreen(Screen):
         self.update_labels()
 
         self.gridlayout.game_state.player.bind(
-            attack_damage=self.update_labels,
-            speed=self.update_labels,
-            max_health=self.update_labels,
-            curr_health=self.update_labels,
+            attack_damage=self.update_attack_damage_label,
+            speed=self.update_speed_label,
+            max_health=self.update_health_label,
+            curr_health=self.update_health_label,
             is_alive=self.display_game_over_screen
         )
 
-        self.gridlayout.game_state.bind(score=self.update_labels)
+        self.gridlayout.game_state.bind(score=self.update_score_label)
 
         boxlayout.add_widget(self.health_label)
         boxlayout.add_widget(self.speed_label)
@@ -167,6 +355,10 @@ class GameScreen(Screen):
 
         self.add_widget(boxlayout)
 
+    def _data_path(self, filename):
+        """Returns the path of a file in the app's data directory."""
+        return os.path.join(self.data_directory, filename)
+
     def _go_home(self, *args):
         """Moves to the homepage."""
         self.manager.current = "HomeScreen"
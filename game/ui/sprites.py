@@ -0,0 +1,116 @@
+import json
+from kivy.core.image import Image
+from kivy.graphics.texture import Texture
+
+
+# The colour of an empty tile, close to the default button background
+EMPTY_COLOUR = bytes((88, 88, 88, 255))
+
+
+class SpriteAtlas:
+    """
+    The game's sprites, packed into a single texture.
+
+    The atlas is built ahead of time from the PNGs in game/img with Kivy's
+    atlas tool, and must be rebuilt when a sprite is added or changed:
+
+        python -m kivy.atlas --padding=2 game/img/sprites 512x256
+            game/img/chicken.png game/img/goblin.png game/img/orc.png
+            game/img/pizza.png game/img/player.png
+
+    Each region is loaded through Kivy's image loader, which loads the
+    atlas once and caches every region's texture, so buttons using its
+    regions share one texture and never load an image file while drawing.
+
+    Attributes:
+        - path (str):
+            The path of the atlas, without the .atlas extension
+        - urls (dict[str: str]):
+            Maps each sprite's filename to its atlas region's url
+        - textures (dict[str: Texture]):
+            Maps each sprite's filename, and "empty", to its texture
+    """
+
+    def __init__(self, path="game/img/sprites"):
+        """
+        Loads the atlas.
+
+        Args:
+            - path (str):
+                The path of the atlas, without the .atlas extension
+
+        Raises:
+            - RuntimeError:
+                If Kivy doesn't cache the regions' textures, so drawing
+                them would load them again
+
+        Actions:
+            - Reads the names of the atlas's regions
+            - Loads each region by its url, which loads the atlas the
+              first time and caches its textures
+            - Checks loading a region again gets the cached texture
+            - Creates a plain texture for empty tiles
+        """
+        self.path = path
+
+        with open(path + ".atlas", "r") as atlas_file:
+            pages = json.load(atlas_file)
+
+        self.urls = {}
+        self.textures = {}
+        for regions in pages.values():
+            for name in regions:
+                url = f"atlas://{path}/{name}"
+                self.urls[name + ".png"] = url
+                self.textures[name + ".png"] = Image(url).texture
+
+        for (name, url) in self.urls.items():
+            if Image(url).texture is not self.textures[name]:
+                raise RuntimeError(f"Kivy didn't cache the texture of "
+                                   f"{url}")
+
+        empty_texture = Texture.create(size=(1, 1), colorfmt="rgba")
+        empty_texture.blit_buffer(EMPTY_COLOUR, colorfmt="rgba",
+                                  bufferfmt="ubyte")
+        self.textures["empty"] = empty_texture
+
+    def url(self, sprite):
+        """
+        Returns the image url to draw a sprite with.
+
+        Args:
+            - sprite (str):
+                The sprite's filename in game/img
+
+        Returns:
+            - str:
+                The url of its region in the atlas, or its file if it isn't
+                in the atlas
+        """
+        url = self.urls.get(sprite)
+
+        if url is None:
+            url = "game/img/" + sprite
+
+        return url
+
+    def texture(self, sprite):
+        """
+        Returns the texture to draw a sprite with.
+
+        Args:
+            - sprite (str):
+                The sprite's filename in game/img, or "empty"
+
+        Returns:
+            - Texture:
+                The sprite's region of the atlas, or its file's texture if it
+                isn't in the atlas
+        """
+        texture = self.textures.get(sprite)
+
+        if texture is None:
+            texture = Image(self.url(sprite)).texture
+            self.textures[sprite] = texture
+
+        return texture
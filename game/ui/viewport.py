@@ -0,0 +1,176 @@
+from kivy.core.audio import SoundLoader
+from game.core.game_state import GameState
+from game.ui.sprites import SpriteAtlas
+
+
+class Viewport:
+    """
+    A mixin for widgets that draw a window of the game centred on the player.
+
+    It handles the game state, working out which tiles are in view, only
+    redrawing the tiles that changed, and playing sounds for the player's
+    actions. Subclasses draw the tiles by implementing draw_tile.
+
+    Attributes:
+        - game_state (GameState):
+            The current game state
+        - view_width (int):
+            The number of columns drawn
+        - view_height (int):
+            The number of rows drawn
+        - origin (tuple[int, int] or None):
+            The position of the viewport's top left tile when it was last
+            drawn
+
+        - sprites (SpriteAtlas):
+            The sprites, loaded into a single texture when the first game
+            starts, since textures can't be made before the window exists
+        - eating_sound (Sound):
+            The sound to play when the player eats
+        - punch_sound (Sound):
+            The sound to play when the player punches
+    """
+
+    sprites = None
+
+    eating_sound = SoundLoader.load("game/audio/eating.wav")
+    punch_sound = SoundLoader.load("game/audio/punch.wav")
+
+    def start_viewport(self, width, height, view_width=None,
+                       view_height=None, game_state=None):
+        """
+        Starts or resumes a game and works out the size of the viewport.
+
+        Args:
+            - width (int):
+                The number of columns in the grid
+            - height (int):
+                The number of rows in the grid
+            - view_width (int):
+                The number of columns to draw (Default: all of them)
+            - view_height (int):
+                The number of rows to draw (Default: all of them)
+            - game_state (GameState or None):
+                A game to resume, whose size is used instead of width and
+                height. If None, a new game is started
+
+        Actions:
+            - Creates the game state, if there isn't one to resume
+            - Works out the size of the viewport
+            - Loads the sprite atlas, if no game has loaded it yet
+        """
+        if game_state is None:
+            game_state = GameState(width, height)
+
+        self.game_state = game_state
+        (width, height) = (game_state.width, game_state.height)
+
+        self.view_width = min(view_width or width, width)
+        self.view_height = min(view_height or height, height)
+        self.origin = None
+
+        if Viewport.sprites is None:
+            Viewport.sprites = SpriteAtlas()
+
+    def viewport_origin(self):
+        """
+        Works out which part of the grid to draw.
+
+        Actions:
+            - Centres the viewport on the player
+            - Moves it back inside the grid if it would go past an edge
+
+        Returns:
+            - tuple[int, int]:
+                The position of the viewport's top left tile
+        """
+        (player_x, player_y) = self.game_state.player.position
+
+        left = player_x - self.view_width // 2
+        left = max(0, min(left, self.game_state.width - self.view_width))
+
+        top = player_y - self.view_height // 2
+        top = max(0, min(top, self.game_state.height - self.view_height))
+
+        return (left, top)
+
+    def draw(self):
+        """
+        Draws every tile in the viewport.
+
+        Actions:
+            - Works out where the viewport is
+            - Draws each tile in it
+        """
+        self.game_state.pop_changed_tiles()
+        self.origin = self.viewport_origin()
+        (left, top) = self.origin
+
+        for index in range(self.view_width * self.view_height):
+            (row, column) = divmod(index, self.view_width)
+            self.draw_tile(index, (left + column, top + row))
+
+    def draw_changed_tiles(self):
+        """
+        Draws only the tiles that changed since they were last drawn.
+
+        Actions:
+            - If the viewport moved, draws every tile
+            - Otherwise goes through the tiles the game state says changed
+              and draws the ones in the viewport
+        """
+        if self.viewport_origin() != self.origin:
+            self.draw()
+            return
+
+        (left, top) = self.origin
+
+        for (x, y) in self.game_state.pop_changed_tiles():
+            (column, row) = (x - left, y - top)
+
+            if (0 <= column < self.view_width
+                    and 0 <= row < self.view_height):
+                self.draw_tile(row * self.view_width + column, (x, y))
+
+    def draw_tile(self, index, position):
+        """
+        Draws a tile. Implemented by subclasses.
+
+        Args:
+            - index (int):
+                The tile's row-major index in the viewport
+            - position (tuple[int, int]):
+                The tile's position in the grid
+        """
+        raise NotImplementedError
+
+    def play_turn(self, position):
+        """
+        Handles the player interacting with a tile.
+
+        Args:
+            - position (tuple[int, int]):
+                The position of the tile interacted with
+
+        Actions:
+            - Calls the game state logic to interact with the tile
+            - Plays the sound for what the player did
+            - Removes dead entities
+            - Holds the player's and the game state's notifications until
+              then, so the stat labels are updated once per tap even if
+              several enemies attack before it's the player's turn again
+            - Redraws the tiles that changed
+        """
+        game_state = self.game_state
+
+        with game_state.player.batch(), game_state.batch():
+            action = game_state.interact_with_tile(position)
+
+            if action == "eat":
+                self.eating_sound.play()
+            elif action == "attack":
+                self.punch_sound.play()
+
+            game_state.remove_dead()
+
+        self.draw_changed_tiles()
@@ -1,31 +1,84 @@
+import time
+
+# When the app started, for timing how long the first frame takes. It's
+# set before Kivy is imported, since that's part of the time
+START_TIME = time.perf_counter()
+
+# Traces every import from here on if HEALTH_STARTUP_TRACE is set
+from utils.startup_trace import tracer
+tracer.start(START_TIME)
+
 from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager
-from game.ui.screen import GameScreen
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.logger import Logger
 from screens.home import HomeScreen
-from screens.info import InfoScreen
-from screens.quiz import QuizScreen
+from utils.widgets import LazyScreenManager
 
 
 class HealthApp(App):
-    def build(self):
-        screen_manager = ScreenManager()
+    # Whether to build the other screens one per frame once the home
+    # screen is showing, rather than when they're first opened
+    warm_up_screens = True
 
-        # Adds screens to screen manager
-        info_screen = InfoScreen(name="InfoScreen")
-        screen_manager.add_widget(info_screen)
+    first_frame_time = None
+
+    def load_kv(self, *args, **kwargs):
+        with tracer.phase("load health.kv"):
+            return super().load_kv(*args, **kwargs)
+
+    def build(self):
+        with tracer.phase("build"):
+            screen_manager = LazyScreenManager()
 
-        home_screen = HomeScreen(name="HomeScreen")
-        screen_manager.add_widget(home_screen)
+            # Only the home screen is needed to show the first frame. The
+            # rest are imported and built the first time they're opened
+            with tracer.phase("build HomeScreen"):
+                home_screen = HomeScreen(name="HomeScreen")
+                screen_manager.add_widget(home_screen)
 
-        quiz_screen = QuizScreen(name="QuizScreen")
-        screen_manager.add_widget(quiz_screen)
+            screen_manager.add_lazy_screen("InfoScreen",
+                                           "screens.info:InfoScreen")
+            screen_manager.add_lazy_screen("QuizScreen",
+                                           "screens.quiz:QuizScreen")
+            screen_manager.add_lazy_screen("GameScreen",
+                                           "game.ui.screen:GameScreen")
 
-        game_screen = GameScreen(name="GameScreen")
-        screen_manager.add_widget(game_screen)
+            screen_manager.current = "HomeScreen"
 
-        screen_manager.current = "HomeScreen"
         return screen_manager
 
+    def on_start(self):
+        Window.bind(on_flip=self.on_first_frame)
+
+    def on_first_frame(self, *args):
+        # Reports the time to first frame and writes the startup trace if
+        # it's on, then warms up the other screens
+        Window.unbind(on_flip=self.on_first_frame)
+
+        self.first_frame_time = tracer.first_frame() / 1000
+        Logger.info(f"HealthApp: First frame after "
+                    f"{self.first_frame_time * 1000:.0f}ms")
+
+        if tracer.exit_when_written:
+            self.stop()
+        elif self.warm_up_screens:
+            Clock.schedule_once(self.root.warm_up)
+
+    def on_pause(self):
+        # Saves the game in case the app is closed while in the background.
+        # When it comes back, the game is still in memory
+        if self.root.is_built("GameScreen"):
+            self.root.get_screen("GameScreen").save_game()
+        return True
+
+    def on_stop(self):
+        if self.root.is_built("GameScreen"):
+            game_screen = self.root.get_screen("GameScreen")
+            game_screen.save_game()
+            game_screen.wait_for_save()
+            game_screen.close_high_scores()
+
 
 if __name__ == "__main__":
     HealthApp().run()
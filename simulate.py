@@ -0,0 +1,131 @@
+import argparse
+import os
+import time
+from game.core.policies import POLICIES
+from game.core.simulation import simulate
+
+
+def main():
+    """
+    Plays many simulated games and reports how they went.
+
+    Actions:
+        - Reads the options from the command line
+        - Plays the games across a pool of processes
+        - Prints the score and survival distributions, how the games ended
+          and the damage dealt by each type of enemy
+    """
+    parser = argparse.ArgumentParser(
+        description="Plays many games with a scripted player to help "
+                    "balance game/data.")
+    parser.add_argument("-n", "--games", type=positive_int, default=1000,
+                        help="the number of games to play")
+    parser.add_argument("-p", "--policy", default="greedy",
+                        help="the player policy: "
+                             f"{', '.join(POLICIES)} or module:function")
+    parser.add_argument("--width", type=positive_int, default=5,
+                        help="the number of columns in the grid")
+    parser.add_argument("--height", type=positive_int, default=5,
+                        help="the number of rows in the grid")
+    parser.add_argument("--max-turns", type=int, default=1000,
+                        help="the most player turns to play in a game")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="the seed of the first game")
+    parser.add_argument("-j", "--processes", type=positive_int, default=None,
+                        help="the number of worker processes "
+                             "(default: one per core)")
+    options = parser.parse_args()
+
+    # The game data is loaded relative to the project directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    start = time.perf_counter()
+    results = simulate(options.games, options.policy, options.width,
+                       options.height, options.max_turns, options.seed,
+                       options.processes)
+    elapsed = time.perf_counter() - start
+
+    games = results.games
+    print(f"Played {games} games with the {options.policy} policy in "
+          f"{elapsed:.1f}s ({games / elapsed:.0f} games/s)")
+    print()
+
+    print(distribution_table("Score", results.scores))
+    print(distribution_table("Turns survived", results.turns))
+    print()
+
+    print("Outcomes:")
+    for (outcome, count) in results.outcomes.most_common():
+        print(f"  {outcome:<12}{count:>10}  {100 * count / games:6.2f}%")
+    print()
+
+    print("Damage dealt to the player:")
+    print(f"  {'enemy':<12}{'total':>12}{'per game':>10}{'kills':>10}")
+    for (name, damage) in results.damage.most_common():
+        print(f"  {name:<12}{damage:>12}{damage / games:>10.2f}"
+              f"{results.kills[name]:>10}")
+
+
+def positive_int(text):
+    """
+    Reads a whole number of at least 1 from the command line.
+
+    Args:
+        - text (str):
+            The option's value
+
+    Raises:
+        - argparse.ArgumentTypeError:
+            If it isn't a whole number, or is below 1
+
+    Returns:
+        - int:
+            The number
+    """
+    try:
+        number = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text!r} is not a whole number")
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{number} is not at least 1")
+
+    return number
+
+
+def distribution_table(title, counts):
+    """
+    Describes a distribution with its mean and percentiles.
+
+    Args:
+        - title (str):
+            The name of the value
+        - counts (Counter[int: int]):
+            How many games had each value
+
+    Returns:
+        - str:
+            A line of text describing the distribution
+    """
+    total = sum(counts.values())
+    mean = sum(value * count for (value, count) in counts.items()) / total
+
+    percentiles = (10, 25, 50, 75, 90, 99)
+    values = {}
+    seen = 0
+    remaining = list(percentiles)
+
+    for value in sorted(counts):
+        seen += counts[value]
+        while remaining and seen * 100 >= remaining[0] * total:
+            values[remaining.pop(0)] = value
+
+    columns = "  ".join(f"p{percentile}={values[percentile]}"
+                        for percentile in percentiles)
+
+    return (f"{title + ':':<16}mean={mean:.2f}  {columns}  "
+            f"max={max(counts)}")
+
+
+if __name__ == "__main__":
+    main()
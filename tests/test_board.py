@@ -0,0 +1,89 @@
+import os
+import random
+import time
+import pytest
+
+# Kivy mustn't read pytest's arguments or log to the console
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+pytest.importorskip("kivy")
+
+# The window has to be created before any graphics instructions
+from kivy.core.window import Window  # noqa: E402
+from kivy.tests.common import UnitTestTouch  # noqa: E402
+from game.ui.board import GameBoard  # noqa: E402
+
+# The grid size, and the number of tiles the board shows, of each board
+BOARDS = [(5, 5), (30, 7), (100, 60)]
+
+TAPS = 150
+
+# The most time a relayout of every tile may take, in seconds. It's far
+# more than it needs, so a slow machine doesn't fail the test
+LAYOUT_BUDGET = 0.1
+
+
+def tap(board, position):
+    """Taps the middle of the rectangle showing a grid position."""
+    tile = board.tiles[board.tile_positions.index(position)]
+    touch = UnitTestTouch(tile.pos[0] + tile.size[0] / 2,
+                          tile.pos[1] + tile.size[1] / 2)
+
+    # The touch only has a position once it's scaled to the window, which
+    # dispatching it would otherwise do
+    touch.scale_for_screen(*Window.size)
+
+    assert board.tile_at(touch.pos) == position
+
+    board.on_touch_down(touch)
+    touch.grab_current = board
+    board.on_touch_up(touch)
+
+
+@pytest.mark.parametrize("size, view", BOARDS)
+def test_instructions_are_reused_as_tiles_change(size, view):
+    board = GameBoard(size, size, view, view, size=(900, 700),
+                      pos=(10, 20))
+    instructions = board.instruction_count()
+    rng = random.Random(0)
+
+    for taps in range(1, TAPS + 1):
+        if not board.game_state.player.is_alive:
+            break
+
+        (x, y) = board.game_state.player.position
+        neighbours = [(x + dx, y + dy) for dx in (-1, 0, 1)
+                      for dy in (-1, 0, 1)
+                      if (dx, dy) != (0, 0)
+                      and (x + dx, y + dy) in board.tile_positions]
+        tap(board, rng.choice(neighbours))
+        assert len(board.game_state.replay_log) == taps
+
+        for (index, position) in enumerate(board.tile_positions):
+            sprite = board.game_state.grid.entity_at(position).sprite
+            assert board.tile_sprites[index] == sprite
+            assert board.tiles[index].texture is board.sprites.texture(sprite)
+
+        assert board.instruction_count() == instructions
+
+    # Outside the board
+    assert board.tile_at((0, 0)) is None
+
+
+@pytest.mark.parametrize("size, view", BOARDS)
+def test_relayouts_are_fast(size, view):
+    board = GameBoard(size, size, view, view, size=(900, 700))
+    instructions = board.instruction_count()
+
+    start = time.perf_counter()
+    board.size = (640, 480)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < LAYOUT_BUDGET
+    assert board.instruction_count() == instructions
+
+    # The tiles are moved to fill the new size
+    assert board.tile_size == min(640 / view, 480 / view)
+    (x, y) = board.tiles[0].pos
+    assert board.tile_at((x + 1, y + 1)) == board.tile_positions[0]
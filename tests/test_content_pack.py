@@ -0,0 +1,70 @@
+import json
+import os
+import shutil
+import pytest
+from game.core.content_cache import DATA_DIRECTORY, ContentCache
+from game.core.content_pack import SECTIONS, ContentPack, build
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    """Builds a pack from the app's content and returns its path."""
+    path = str(tmp_path / "content.pack")
+    build(ContentCache(), path)
+    return path
+
+
+def test_sections_read_back_as_compiled(pack_path):
+    source = ContentCache()
+    pack = ContentPack(pack_path)
+
+    for name in SECTIONS:
+        assert pack.section(name) == source.compile_section(name)
+
+    assert pack.reads == len(SECTIONS)
+
+
+@pytest.mark.parametrize("damage", ["truncate", "flip"])
+def test_damaged_sections_fall_back_to_json(pack_path, damage):
+    with open(pack_path, "rb") as pack_file:
+        data = bytearray(pack_file.read())
+
+    if damage == "truncate":
+        del data[-10:]
+    else:
+        data[-10] ^= 0xFF
+
+    with open(pack_path, "wb") as pack_file:
+        pack_file.write(data)
+
+    # The last section is damaged, so it's compiled from its JSON file
+    name = list(SECTIONS)[-1]
+    cache = ContentCache(pack=ContentPack(pack_path))
+
+    assert cache.pack.section(name) is None
+    assert cache.section(name) == ContentCache().compile_section(name)
+    assert cache.reads == 1
+
+
+def test_sections_are_read_again_when_their_file_changes(tmp_path):
+    directory = tmp_path / "data"
+    shutil.copytree(DATA_DIRECTORY, directory)
+    pack_path = str(tmp_path / "content.pack")
+    build(ContentCache(str(directory)), pack_path)
+
+    cache = ContentCache(str(directory), pack=ContentPack(pack_path))
+    assert cache.section("items")["chicken"].score_boost == 2
+    assert cache.reads == 0
+
+    items_path = directory / "items.json"
+    items = json.loads(items_path.read_text())
+    items["chicken"]["score_boost"] = 7
+    items_path.write_text(json.dumps(items))
+
+    # Makes sure the edit is newer than the pack, however coarse the
+    # file system's timestamps are
+    modified = os.stat(pack_path).st_mtime_ns + 10 ** 9
+    os.utime(items_path, ns=(modified, modified))
+
+    assert cache.section("items")["chicken"].score_boost == 7
+    assert cache.reads == 1
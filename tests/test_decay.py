@@ -0,0 +1,56 @@
+import random
+import pytest
+from game.core.decay import DecayWheel
+
+
+@pytest.mark.parametrize("duration", [-2, 0, 1, 2, 5])
+def test_items_apply_for_at_least_one_turn(duration):
+    wheel = DecayWheel()
+    wheel.add(3, 2, 1, duration)
+
+    applied = 0
+    while len(wheel):
+        assert (wheel.max_health, wheel.speed, wheel.attack_damage) == (3, 2,
+                                                                         1)
+        applied += 1
+        wheel.countdown()
+
+    assert applied == max(duration, 1)
+    assert (wheel.max_health, wheel.speed, wheel.attack_damage) == (0, 0, 0)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_totals_match_a_list_of_items(seed):
+    rng = random.Random(seed)
+    wheel = DecayWheel()
+
+    # Each item in effect is [max_health, speed, attack_damage, index]
+    items = []
+    durations = []
+    applied = []
+
+    for turn in range(120):
+        # Items stop being eaten partway, so every item wears off
+        if turn < 100:
+            for _ in range(rng.randrange(4)):
+                decay = [rng.randrange(5) for _ in range(3)]
+                duration = rng.randrange(-1, 8)
+                wheel.add(*decay, duration)
+
+                items.append(decay + [len(durations)])
+                durations.append(duration)
+                applied.append(0)
+
+        assert len(wheel) == len(items)
+        assert wheel.max_health == sum(item[0] for item in items)
+        assert wheel.speed == sum(item[1] for item in items)
+        assert wheel.attack_damage == sum(item[2] for item in items)
+
+        for item in items:
+            applied[item[3]] += 1
+        items = [item for item in items
+                 if applied[item[3]] < max(durations[item[3]], 1)]
+        wheel.countdown()
+
+    assert not items and len(wheel) == 0
+    assert applied == [max(duration, 1) for duration in durations]
@@ -0,0 +1,120 @@
+import random
+import pytest
+from game.core.game_state import GameState
+from game.core.policies import greedy_policy
+
+pytest.importorskip("numpy")
+
+
+# The grid sizes to play on
+SIZES = [(5, 5), (9, 7), (16, 16)]
+
+SEEDS = range(12)
+
+# The enemies spawned on top of the usual ones, so the batches are big
+EXTRA_ENEMIES = 8
+
+TURNS = 150
+
+# The player's health, so games last long enough for the enemies to take
+# many batches of turns
+PLAYER_HEALTH = 500
+
+
+def game_state(seed, width, height, enemy_arrays):
+    """
+    Starts a seeded game with extra enemies.
+
+    Args:
+        - seed (int):
+            The game's seed
+        - width (int):
+            The number of columns in the grid
+        - height (int):
+            The number of rows in the grid
+        - enemy_arrays (bool):
+            Whether to take enemy turns in batches
+
+    Returns:
+        - GameState:
+            The game
+    """
+    state = GameState(width, height, seed=seed, enemy_arrays=enemy_arrays)
+    state.player.max_health = state.player.curr_health = PLAYER_HEALTH
+
+    # spawn_enemy does nothing once the grid is full
+    for _ in range(EXTRA_ENEMIES):
+        state.spawn_enemy()
+
+    return state
+
+
+def describe(state):
+    """
+    Returns everything about a game that the enemies' turns can change.
+
+    Args:
+        - state (GameState):
+            The game
+
+    Returns:
+        - tuple:
+            The entity on each tile with its health and turn meter, the
+            player's health, the score, the spawn timers and the state of
+            the random number generator
+    """
+    tiles = []
+    for y in range(state.height):
+        for x in range(state.width):
+            entity = state.grid.entity_at((x, y))
+            tiles.append((type(entity).__name__,
+                          getattr(entity, "name", None),
+                          getattr(entity, "curr_health", None),
+                          getattr(entity, "turn_meter", None)))
+
+    return (tiles, state.player.curr_health, state.score,
+            state.enemy_spawn_timer, state.item_spawn_timer,
+            state.rng.getstate())
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_batched_turns_match_per_object_turns(seed, width, height):
+    batched = game_state(seed, width, height, enemy_arrays=True)
+    per_object = game_state(seed, width, height, enemy_arrays=False)
+    assert describe(batched) == describe(per_object)
+
+    # Both games are played with the same moves, chosen on one of them
+    policy_rng = random.Random(seed)
+
+    for turn in range(TURNS):
+        if not per_object.player.is_alive:
+            break
+
+        tile = greedy_policy(per_object, policy_rng)
+        per_object.interact_with_tile(tile)
+        batched.interact_with_tile(tile)
+
+        assert describe(batched) == describe(per_object), f"turn {turn}"
+        check_arrays(batched)
+
+    assert batched.player.is_alive == per_object.player.is_alive
+
+
+def check_arrays(state):
+    """
+    Checks the enemy arrays hold the same numbers as the Enemy objects.
+
+    Args:
+        - state (GameState):
+            A game taking enemy turns in batches
+    """
+    arrays = state.enemy_arrays
+
+    for (slot, enemy) in enumerate(arrays.enemies):
+        if enemy is None:
+            continue
+
+        assert (arrays.x[slot], arrays.y[slot]) == enemy.position
+        assert arrays.curr_health[slot] == enemy.curr_health
+        assert arrays.turn_meter[slot] == enemy.turn_meter
@@ -0,0 +1,125 @@
+import random
+from collections import deque
+import pytest
+from game.core.chunked_grid import ChunkedGrid
+from game.core.compact_grid import CompactGrid, EMPTY_KIND, ITEM_KIND
+from game.core.flow_field import DIRECTIONS, UNREACHED, FlowField
+from game.entities.empty import EMPTY
+
+# Stands in for an item, since only the kind code matters to the field
+ITEM = object()
+
+GRIDS = [
+    (CompactGrid, 9, 7, None),
+    (CompactGrid, 20, 20, None),
+    (ChunkedGrid, 40, 40, 6),
+    (ChunkedGrid, 40, 40, 30)
+]
+
+
+def expected_distances(field):
+    """
+    Measures the distances in a field's window with a plain search.
+
+    Args:
+        - field (FlowField):
+            A field that has been refreshed
+
+    Returns:
+        - list[int]:
+            The distance of each tile in the window, in row-major order
+    """
+    (left, top) = (field.left, field.top)
+    (width, height) = (field.window_width, field.window_height)
+    distances = [UNREACHED] * (width * height)
+
+    if field.grid.kind_at(field.target) == ITEM_KIND:
+        return distances
+
+    (target_x, target_y) = field.target
+    distances[(target_y - top) * width + target_x - left] = 0
+    queue = deque([field.target])
+
+    while queue:
+        (x, y) = queue.popleft()
+        distance = distances[(y - top) * width + x - left]
+
+        for (dx, dy) in DIRECTIONS:
+            (next_x, next_y) = (x + dx, y + dy)
+            if not (left <= next_x < left + width
+                    and top <= next_y < top + height):
+                continue
+
+            index = (next_y - top) * width + next_x - left
+            if (distances[index] == UNREACHED
+                    and field.grid.kind_at((next_x, next_y)) != ITEM_KIND):
+                distances[index] = distance + 1
+                queue.append((next_x, next_y))
+
+    return distances
+
+
+def random_grid(rng, grid_class, width, height):
+    """Returns a grid with items on about a third of its tiles."""
+    grid = grid_class(width, height)
+
+    for y in range(height):
+        for x in range(width):
+            if rng.random() < 0.3:
+                grid.place((x, y), ITEM, ITEM_KIND)
+
+    return grid
+
+
+@pytest.mark.parametrize("grid_class, width, height, radius", GRIDS)
+@pytest.mark.parametrize("seed", range(10))
+def test_refresh_measures_walking_distances(seed, grid_class, width,
+                                            height, radius):
+    rng = random.Random(seed)
+    grid = random_grid(rng, grid_class, width, height)
+    field = FlowField(grid, radius)
+
+    for _ in range(10):
+        field.retarget((rng.randrange(width), rng.randrange(height)))
+
+        # distance only searches as far as it needs to
+        tiles = [(rng.randrange(width), rng.randrange(height))
+                 for _ in range(5)]
+        searched = [field.distance(tile) for tile in tiles]
+        field.refresh()
+
+        distances = [field.distance((x, y))
+                     for y in range(field.top,
+                                    field.top + field.window_height)
+                     for x in range(field.left,
+                                    field.left + field.window_width)]
+        assert distances == expected_distances(field)
+        assert searched == [field.distance(tile) for tile in tiles]
+
+
+@pytest.mark.parametrize("grid_class, width, height, radius", GRIDS)
+@pytest.mark.parametrize("seed", range(10))
+def test_repairs_match_a_fresh_field(seed, grid_class, width, height,
+                                     radius):
+    rng = random.Random(seed)
+    grid = random_grid(rng, grid_class, width, height)
+    field = FlowField(grid, radius)
+    field.retarget((width // 2, height // 2))
+    field.refresh()
+
+    for change in range(200):
+        position = (rng.randrange(width), rng.randrange(height))
+        old_kind = grid.kind_at(position)
+
+        # Items are added and removed, so both _block and _unblock run
+        if old_kind == ITEM_KIND:
+            grid.place(position, EMPTY, EMPTY_KIND)
+        else:
+            grid.place(position, ITEM, ITEM_KIND)
+        field.tile_changed(position, old_kind, grid.kind_at(position))
+
+        fresh = FlowField(grid, radius)
+        fresh.retarget(field.target)
+        fresh.refresh()
+
+        assert field.distances == fresh.distances, f"change {change}"
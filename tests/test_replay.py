@@ -0,0 +1,70 @@
+import random
+import pytest
+from game.core.game_state import GameState
+from game.core.policies import greedy_policy, random_policy
+from game.core.replay import ReplayLog
+
+
+def describe(state):
+    """
+    Returns everything about a game that its turns can change.
+
+    Args:
+        - state (GameState):
+            The game
+
+    Returns:
+        - tuple:
+            The entity on each tile with its health and turn meter, the
+            player's health, the score, the spawn timers and the state of
+            the random number generator
+    """
+    tiles = []
+    for y in range(state.height):
+        for x in range(state.width):
+            entity = state.grid.entity_at((x, y))
+            tiles.append((type(entity).__name__,
+                          getattr(entity, "name", None),
+                          getattr(entity, "curr_health", None),
+                          getattr(entity, "turn_meter", None)))
+
+    return (tiles, state.player.curr_health, state.score,
+            state.enemy_spawn_timer, state.item_spawn_timer,
+            state.rng.getstate())
+
+
+@pytest.mark.parametrize("policy", [greedy_policy, random_policy])
+@pytest.mark.parametrize("width, chunked", [(5, False), (9, False),
+                                            (12, True)])
+@pytest.mark.parametrize("seed", range(10))
+def test_replays_reproduce_the_original_game(seed, width, chunked, policy):
+    game_state = GameState(width, width, seed=seed, chunked=chunked)
+    policy_rng = random.Random(seed)
+
+    for _ in range(300):
+        if not game_state.player.is_alive:
+            break
+        game_state.interact_with_tile(policy(game_state, policy_rng))
+
+    # The global generator isn't part of the game, so it mustn't matter
+    random.seed(seed + 1)
+    replay_log = ReplayLog.loads(game_state.replay_log.dumps())
+    assert replay_log.actions == game_state.replay_log.actions
+
+    replayed = GameState.replay(replay_log, debug=True)
+
+    assert describe(replayed) == describe(game_state)
+    assert replayed.player.is_alive == game_state.player.is_alive
+    assert len(replayed.replay_log) == len(game_state.replay_log)
+
+
+def test_logs_round_trip_through_files(tmp_path):
+    replay_log = ReplayLog(7, 5, 3, actions=[0, 8, 34])
+    path = str(tmp_path / "game.replay")
+    replay_log.save(path)
+
+    loaded = ReplayLog.load(path)
+
+    assert ((loaded.width, loaded.height, loaded.seed, loaded.chunked)
+            == (7, 5, 3, False))
+    assert list(loaded.positions()) == [(0, 0), (1, 1), (6, 4)]
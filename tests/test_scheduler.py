@@ -0,0 +1,155 @@
+import random
+import pytest
+from game.core.scheduler import TurnScheduler
+
+
+class Dummy:
+    """
+    The parts of a creature the scheduler uses.
+
+    Attributes:
+        - position (tuple[int, int]):
+            Where it is
+        - speed (int):
+            How much its turn meter fills each sweep
+        - turn_meter (int):
+            How close it is to its next turn
+    """
+
+    def __init__(self, position, speed):
+        self.position = position
+        self.speed = speed
+        self.turn_meter = 0
+
+
+class Sweep:
+    """
+    The turn order the scheduler replaced, kept as a reference.
+
+    Each sweep goes through the grid in row-major order, adding each
+    creature's speed to its turn meter, and stops at the first creature
+    whose meter reaches 100.
+
+    Attributes:
+        - width (int):
+            The number of columns in the grid
+        - height (int):
+            The number of rows in the grid
+        - meters (dict[int: int]):
+            Maps id(creature) to its turn meter
+        - creatures (dict[tuple[int, int]: Dummy]):
+            Maps each position to the creature there
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.meters = {}
+        self.creatures = {}
+
+    def next_actor(self):
+        """Returns the creature whose turn it is, or None if there isn't."""
+        # Without speed, a creature's meter never rises to 100
+        if not any(creature.speed > 0
+                   or self.meters[id(creature)] + creature.speed >= 100
+                   for creature in self.creatures.values()):
+            return None
+
+        while True:
+            for y in range(self.height):
+                for x in range(self.width):
+                    creature = self.creatures.get((x, y))
+                    if creature is None:
+                        continue
+
+                    self.meters[id(creature)] += creature.speed
+                    if self.meters[id(creature)] >= 100:
+                        return creature
+
+
+def play(seed, width, height, turns):
+    """
+    Plays random turns through the scheduler and the reference sweep.
+
+    Args:
+        - seed (int):
+            Seeds the random moves
+        - width (int):
+            The number of columns in the grid
+        - height (int):
+            The number of rows in the grid
+        - turns (int):
+            The number of turns to take
+
+    Actions:
+        - Spawns a few creatures
+        - Takes turns, moving each actor to a random empty tile
+        - Between turns, randomly changes a creature's speed, kills one
+          or spawns one
+        - Checks both give the same actor and the same turn meters
+    """
+    rng = random.Random(seed)
+    scheduler = TurnScheduler(width, height)
+    sweep = Sweep(width, height)
+
+    def empty_tiles():
+        return [(x, y) for y in range(height) for x in range(width)
+                if (x, y) not in sweep.creatures]
+
+    def spawn():
+        tiles = empty_tiles()
+        if not tiles:
+            return
+
+        creature = Dummy(rng.choice(tiles), rng.choice((0, 1, 7, 20, 33,
+                                                        50, 99, 100, 150)))
+        sweep.creatures[creature.position] = creature
+        sweep.meters[id(creature)] = 0
+        scheduler.add(creature)
+
+    for _ in range(rng.randint(1, 5)):
+        spawn()
+
+    for turn in range(turns):
+        actor = scheduler.next_actor()
+        expected = sweep.next_actor()
+        assert actor is expected, f"turn {turn}"
+        if actor is None:
+            spawn()
+            continue
+
+        assert actor.turn_meter == sweep.meters[id(actor)]
+
+        # The actor moves during its turn, then loses 100 from its meter
+        tiles = empty_tiles()
+        if tiles and rng.random() < 0.5:
+            del sweep.creatures[actor.position]
+            actor.position = rng.choice(tiles)
+            sweep.creatures[actor.position] = actor
+
+        scheduler.finish_turn(actor)
+        sweep.meters[id(actor)] -= 100
+
+        change = rng.random()
+        creatures = list(sweep.creatures.values())
+
+        if change < 0.15:
+            creature = rng.choice(creatures)
+            creature.speed = rng.choice((0, 5, 25, 60, 120))
+            scheduler.update(creature)
+        elif change < 0.25 and len(creatures) > 1:
+            creature = rng.choice(creatures)
+            del sweep.creatures[creature.position]
+            scheduler.remove(creature)
+        elif change < 0.35:
+            spawn()
+
+        for creature in sweep.creatures.values():
+            assert (scheduler.turn_meter(creature)
+                    == sweep.meters[id(creature)]), f"turn {turn}"
+
+
+@pytest.mark.parametrize("width, height", [(1, 1), (3, 2), (5, 5), (8, 6)])
+@pytest.mark.parametrize("seed", range(50))
+def test_scheduler_matches_row_major_sweep(seed, width, height):
+    play(seed, width, height, 200)
@@ -0,0 +1,82 @@
+import random
+import pytest
+from game.core import snapshot
+from game.core.game_state import GameState
+from game.core.policies import greedy_policy
+
+
+def played_game(seed, turns=10, **kwargs):
+    """
+    Plays the first turns of a seeded game with the greedy policy.
+
+    The player is given more health, so the game lasts long enough to
+    save part way through.
+
+    Args:
+        - seed (int):
+            The game's seed
+        - turns (int):
+            The most turns to play
+        - **kwargs:
+            Other keyword arguments for GameState
+
+    Returns:
+        - tuple[GameState, random.Random]:
+            The game and the generator the policy chooses with
+    """
+    game_state = GameState(9, 8, seed=seed, **kwargs)
+    game_state.player.max_health = game_state.player.curr_health = 300
+    policy_rng = random.Random(seed)
+
+    for _ in range(turns):
+        if not game_state.player.is_alive:
+            break
+        game_state.interact_with_tile(greedy_policy(game_state,
+                                                    policy_rng))
+
+    return (game_state, policy_rng)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_restored_games_play_out_the_same(seed, chunked):
+    (game_state, policy_rng) = played_game(seed, chunked=chunked)
+    if not game_state.player.is_alive:
+        pytest.skip("The player died before the game could be saved")
+
+    data = snapshot.dumps(game_state)
+    restored = snapshot.loads(data, debug=True)
+    assert snapshot.dumps(restored) == data
+
+    restored_rng = random.Random()
+    restored_rng.setstate(policy_rng.getstate())
+
+    while game_state.player.is_alive:
+        tile = greedy_policy(game_state, policy_rng)
+        assert greedy_policy(restored, restored_rng) == tile
+
+        game_state.interact_with_tile(tile)
+        restored.interact_with_tile(tile)
+
+        assert restored.score == game_state.score
+        assert (restored.player.curr_health
+                == game_state.player.curr_health)
+
+    assert not restored.player.is_alive
+
+
+def test_damaged_snapshots_raise_value_error():
+    (game_state, _) = played_game(0, turns=5)
+    data = snapshot.dumps(game_state)
+    rng = random.Random(0)
+
+    for length in range(len(data)):
+        with pytest.raises(ValueError):
+            snapshot.loads(data[:length])
+
+    for _ in range(300):
+        damaged = bytearray(data)
+        damaged[rng.randrange(len(damaged))] ^= rng.randrange(1, 256)
+
+        with pytest.raises(ValueError):
+            snapshot.loads(bytes(damaged))
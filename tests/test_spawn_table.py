@@ -0,0 +1,72 @@
+import random
+from collections import Counter
+import pytest
+from game.core.content_cache import ContentCache
+from game.core.entity_factory import EntityFactory
+from game.core.spawn_table import AliasTable, SpawnTable, weight_at
+
+WEIGHTS = [
+    [1, 1],
+    [1, 3],
+    [5, 0, 2, 1],
+    [0.5, 10, 0.25, 3, 7, 1],
+    [1] * 9 + [20]
+]
+
+DRAWS = 60000
+
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+def test_alias_tables_pick_in_proportion_to_weights(weights):
+    table = AliasTable(weights)
+    rng = random.Random(0)
+    counts = Counter(table.sample(rng) for _ in range(DRAWS))
+    total = sum(weights)
+
+    for (index, weight) in enumerate(weights):
+        frequency = counts[index] / DRAWS
+        assert frequency == pytest.approx(weight / total, abs=0.01)
+
+
+class Template:
+    """The parts of a template a spawn table uses."""
+
+    def __init__(self, name, spawn_weights):
+        self.name = name
+        self.spawn_weights = spawn_weights
+
+
+def test_spawn_tables_use_the_band_of_the_score():
+    templates = (Template("rat", ((0, 1), (50, 0))),
+                 Template("ogre", ((20, 1),)))
+    table = SpawnTable(templates)
+    rng = random.Random(0)
+
+    assert table.thresholds == [0, 20, 50]
+    for score in (-10, 0, 19):
+        assert table.choose(rng, score).name == "rat"
+    assert {table.choose(rng, 30).name for _ in range(50)} == {"rat",
+                                                                "ogre"}
+    assert table.choose(rng, 1000).name == "ogre"
+
+
+def test_nothing_to_spawn_raises_value_error():
+    with pytest.raises(ValueError):
+        SpawnTable((Template("rat", ((10, 1),)),))
+
+
+def test_weight_at_finds_the_last_weight_started():
+    spawn_weights = ((5, 2), (10, 0), (20, 3))
+
+    weights = [weight_at(spawn_weights, score) for score in (0, 5, 12, 99)]
+
+    assert weights == [0, 2, 0, 3]
+
+
+def test_factories_share_spawn_tables():
+    cache = ContentCache()
+    first = EntityFactory(cache=cache)
+    second = EntityFactory(cache=cache)
+
+    assert first.enemy_spawns is second.enemy_spawns
+    assert first.item_spawns is second.item_spawns
@@ -0,0 +1,265 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+# The environment variable holding the path to write the trace to
+TRACE_VARIABLE = "HEALTH_STARTUP_TRACE"
+
+# The command line option doing the same. Kivy reads the options before
+# the app does, so it has to come after "--"
+TRACE_OPTION = "--trace-startup"
+
+# The environment variable that, if set, closes the app once the trace is
+# written, for benchmarking
+EXIT_VARIABLE = "HEALTH_STARTUP_TRACE_EXIT"
+
+# The version of the trace file's layout
+TRACE_VERSION = 1
+
+
+class StartupTracer:
+    """
+    Records how long each part of the app's start up takes.
+
+    When it's started, every module imported afterwards is timed, and the
+    app marks the phases of its start up with phase(). When the first
+    frame has been drawn, the timeline is written to a JSON file:
+
+    {
+        "version": 1,
+        "first_frame_ms": 412.3,
+        "phases": [
+            {"name": "build", "start_ms": 300.1, "duration_ms": 20.5,
+             "depth": 0}
+        ],
+        "imports": [
+            {"module": "kivy.app", "start_ms": 1.2, "total_ms": 150.2,
+             "self_ms": 3.4, "depth": 0}
+        ]
+    }
+
+    All times are in milliseconds since the app started. An import's
+    total includes the modules it imported for the first time and its
+    self time doesn't, and depth is how deeply it or the phase is nested.
+
+    Attributes:
+        - path (str or None):
+            Where to write the trace, or None if tracing is off
+        - start_time (float):
+            When the app started, from time.perf_counter
+        - phases (list[dict]):
+            The phases recorded so far
+        - imports (list[dict]):
+            The imports recorded so far
+        - first_frame_ms (float or None):
+            When the first frame was drawn
+        - exit_when_written (bool):
+            Whether the app should close once the trace is written
+    """
+
+    def __init__(self):
+        """Initialises a tracer that is switched off."""
+        self.path = None
+        self.start_time = time.perf_counter()
+        self.phases = []
+        self.imports = []
+        self.first_frame_ms = None
+        self.exit_when_written = False
+
+        self._depth = 0
+        self._import_stack = []
+
+    @property
+    def enabled(self):
+        """Whether tracing is on."""
+        return self.path is not None
+
+    def start(self, start_time, argv=None, environ=None):
+        """
+        Starts tracing if the environment variable or option asks for it.
+
+        Args:
+            - start_time (float):
+                When the app started, from time.perf_counter
+            - argv (list[str] or None):
+                The command line (Default: sys.argv)
+            - environ (dict or None):
+                The environment (Default: os.environ)
+
+        Actions:
+            - Times everything from when the app started
+            - Finds the path to write the trace to, if tracing is on
+            - If it is, starts timing every module imported from now on
+        """
+        argv = sys.argv if argv is None else argv
+        environ = os.environ if environ is None else environ
+
+        self.start_time = start_time
+        self.path = environ.get(TRACE_VARIABLE) or None
+        if TRACE_OPTION in argv[:-1]:
+            self.path = argv[argv.index(TRACE_OPTION) + 1]
+
+        if not self.enabled:
+            return
+
+        self.exit_when_written = bool(environ.get(EXIT_VARIABLE))
+        sys.meta_path.insert(0, _TimingFinder(self))
+
+    def now(self):
+        """Returns the number of milliseconds since the app started."""
+        return (time.perf_counter() - self.start_time) * 1000
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Times a phase of start up, if tracing is on.
+
+        Args:
+            - name (str):
+                What the phase is
+        """
+        if not self.enabled:
+            yield
+            return
+
+        record = {"name": name, "start_ms": self.now(), "duration_ms": 0,
+                  "depth": self._depth}
+        self.phases.append(record)
+        self._depth += 1
+
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record["duration_ms"] = self.now() - record["start_ms"]
+
+    def first_frame(self):
+        """
+        Records that the first frame was drawn and writes the trace.
+
+        Returns:
+            - float:
+                The number of milliseconds the first frame took
+        """
+        self.first_frame_ms = self.now()
+
+        if self.enabled:
+            self.write()
+
+        return self.first_frame_ms
+
+    def write(self):
+        """Writes the trace recorded so far to its file."""
+        trace = {"version": TRACE_VERSION,
+                 "first_frame_ms": self.first_frame_ms,
+                 "phases": self.phases,
+                 "imports": self.imports}
+
+        with open(self.path, "w") as trace_file:
+            json.dump(trace, trace_file, indent=1)
+
+    def begin_import(self, name):
+        """Starts timing a module's import. Returns its record."""
+        record = {"module": name, "start_ms": self.now(), "total_ms": 0,
+                  "self_ms": 0, "depth": len(self._import_stack)}
+        self.imports.append(record)
+        self._import_stack.append(record)
+        return record
+
+    def end_import(self, record):
+        """Finishes timing a module's import."""
+        self._import_stack.pop()
+        record["total_ms"] = self.now() - record["start_ms"]
+        record["self_ms"] += record["total_ms"]
+
+        if self._import_stack:
+            self._import_stack[-1]["self_ms"] -= record["total_ms"]
+
+
+class _TimingFinder:
+    """
+    An import hook that times each module as it's imported.
+
+    It finds modules with the other finders, then wraps their loaders so
+    running the module is timed.
+
+    Attributes:
+        - tracer (StartupTracer):
+            Where to record the imports
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def find_spec(self, name, path=None, target=None):
+        """Finds a module with the other finders and wraps its loader."""
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+
+            if hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, self.tracer)
+            return spec
+
+        return None
+
+
+class _TimingLoader:
+    """
+    Wraps a module's loader to time creating and running the module.
+
+    Everything but create_module and exec_module is passed to the real
+    loader.
+
+    Attributes:
+        - loader:
+            The real loader
+        - tracer (StartupTracer):
+            Where to record the import
+        - record (dict or None):
+            The import's record while it's being timed
+    """
+
+    def __init__(self, loader, tracer):
+        self.loader = loader
+        self.tracer = tracer
+        self.record = None
+
+    def create_module(self, spec):
+        """Creates the module with the real loader, starting the timer."""
+        self.record = self.tracer.begin_import(spec.name)
+
+        try:
+            return self.loader.create_module(spec)
+        except BaseException:
+            self.finish()
+            raise
+
+    def exec_module(self, module):
+        """Runs the module with the real loader, then stops the timer."""
+        if self.record is None:
+            self.record = self.tracer.begin_import(module.__name__)
+
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.finish()
+
+    def finish(self):
+        """Stops timing the import."""
+        self.tracer.end_import(self.record)
+        self.record = None
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+# The tracer the whole app records to. It's off unless main.py starts it
+tracer = StartupTracer()
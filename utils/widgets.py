@@ -1,10 +1,15 @@
+import time
+from importlib import import_module
+from kivy.clock import Clock
+from kivy.logger import Logger
 from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.uix.screenmanager import Screen
+from kivy.uix.screenmanager import Screen, ScreenManager
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.boxlayout import BoxLayout
-from utils.helpers import parse_json
+from game.core.content_cache import content_cache
+from utils.startup_trace import tracer
 
 
 class CustomScreen(Screen):
@@ -50,7 +55,9 @@ class CustomScreen(Screen):
 
         Actions:
             - Assigns a value to the title_key attribute
-            - Loads pages from the JSON file
+            - Loads the pages from the shared content cache, which reads
+              only this page type from the content pack, or parses the JSON
+              file once for every screen
             - Calculates number_of_pages and max_page_index
             - Initialises curr_page_index to 0
             - Loads the first page
@@ -60,7 +67,7 @@ class CustomScreen(Screen):
 
         self.title_key = title_key
 
-        self.pages = parse_json("data.json")[page_type]
+        self.pages = content_cache.section(page_type)
 
         self.number_of_pages = len(self.pages)
 
@@ -197,6 +204,111 @@ class CustomScreen(Screen):
         self.manager.current = "HomeScreen"
 
 
+class LazyScreenManager(ScreenManager):
+    """
+    A screen manager whose screens can be built the first time they're used.
+
+    A lazy screen is registered by its name and where its class is, and
+    neither its module is imported nor the screen built until something
+    moves to it or asks for it, so the app can show its first screen
+    without paying for the others.
+
+    Attributes:
+        factories (dict[str: str]):
+            Maps each lazy screen that hasn't been built yet to its class,
+            as "module:Class"
+        build_times (dict[str: float]):
+            The number of seconds each lazy screen took to import and build
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialises the screen manager with no lazy screens.
+
+        Args:
+            **kwargs:
+                Arguments passed to the parent ScreenManager class
+        """
+        super().__init__(**kwargs)
+
+        self.factories = {}
+        self.build_times = {}
+
+    def add_lazy_screen(self, name, screen_class):
+        """
+        Registers a screen to be built the first time it's used.
+
+        Args:
+            name (str):
+                The screen's name
+            screen_class (str):
+                Where the screen's class is, as "module:Class". It's called
+                with the name to build the screen
+        """
+        self.factories[name] = screen_class
+
+    def build_screen(self, name):
+        """
+        Builds a lazy screen and adds it to the manager.
+
+        Args:
+            name (str):
+                The name of a lazy screen that hasn't been built
+
+        Actions:
+            - Imports the screen's module and builds the screen
+            - Adds the screen to the manager
+            - Logs how long it took
+
+        Returns:
+            Screen:
+                The screen
+        """
+        (module_name, _, class_name) = self.factories.pop(name).partition(":")
+
+        start = time.perf_counter()
+        with tracer.phase(f"build {name}"):
+            screen_class = getattr(import_module(module_name), class_name)
+            screen = screen_class(name=name)
+            self.add_widget(screen)
+        self.build_times[name] = time.perf_counter() - start
+
+        Logger.info(f"Screens: Built {name} in "
+                    f"{self.build_times[name] * 1000:.0f}ms")
+
+        return screen
+
+    def warm_up(self, *args):
+        """
+        Builds the lazy screens in the background, one per frame.
+
+        Screens have to be built on the main thread, so each one is built
+        on its own frame to keep the app responding between them.
+
+        Actions:
+            - Builds the next lazy screen, if there are any left
+            - Schedules building the one after it on the next frame
+        """
+        if self.factories:
+            self.build_screen(next(iter(self.factories)))
+            Clock.schedule_once(self.warm_up)
+
+    def is_built(self, name):
+        """Checks if a screen exists and isn't waiting to be built."""
+        return name not in self.factories and super().has_screen(name)
+
+    def get_screen(self, name):
+        """Returns a screen, building it first if it's a lazy screen."""
+        if name in self.factories:
+            return self.build_screen(name)
+
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        """Checks if a screen exists, including lazy ones not built yet."""
+        return name in self.factories or super().has_screen(name)
+
+
 class AutoResizingImage(Image):
     """An image whose size will auto-adjust if the screen changes size."""
 